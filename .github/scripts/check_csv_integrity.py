@@ -22,9 +22,9 @@ import os
 import subprocess
 import sys
 from collections import Counter
-from io import StringIO
+from io import BytesIO
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 import pandas as pd
 
@@ -87,6 +87,16 @@ def _canonical(value: Any) -> str:
     return repr(number)
 
 
+def read_csv_file(source: Path | IO[bytes]) -> pd.DataFrame:
+    """Read a CSV as the text it holds, every cell a string.
+
+    No type is applied, so no value can be coerced away: a rank of 'DSQ'
+    edited to 'DNF' must show up as a change. Number formatting is left
+    to `_canonical`.
+    """
+    return pd.read_csv(source, dtype=str, keep_default_na=False)
+
+
 def canonical_rows(df: pd.DataFrame, columns: list[str]) -> Counter:
     """Multiset of canonicalised row tuples over the given columns."""
     return Counter(
@@ -105,15 +115,14 @@ def check_csv_integrity(csv_file: Path, base_ref: str) -> tuple[bool, str]:
     show = subprocess.run(
         ["git", "show", f"{base_ref}:{csv_file.as_posix()}"],
         capture_output=True,
-        text=True,
     )
     if show.returncode != 0:
         # File doesn't exist in the base ref (new file)
         return True, f"✅ {csv_file}: new file"
 
     try:
-        old_df = pd.read_csv(StringIO(show.stdout), low_memory=False)
-        new_df = pd.read_csv(csv_file, low_memory=False)
+        old_df = read_csv_file(BytesIO(show.stdout))
+        new_df = read_csv_file(csv_file)
     except Exception as e:
         return False, f"❌ {csv_file}: error reading CSV: {e}"
 
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Compare loading the data files from CSV and from the column cache.
+
+Times, per data file, parsing the CSV (`schema.read_table_csv`), building
+the cache on a first load, loading from the warm cache into pandas
+(`cache.load_file`), and only memory-mapping the cached columns
+(`cache.load_arrow`):
+
+    uv run python scripts/benchmarks/load_cache.py
+"""
+
+from pathlib import Path
+
+import fire
+from load_formats import best_of
+
+from letourdataset.cache import cache_path, load_arrow, load_file
+from letourdataset.schema import RACE_LAYOUT, TABLES, read_table_csv, table_path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def main(repeat: int = 5, data_root: str | None = None) -> None:
+    """Print load times in milliseconds for every data file.
+
+    Args:
+        repeat: Runs per measurement; the fastest one is reported.
+        data_root: Data directory to read; defaults to `<repo>/data`.
+    """
+    root = Path(data_root) if data_root else REPO_ROOT / "data"
+
+    def build(path: Path) -> None:
+        cache_path(path).unlink(missing_ok=True)
+        load_arrow(path)
+
+    print(f"{'file':<34}{'csv':>10}{'build':>10}{'warm':>10}{'mmap':>10}")
+    for race in RACE_LAYOUT:
+        for table in TABLES:
+            path = table_path(root, race, table)
+            if not path.exists():
+                continue
+            csv = best_of(lambda: read_table_csv(path, table), repeat)
+            first = best_of(lambda: build(path), repeat)
+            warm = best_of(lambda: load_file(path, table), repeat)
+            mapped = best_of(lambda: load_arrow(path, table), repeat)
+            print(
+                f"{path.name:<34}{csv:>10.1f}{first:>10.1f}{warm:>10.1f}{mapped:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Compare CSV load times with and without the schema registry.
+
+Times, per data file, the type-inferring parse the readers used to do
+(`pd.read_csv(..., low_memory=False)`), `schema.read_table_csv` with the
+declared column types, and the same reading only the 'Year' column:
+
+    uv run python scripts/benchmarks/load_csv.py
+"""
+
+from pathlib import Path
+
+import fire
+import pandas as pd
+from load_formats import best_of
+
+from letourdataset.schema import RACE_LAYOUT, TABLES, read_table_csv, table_path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def main(repeat: int = 5, data_root: str | None = None) -> None:
+    """Print load times in milliseconds for every data file.
+
+    Args:
+        repeat: Runs per measurement; the fastest one is reported.
+        data_root: Data directory to read; defaults to `<repo>/data`.
+    """
+    root = Path(data_root) if data_root else REPO_ROOT / "data"
+
+    print(f"{'file':<34}{'inferred':>10}{'typed':>10}{'speedup':>9}{'Year':>10}")
+    for race in RACE_LAYOUT:
+        for table in TABLES:
+            path = table_path(root, race, table)
+            if not path.exists():
+                continue
+            inferred = best_of(lambda: pd.read_csv(path, low_memory=False), repeat)
+            typed = best_of(lambda: read_table_csv(path, table), repeat)
+            year = best_of(lambda: read_table_csv(path, table, ["Year"]), repeat)
+            print(
+                f"{path.name:<34}{inferred:>10.1f}{typed:>10.1f}"
+                f"{inferred / typed:>8.1f}x{year:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Compare load times of the CSV files and their Parquet copies.
+
+Times, per table, a full CSV parse (as every reader does today), a full
+Parquet read, a Parquet read of a single column and a Parquet read of a
+single edition. Run `make parquet` first so the Parquet copy is current:
+
+    uv run python scripts/benchmarks/load_formats.py
+"""
+
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import fire
+import pandas as pd
+
+from letourdataset.coverage import MEN
+from letourdataset.parquet import PARQUET_DIR, read_table
+from letourdataset.schema import TABLES, table_path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def best_of(load: Callable[[], object], repeat: int) -> float:
+    """Fastest of `repeat` runs in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main(race: str = MEN, repeat: int = 5, data_root: str | None = None) -> None:
+    """Print load times in milliseconds for each of the race's tables.
+
+    Args:
+        race: 'men' or 'women'.
+        repeat: Runs per measurement; the fastest one is reported.
+        data_root: Data directory to read; defaults to `<repo>/data`.
+    """
+    root = Path(data_root) if data_root else REPO_ROOT / "data"
+    parquet_root = root / PARQUET_DIR
+
+    print(f"{'table':<14}{'csv':>10}{'parquet':>10}{'1 column':>10}{'1 year':>10}")
+    for table in TABLES:
+        csv_path = table_path(root, race, table)
+        if not csv_path.exists():
+            print(f"{table:<14}  (no CSV file)")
+            continue
+        latest = int(pd.read_csv(csv_path, usecols=["Year"])["Year"].max())
+        timings = [
+            best_of(lambda: pd.read_csv(csv_path, low_memory=False), repeat),
+            best_of(lambda: read_table(parquet_root, race, table), repeat),
+            best_of(
+                lambda: read_table(parquet_root, race, table, columns=["Year"]),
+                repeat,
+            ),
+            best_of(
+                lambda: read_table(parquet_root, race, table, years=[latest]), repeat
+            ),
+        ]
+        print(f"{table:<14}" + "".join(f"{ms:>10.1f}" for ms in timings))
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
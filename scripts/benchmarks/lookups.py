@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Compare boolean-mask scans with the indexed `Dataset` lookups.
+
+Times, per lookup, filtering the loaded riders table with a mask or a
+groupby (what callers did before `letourdataset.dataset` and
+`letourdataset.participation`) and the same query through the indexes, in
+microseconds:
+
+    uv run python scripts/benchmarks/lookups.py
+"""
+
+from pathlib import Path
+
+import fire
+from load_formats import best_of
+
+from letourdataset.cache import load
+from letourdataset.dataset import Dataset
+from letourdataset.participation import load_participation
+from letourdataset.schema import MEN, RIDERS
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def main(repeat: int = 1000, data_root: str | None = None) -> None:
+    """Print the time of one lookup of each kind, mask vs index.
+
+    Args:
+        repeat: Runs per measurement; the fastest one is reported.
+        data_root: Data directory to read; defaults to `<repo>/data`.
+    """
+    root = Path(data_root) if data_root else REPO_ROOT / "data"
+    riders = load(MEN, RIDERS, data_root=root)
+    dataset = Dataset.load(MEN, root)
+    participation = load_participation(MEN, root)
+    year = int(riders["Year"].max())
+    rider = riders.loc[riders["Year"] == year, "Rider"].iloc[0]
+
+    lookups = {
+        f"edition({year})": (
+            lambda: riders[riders["Year"] == year],
+            lambda: dataset.edition(year),
+        ),
+        f"rider_career({rider!r})": (
+            lambda: riders[riders["Rider"] == rider],
+            lambda: dataset.rider_career(rider),
+        ),
+        "winners()": (lambda: riders[riders["Rank"] == 1], dataset.winners),
+        "at_least(10)": (
+            lambda: riders.groupby("Rider")["Year"].nunique().loc[lambda n: n >= 10],
+            lambda: participation.at_least(10),
+        ),
+        "all_of([1998, 2006])": (
+            lambda: (
+                set(riders.loc[riders["Year"] == 1998, "Rider"])
+                & set(riders.loc[riders["Year"] == 2006, "Rider"])
+            ),
+            lambda: participation.all_of([1998, 2006]),
+        ),
+    }
+    print(f"{'lookup':<40}{'mask':>10}{'index':>10}")
+    for name, (scan, indexed) in lookups.items():
+        # best_of reports milliseconds
+        mask = best_of(scan, repeat) * 1000
+        index = best_of(indexed, repeat) * 1000
+        print(f"{name:<40}{mask:>10.1f}{index:>10.1f}")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
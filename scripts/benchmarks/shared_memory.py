@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Compare loading a race's tables in each worker with attaching to them.
+
+Starts a pool of workers and times, in each, loading every table through
+the column cache (`cache.load`, one private copy per worker) and attaching
+to the tables published once in shared memory (`shared.SharedDataset`),
+as Arrow tables and as pandas frames:
+
+    uv run python scripts/benchmarks/shared_memory.py --workers 8
+"""
+
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+import fire
+
+from letourdataset.cache import load
+from letourdataset.coverage import MEN
+from letourdataset.shared import SharedDataset
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def _load(args: tuple[str, Path, list[str]]) -> tuple[float, int]:
+    race, root, tables = args
+    start = time.perf_counter()
+    frames = [load(race, table, data_root=root) for table in tables]
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(int(df.memory_usage(deep=True).sum()) for df in frames)
+
+
+def _attach(args: tuple[SharedDataset, bool]) -> float:
+    shared, as_frames = args
+    start = time.perf_counter()
+    for table in shared.tables:
+        if as_frames:
+            shared.frame(table)
+        else:
+            shared.table(table)
+    elapsed = time.perf_counter() - start
+    shared.close()
+    return elapsed
+
+
+def main(race: str = MEN, workers: int = 4, data_root: str | None = None) -> None:
+    """Print per-worker load and attach times in milliseconds.
+
+    Args:
+        race: 'men' or 'women'.
+        workers: Number of worker processes.
+        data_root: Data directory to read; defaults to `<repo>/data`.
+    """
+    root = Path(data_root) if data_root else REPO_ROOT / "data"
+    with SharedDataset.publish(race, root) as shared, Pool(workers) as pool:
+        loads = pool.map(_load, [(race, root, shared.tables)] * workers)
+        tables = pool.map(_attach, [(shared, False)] * workers)
+        frames = pool.map(_attach, [(shared, True)] * workers)
+        size = shared.size
+
+    private = sum(nbytes for _, nbytes in loads)
+    print(f"{'per worker':<22}{'min ms':>10}{'max ms':>10}")
+    for label, timings in (
+        ("load (private copy)", [elapsed for elapsed, _ in loads]),
+        ("attach (Arrow)", tables),
+        ("attach (pandas)", frames),
+    ):
+        print(f"{label:<22}{min(timings) * 1000:>10.1f}{max(timings) * 1000:>10.1f}")
+    print(
+        f"{workers} private copies: {private / 1e6:.1f} MB; "
+        f"shared block: {size / 1e6:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
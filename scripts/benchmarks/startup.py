@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Time the imports of `scripts/update_docs.py`, which CI runs on every build.
+
+Runs `python -X importtime` in a fresh interpreter and prints the
+cumulative import time of each top-level import and their total, in
+milliseconds, the fastest of a few runs:
+
+    uv run python scripts/benchmarks/startup.py
+
+With `--check` it exits non-zero when the total is over
+`IMPORT_BUDGET_MS`; CI runs it that way, so a heavy import creeping back
+into `update_docs.py` fails the build.
+"""
+
+import subprocess
+import sys
+
+import fire
+
+# What `scripts/update_docs.py` imports
+UPDATE_DOCS_IMPORTS = ("fire", "letourdataset.coverage", "letourdataset.docsync")
+# Milliseconds those imports may take. They take about 60 ms; importing
+# pandas alone takes over 200 ms, so the margin absorbs a slow runner but
+# not a heavy dependency.
+IMPORT_BUDGET_MS = 150
+
+
+def import_times(modules: tuple[str, ...]) -> dict[str, int]:
+    """Cumulative import time of each of `modules`, in microseconds."""
+    code = "".join(f"import {module}\n" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines look like 'import time:   self | cumulative | <indent>name'
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return {module: times[module] for module in modules}
+
+
+def main(repeat: int = 5, check: bool = False) -> None:
+    """Print the import time of each module `update_docs.py` imports.
+
+    Args:
+        repeat: Runs per measurement; the fastest one is reported.
+        check: Exit with status 1 if the total is over `IMPORT_BUDGET_MS`.
+    """
+    runs = [import_times(UPDATE_DOCS_IMPORTS) for _ in range(repeat)]
+    print(f"{'module':<30}{'ms':>10}")
+    for module in UPDATE_DOCS_IMPORTS:
+        fastest = min(run[module] for run in runs)
+        print(f"{module:<30}{fastest / 1000:>10.1f}")
+    total = min(sum(run.values()) for run in runs)
+    print(f"{'total':<30}{total / 1000:>10.1f}")
+    if check and total / 1000 > IMPORT_BUDGET_MS:
+        print(f"❌ Over the {IMPORT_BUDGET_MS} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Compute the statistics of every edition from the riders and stages files.
+
+Reads the riders and stages CSVs in data/men and data/women and writes
+data/editions/<race>.csv: one row per edition with its finishers, winner,
+winning margin and pace, lanterne rouge gap, stage count and final jersey
+wearers. See `letourdataset.editions` for the definitions.
+"""
+
+import logging
+from pathlib import Path
+
+from letourdataset.editions import write_editions
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def main() -> None:
+    """Compute the edition statistics of every race."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    print("📈 Computing the statistics of every edition...")
+    directory = write_editions(REPO_ROOT / "data")
+    print(f"✅ Edition statistics written to {directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Compute who held each jersey when, and for how long over a career.
+
+Reads the stages CSVs in data/men and data/women and writes, to
+data/jerseys/, <race>_spells.csv (one row per unbroken run of stages in a
+jersey) and <race>_careers.csv (each rider's days, spells and longest
+spell per jersey). See `letourdataset.jerseys`.
+"""
+
+import logging
+from pathlib import Path
+
+from letourdataset.jerseys import write_jerseys
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def main() -> None:
+    """Compute the jersey spells of every race."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    print("🟡 Computing the jersey spells...")
+    directory = write_jerseys(REPO_ROOT / "data")
+    print(f"✅ Jersey spells written to {directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Compute the general classification after every stage of every edition.
+
+Reads the all-rankings CSVs in data/men and data/women and writes
+data/standings/<race>.csv: each stage's GC from the stage times, bonuses
+and penalties, without any request to the source site. See
+`letourdataset.standings` for how abandonments are handled.
+"""
+
+import logging
+from pathlib import Path
+
+from letourdataset.standings import write_standings
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def main() -> None:
+    """Compute the standings of every race."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    print("🏁 Computing the standings after every stage...")
+    directory = write_standings(REPO_ROOT / "data")
+    print(f"✅ Standings written to {directory}")
+
+
+if __name__ == "__main__":
+    main()
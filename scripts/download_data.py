@@ -4,12 +4,16 @@ Download Tour de France historical data.
 
 This script downloads and processes historical data for both the Tour de France
 (men's race) and Tour de France Femmes (women's race) from the official websites.
+Each edition is normalised and written out as soon as it is scraped, so only one
+edition is held in memory at a time and the files come out in the canonical form
+the postprocessor would produce.
 """
 
 import asyncio
 from pathlib import Path
 
 from letourdataset.scraper import Scraper
+from letourdataset.sinks import CsvSink, drain
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 
@@ -25,17 +29,13 @@ async def main() -> None:
 
     print("Downloading Tour de France (Men's) historical data...")
     scraper = Scraper(history_page="https://www.letour.fr/en/history")
-    df_stages, df_rankings, df_all_rankings = await scraper.run()
-    df_rankings.to_csv(men_folder / "TDF_Riders_History.csv", index=False)
-    df_stages.to_csv(men_folder / "TDF_Stages_History.csv", index=False)
-    df_all_rankings.to_csv(men_folder / "TDF_All_Rankings_History.csv", index=False)
+    with CsvSink(men_folder, "TDF", canonical=True) as sink:
+        await drain(scraper.iter_editions(), sink)
 
     print("Downloading Tour de France Femmes (Women's) historical data...")
     scraper = Scraper(history_page="https://www.letourfemmes.fr/en/history")
-    df_stages, df_rankings, df_all_rankings = await scraper.run()
-    df_rankings.to_csv(women_folder / "TDFF_Riders_History.csv", index=False)
-    df_stages.to_csv(women_folder / "TDFF_Stages_History.csv", index=False)
-    df_all_rankings.to_csv(women_folder / "TDFF_All_Rankings_History.csv", index=False)
+    with CsvSink(women_folder, "TDFF", canonical=True) as sink:
+        await drain(scraper.iter_editions(), sink)
 
     print("Data download and processing completed!")
 
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Write the year-partitioned Parquet copies of the data files.
+
+Reads every CSV in data/men and data/women and writes
+data/parquet/<table>/race=<race>/Year=<year>/part-0.parquet with the explicit
+column types of `letourdataset.schema`. See `letourdataset.parquet` for the
+reader.
+"""
+
+import logging
+from pathlib import Path
+
+from letourdataset.parquet import export_all
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def main() -> None:
+    """Export every data table to Parquet."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    print("📦 Writing the Parquet copies of the data files...")
+    root = export_all(REPO_ROOT / "data")
+    print(f"✅ Parquet copies written to {root}")
+
+
+if __name__ == "__main__":
+    main()
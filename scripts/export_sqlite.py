@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Write the indexed SQLite copy of the data files.
+
+Reads every CSV in data/men and data/women and writes data/letour.sqlite
+with one typed table per data table (riders, stages, rankings) and a `race`
+column. See `letourdataset.database` for the layout; query it with
+
+    uv run letourdataset query 'SELECT COUNT(*) FROM riders'
+"""
+
+import logging
+from pathlib import Path
+
+from letourdataset.database import export_database
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def main() -> None:
+    """Export every data table to SQLite."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    print("🗄️ Writing the SQLite copy of the data files...")
+    database = export_database(REPO_ROOT / "data")
+    print(f"✅ SQLite copy written to {database}")
+
+
+if __name__ == "__main__":
+    main()
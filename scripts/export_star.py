@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Write the normalised (star schema) copy of the data files.
+
+Reads the riders and all-rankings CSVs in data/men and data/women and
+writes data/star/: one Parquet file per dimension (riders, teams,
+editions, ranking types, checkpoints, result types) and a fact table of
+integer keys per race and table. See `letourdataset.star` for the layout
+and `read_star` to rebuild the original tables from it.
+"""
+
+import logging
+from pathlib import Path
+
+from letourdataset.star import export_star
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def main() -> None:
+    """Export the riders and all-rankings tables as a star schema."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    print("⭐ Writing the normalised copy of the data files...")
+    root = export_star(REPO_ROOT / "data")
+    print(f"✅ Normalised copy written to {root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,12 @@
 Reconstruct the general classification for the newest edition when the
 source site does not yet publish a final GC table on the year page.
 
-⚠️  This is a stopgap: the reconstruction sums per-stage times and
-therefore ignores time bonuses and penalties, and it can only rank
-riders who appear in every stage classification. Once the official GC
-appears on letour.fr / letourfemmes.fr, a regular `make update`
-replaces the reconstructed rows with official data (commit that
-replacement with a '[data-fix]' marker).
+⚠️  This is a stopgap: the reconstruction is the GC after the last stage
+as computed by `letourdataset.standings` (stage times, minus bonuses,
+plus penalties), and it can only rank riders who appear in every stage
+classification. Once the official GC appears on letour.fr /
+letourfemmes.fr, a regular `make update` replaces the reconstructed rows
+with official data (commit that replacement with a '[data-fix]' marker).
 """
 
 import sys
@@ -16,28 +16,24 @@ from pathlib import Path
 
 import pandas as pd
 
-REPO_ROOT = Path(__file__).resolve().parent.parent
-
-
-def format_time(total_seconds: int) -> str:
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    seconds = total_seconds % 60
-    return f"{hours:02d}h {minutes:02d}' {seconds:02d}''"
-
+from letourdataset.metadata import latest_year, read_years, write_metadata
+from letourdataset.postprocessor import RIDERS_SPEC, append_merge
+from letourdataset.schema import ALL_RANKINGS, RIDERS, STAGES
+from letourdataset.standings import (
+    STAGE_RANKING,
+    format_times,
+    general_classification,
+)
 
-def format_gap(gap_seconds: int) -> str:
-    if gap_seconds == 0:
-        return "-"
-    return f"+ {format_time(gap_seconds)}"
+REPO_ROOT = Path(__file__).resolve().parent.parent
 
 
 def lookup_total_distance(stages_file: Path, year: int) -> int:
     """Total distance of the edition from the stages file, 0 if unknown."""
     if not stages_file.exists():
         return 0
-    stages = pd.read_csv(stages_file, low_memory=False)
-    distances = stages.loc[stages["Year"] == year, "TotalTDFDistance"]
+    stages = read_years(stages_file, [year], ["Year", "TotalTDFDistance"], STAGES)
+    distances = stages["TotalTDFDistance"]
     if distances.empty:
         return 0
     return int(distances.iloc[0])
@@ -54,11 +50,10 @@ def fix_riders_history_file(data_dir: Path, competition: str) -> bool:
         print(f"⚠️  Missing required files for {competition} in {data_dir}")
         return False
 
-    riders_df = pd.read_csv(riders_file, low_memory=False)
-    all_rankings_df = pd.read_csv(all_rankings_file, low_memory=False)
-
-    latest_year_all = int(all_rankings_df["Year"].max())
-    latest_year_riders = int(riders_df["Year"].max()) if not riders_df.empty else 0
+    # Only the newest edition is needed: with current sidecars, only its
+    # rows are parsed (see `letourdataset.metadata.read_years`)
+    latest_year_all = latest_year(all_rankings_file, ALL_RANKINGS) or 0
+    latest_year_riders = latest_year(riders_file, RIDERS) or 0
 
     print(f"📊 {competition}: Latest year in all rankings: {latest_year_all}")
     print(f"📊 {competition}: Latest year in riders history: {latest_year_riders}")
@@ -72,47 +67,38 @@ def fix_riders_history_file(data_dir: Path, competition: str) -> bool:
         f"{latest_year_all}..."
     )
     print(
-        f"⚠️  {competition}: Reconstructed times EXCLUDE time bonuses and "
-        "penalties; replace them with official data once available."
+        f"⚠️  {competition}: Reconstructed times are summed from stage times, "
+        "bonuses and penalties; replace them with official data once available."
     )
 
-    latest_year_data = all_rankings_df[all_rankings_df["Year"] == latest_year_all]
+    # All columns: the stage results' bonuses and penalties count too
+    latest_year_data = read_years(
+        all_rankings_file, [latest_year_all], table=ALL_RANKINGS
+    )
     individual_data = latest_year_data[
-        latest_year_data["Ranking type"] == "Individual (Stage)"
+        latest_year_data["Ranking type"] == STAGE_RANKING
     ]
 
     if individual_data.empty:
-        print(
-            f"⚠️  {competition}: No individual stage data found for "
-            f"{latest_year_all}"
-        )
+        print(f"⚠️  {competition}: No individual stage data found for {latest_year_all}")
         return False
 
-    # Only riders present in every stage classification can be ranked
-    rider_stage_counts = individual_data["Rider"].value_counts()
-    max_stages = int(rider_stage_counts.max())
-    complete_riders = rider_stage_counts[rider_stage_counts == max_stages].index
-    dropped = int((rider_stage_counts != max_stages).sum())
-    print(
-        f"📊 {competition}: {len(complete_riders)} riders completed all "
-        f"{max_stages} stages"
-    )
-    if dropped:
+    # Only riders present in every stage classification are ranked
+    standings = general_classification(individual_data)
+    if standings.empty:
+        print(f"⚠️  {competition}: No rider finished every stage of {latest_year_all}")
+        return False
+    last_stage = standings["Stages"].iloc[-1]
+    gc_data = standings[standings["Stages"] == last_stage].reset_index(drop=True)
+    max_stages = individual_data["Stages"].nunique()
+    started = individual_data["Rider"].nunique()
+    print(f"📊 {competition}: {len(gc_data)} riders completed all {max_stages} stages")
+    if started > len(gc_data):
         print(
-            f"⚠️  {competition}: {dropped} rider(s) missing from at least one "
-            "stage classification are NOT ranked"
+            f"⚠️  {competition}: {started - len(gc_data)} rider(s) missing from at "
+            "least one stage classification are NOT ranked"
         )
 
-    complete_data = individual_data[individual_data["Rider"].isin(complete_riders)]
-    gc_data = (
-        complete_data.groupby("Rider")
-        .agg(TotalSeconds=("TotalSeconds", "sum"), Team=("Team", "first"))
-        .reset_index()
-        .sort_values("TotalSeconds", kind="stable")
-        .reset_index(drop=True)
-    )
-    gc_data["GapSeconds"] = gc_data["TotalSeconds"] - gc_data["TotalSeconds"].iloc[0]
-
     distance = lookup_total_distance(stages_file, latest_year_all)
     if distance == 0:
         print(
@@ -123,19 +109,24 @@ def fix_riders_history_file(data_dir: Path, competition: str) -> bool:
     winner = gc_data.iloc[0]
     print(
         f"🏆 {competition}: Winner: {winner['Rider']} with "
-        f"{winner['TotalSeconds'] / 3600:.1f}h total time (bonuses excluded)"
+        f"{winner['TotalSeconds'] / 3600:.1f}h total time"
     )
 
     new_riders_df = pd.DataFrame(
         {
-            "Rank": range(1, len(gc_data) + 1),
+            "Rank": gc_data["Rank"],
             "Rider": gc_data["Rider"],
             "Rider No.": pd.NA,
             "Team": gc_data["Team"],
-            "Times": gc_data["TotalSeconds"].astype(int).map(format_time),
-            "Gap": gc_data["GapSeconds"].astype(int).map(format_gap),
-            "B": pd.NA,
-            "P": pd.NA,
+            "Times": gc_data["Times"],
+            "Gap": gc_data["Gap"],
+            # As the official GC prints them: bonuses "12'", penalties "00' 20''"
+            "B": (gc_data["BonusSeconds"].astype(str).str.zfill(2) + "'").where(
+                gc_data["BonusSeconds"] > 0
+            ),
+            "P": format_times(gc_data["PenaltySeconds"])
+            .str.removeprefix("00h ")
+            .where(gc_data["PenaltySeconds"] > 0),
             "Year": latest_year_all,
             "Distance (km)": distance,
             "Number of stages": max_stages,
@@ -145,10 +136,10 @@ def fix_riders_history_file(data_dir: Path, competition: str) -> bool:
         }
     )
 
-    riders_df = riders_df[riders_df["Year"] != latest_year_all]
-    updated = pd.concat([riders_df, new_riders_df], ignore_index=True)
-    updated = updated.sort_values(["Year", "Rank"], kind="stable")
-    updated.to_csv(riders_file, index=False)
+    # The edition is newer than any in the file, so its rows are appended
+    # in the postprocessor's canonical form; the file needs no further pass
+    append_merge(riders_file, new_riders_df, RIDERS_SPEC)
+    write_metadata(riders_file, RIDERS)
 
     print(
         f"✅ {competition}: Added {len(new_riders_df)} riders with "
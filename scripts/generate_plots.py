@@ -4,15 +4,15 @@ Generate plots for Tour de France historical data.
 
 Plot titles carry the covered year range, which comes from
 `letourdataset.coverage` rather than being recomputed here, so a new
-edition shows up in every title without any hand-editing.
+edition shows up in every title without any hand-editing. The plotted
+values are the cached edition statistics of `letourdataset.editions`.
 """
 
 from dataclasses import dataclass
 from pathlib import Path
 
-import pandas as pd
-
 from letourdataset.coverage import MEN, WOMEN, RaceCoverage, load_coverage
+from letourdataset.editions import load_editions
 from letourdataset.visualizer import Visualizer
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
@@ -20,9 +20,8 @@ REPO_ROOT = Path(__file__).resolve().parent.parent
 
 @dataclass(frozen=True)
 class PlotSpec:
-    """Where one race's riders data lives and what to draw from it."""
+    """What to draw from one race's edition statistics."""
 
-    riders_file: str
     pace_plot: str
     margin_plot: str
     pace_title: str
@@ -36,14 +35,12 @@ class PlotSpec:
 
 PLOT_SPECS: dict[str, PlotSpec] = {
     MEN: PlotSpec(
-        riders_file="men/TDF_Riders_History.csv",
         pace_plot="TDF_Distance_And_Pace.png",
         margin_plot="TDF_Winning_Margin.png",
         pace_title="Tour de France",
         margin_title="How close was the race? Winning margin,",
     ),
     WOMEN: PlotSpec(
-        riders_file="women/TDFF_Riders_History.csv",
         pace_plot="TDFF_Distance_And_Pace.png",
         margin_plot="TDFF_Winning_Margin.png",
         pace_title="Tour de France Femmes",
@@ -63,7 +60,7 @@ def main() -> None:
 
     print("Generating plots for Tour de France data...")
     for key, spec in PLOT_SPECS.items():
-        df = pd.read_csv(data_folder / spec.riders_file, low_memory=False)
+        df = load_editions(key, data_folder)
         pace_title, margin_title = spec.titles(coverage[key])
 
         print(f"Creating {key}'s distance and pace plot...")
@@ -3,26 +3,48 @@
 Post-process Tour de France data files.
 
 This script runs the postprocessor to sort and organize all CSV data files.
+The download already writes canonical files, so after `make update` this is
+a check that finds nothing to do:
+
+    uv run python scripts/postprocess_data.py            # rewrite the files
+    uv run python scripts/postprocess_data.py --check    # fail if not canonical
 """
 
 import logging
 from pathlib import Path
 
+import fire
+
 from letourdataset.postprocessor import DataPostProcessor
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 
 
-def main() -> None:
-    """Run the data post-processor."""
+def main(check: bool = False, workers: int | None = None, force: bool = False) -> None:
+    """Run the data post-processor.
+
+    Args:
+        check: Only report files that are not canonical and exit non-zero
+            instead of rewriting them.
+        workers: Number of files processed at once (default: one per CPU).
+        force: Process every file, even those the manifest lists as
+            unchanged since the last pass.
+
+    Raises:
+        SystemExit: With code 1 when `check` finds a file to rewrite.
+    """
     logging.basicConfig(
         level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
     )
     print("🔄 Post-processing Tour de France data files...")
-    processor = DataPostProcessor(REPO_ROOT / "data")
-    processor.process_all_files()
+    processor = DataPostProcessor(REPO_ROOT / "data", workers=workers)
+    changed = processor.process_all_files(check=check, force=force)
+    if check and changed:
+        print(f"❌ Not canonical: {', '.join(changed)}")
+        print("   Run 'make postprocess' to rewrite them.")
+        raise SystemExit(1)
     print("✅ Post-processing completed!")
 
 
 if __name__ == "__main__":
-    main()
+    fire.Fire(main)
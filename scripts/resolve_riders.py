@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Assign stable rider IDs across editions and tables.
+
+Reads every CSV in data/men and data/women and writes data/identities/
+riders.csv, one row per rider with its ID, name and first and last year,
+and aliases.csv, mapping every name as printed in the tables to its rider.
+See `letourdataset.identity` for how names are matched.
+"""
+
+import logging
+from pathlib import Path
+
+from letourdataset.identity import write_identities
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def main() -> None:
+    """Resolve the rider names of every data table."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    print("🪪 Resolving rider identities...")
+    directory = write_identities(REPO_ROOT / "data")
+    print(f"✅ Rider identities written to {directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Check the invariants of the data files (see `letourdataset.validation`).
+
+    uv run python scripts/validate_data.py                   # fail on errors
+    uv run python scripts/validate_data.py --latest --strict # newest edition,
+                                                             # fail on warnings
+"""
+
+from pathlib import Path
+
+import fire
+import pandas as pd
+
+from letourdataset.schema import MEN, RIDERS, WOMEN, read_table_csv, table_path
+from letourdataset.validation import ERROR, validate
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def main(
+    strict: bool = False, latest: bool = False, data_root: str | None = None
+) -> None:
+    """Validate both races and print the violations found.
+
+    Args:
+        strict: Fail on warnings too, not only on errors.
+        latest: Only report violations in each race's newest edition.
+        data_root: Data directory to read; defaults to `<repo>/data`.
+
+    Raises:
+        SystemExit: With code 1 when a failing violation is found.
+    """
+    root = Path(data_root) if data_root else REPO_ROOT / "data"
+    failed = False
+    for race in (MEN, WOMEN):
+        report = validate(root, race)
+        if latest:
+            years = read_table_csv(table_path(root, race, RIDERS), RIDERS, ["Year"])
+            report = report[report["Year"] == years["Year"].max()]
+
+        failing = report if strict else report[report["severity"] == ERROR]
+        summary = report.groupby(["table", "check", "severity"]).size()
+        if report.empty:
+            print(f"✅ {race}: no violations")
+            continue
+        print(
+            f"{'❌' if not failing.empty else '⚠️ '} {race}: {len(report)} violation(s)"
+        )
+        print(summary.to_string())
+        if not failing.empty:
+            failed = True
+            with pd.option_context("display.max_colwidth", 80):
+                print(failing.head(20).to_string(index=False))
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
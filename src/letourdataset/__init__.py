@@ -1 +1,5 @@
 __version__ = '0.1.0'
+
+from letourdataset.cache import load
+
+__all__ = ["load"]
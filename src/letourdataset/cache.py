@@ -0,0 +1,151 @@
+"""Memory-mapped columnar cache of the data files.
+
+Parsing text is most of the cost of loading a CSV. The first `load` of a
+table parses it once, with the types of `schema.COLUMN_TYPES`, and writes
+the result as an uncompressed Arrow IPC file in a `.cache` directory next
+to it:
+
+    data/men/.cache/TDF_Riders_History.arrow
+
+Later loads memory-map that file instead of parsing, so they cost little
+more than the conversion to pandas, and processes loading the same table
+share its pages through the OS page cache. `load_arrow` skips the
+conversion too and returns columns backed by the mapped file.
+
+A cache file records the SHA-256 of the CSV it was built from and is
+rebuilt as soon as that no longer matches. The hash comes from the CSV's
+summary sidecar when that is current (see `letourdataset.metadata`), so
+checking usually costs a `stat` rather than a read of the whole file.
+"""
+
+import logging
+import os
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from letourdataset.metadata import CACHE_DIR, file_hash, read_metadata
+from letourdataset.schema import read_table_arrow, table_of, table_path, to_frame
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+CACHE_SUFFIX = ".arrow"
+# Schema metadata key holding the hash of the cached CSV
+HASH_KEY = b"letourdataset.sha256"
+
+
+def cache_path(csv_path: str | Path) -> Path:
+    """`men/TDF_Riders_History.csv` -> `men/.cache/TDF_Riders_History.arrow`."""
+    csv_path = Path(csv_path)
+    return csv_path.parent / CACHE_DIR / (csv_path.stem + CACHE_SUFFIX)
+
+
+def source_hash(csv_path: Path) -> str:
+    """SHA-256 of a data file, from its sidecar when that is current."""
+    metadata = read_metadata(csv_path)
+    return metadata["sha256"] if metadata is not None else file_hash(csv_path)
+
+
+def read_cache(path: Path, sha256: str) -> "pa.Table | None":
+    """A cache file, memory-mapped, if it was built from content `sha256`.
+
+    None when it is missing, unreadable or stale.
+    """
+    import pyarrow as pa
+
+    try:
+        # The table's buffers keep the mapping alive after `source` is gone
+        source = pa.memory_map(str(path))
+        reader = pa.ipc.open_file(source)
+    except (OSError, pa.ArrowInvalid):
+        return None
+    metadata = reader.schema.metadata or {}
+    if metadata.get(HASH_KEY) != sha256.encode():
+        return None
+    return reader.read_all()
+
+
+def write_cache(path: Path, arrow: "pa.Table", sha256: str) -> "pa.Table":
+    """Write `arrow` as the cache file of content `sha256`.
+
+    Returns the table with the hash in its schema metadata.
+
+    Raises:
+        OSError: If the cache file can't be written.
+    """
+    import pyarrow as pa
+
+    arrow = arrow.replace_schema_metadata({HASH_KEY: sha256.encode()})
+    path.parent.mkdir(exist_ok=True)
+    # Per-process staging name: concurrent first loads may race to build
+    staging = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with pa.OSFile(str(staging), "wb") as sink:
+        with pa.ipc.new_file(sink, arrow.schema) as writer:
+            writer.write_table(arrow)
+    staging.replace(path)
+    return arrow
+
+
+def load_arrow(
+    csv_path: str | Path,
+    table: str | None = None,
+    columns: Sequence[str] | None = None,
+) -> "pa.Table":
+    """A data file as an Arrow table, memory-mapped from its cache.
+
+    The cache is built (or rebuilt) first when it is missing or stale. A
+    data directory that can't be written to is read without a cache.
+
+    Raises:
+        ValueError: If the file is not a data table file.
+    """
+    csv_path = Path(csv_path)
+    table = table or table_of(csv_path)
+    if table is None:
+        raise ValueError(f"{csv_path.name} is not a data table file.")
+    sha256 = source_hash(csv_path)
+    path = cache_path(csv_path)
+
+    arrow = read_cache(path, sha256)
+    if arrow is None:
+        arrow = read_table_arrow(csv_path, table)
+        try:
+            arrow = write_cache(path, arrow, sha256)
+            logger.info("✅ Cached %s", csv_path.name)
+        except OSError as e:
+            logger.warning("Could not cache %s: %s", csv_path.name, e)
+    if columns is not None:
+        arrow = arrow.select(list(columns))
+    return arrow
+
+
+def load_file(
+    csv_path: str | Path,
+    table: str | None = None,
+    columns: Sequence[str] | None = None,
+) -> "pd.DataFrame":
+    """A data file as a DataFrame, typed as by `schema.read_table_csv`."""
+    return to_frame(load_arrow(csv_path, table, columns))
+
+
+def load(
+    race: str,
+    table: str,
+    columns: Sequence[str] | None = None,
+    data_root: str | Path = "data",
+) -> "pd.DataFrame":
+    """One race's table, e.g. `load(MEN, RIDERS)`, through the cache.
+
+    Raises:
+        FileNotFoundError: If the table's CSV file doesn't exist.
+    """
+    csv_path = table_path(data_root, race, table)
+    if not csv_path.exists():
+        raise FileNotFoundError(
+            f"Missing {table} file: {csv_path}. Run 'make update' first."
+        )
+    return load_file(csv_path, table, columns)
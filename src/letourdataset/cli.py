@@ -0,0 +1,62 @@
+"""The `letourdataset` command.
+
+    letourdataset query 'SELECT race, COUNT(*) FROM riders GROUP BY race'
+
+runs SQL against the SQLite copy of the data (see `letourdataset.database`,
+built by `make sqlite`) and prints the result as CSV. The database is
+opened read-only.
+"""
+
+import argparse
+import csv
+import sqlite3
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+# Kept in sync with `database.DATABASE_FILE`; importing that module would
+# load pandas for nothing
+DEFAULT_DATABASE = Path("data") / "letour.sqlite"
+
+
+def query(sql: str, database: Path) -> int:
+    """Run one SQL statement and write its rows to stdout as CSV."""
+    if not database.exists():
+        print(f"No database at {database}. Run 'make sqlite' first.", file=sys.stderr)
+        return 1
+    connection = sqlite3.connect(f"{database.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        cursor = connection.execute(sql)
+        writer = csv.writer(sys.stdout, lineterminator="\n")
+        if cursor.description is not None:
+            writer.writerow(column[0] for column in cursor.description)
+            writer.writerows(cursor)
+    except sqlite3.Error as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        connection.close()
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="letourdataset", description="Tour de France historical data."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    query_parser = commands.add_parser(
+        "query", help="Run SQL against the SQLite copy and print CSV."
+    )
+    query_parser.add_argument("sql", help="One SQL statement.")
+    query_parser.add_argument(
+        "--database",
+        type=Path,
+        default=DEFAULT_DATABASE,
+        help=f"SQLite file to query (default: {DEFAULT_DATABASE}).",
+    )
+    args = parser.parse_args(argv)
+    return query(args.sql, args.database)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,15 +6,18 @@ exist. Every year that appears in the README, on the docs page or in a plot
 title is computed from them, so finishing an edition never means editing a
 year by hand: `make update` scrapes the new edition and everything else
 follows from the data.
+
+The numbers are taken from the riders files' summary sidecars (see
+`letourdataset.metadata`) when those are current, so nothing is parsed,
+and from the column cache (see `letourdataset.cache`) otherwise.
 """
 
 from dataclasses import dataclass
 from pathlib import Path
 
-import pandas as pd
-
-MEN = "men"
-WOMEN = "women"
+from letourdataset.cache import load_file
+from letourdataset.metadata import read_metadata
+from letourdataset.schema import MEN, RIDERS, WOMEN
 
 RIDERS_FILES: dict[str, tuple[str, str]] = {
     MEN: ("Men's Tour de France", "men/TDF_Riders_History.csv"),
@@ -46,8 +49,16 @@ class RaceCoverage:
 
 def race_coverage(riders_file: Path, name: str) -> RaceCoverage:
     """Derive one race's coverage from its riders history file."""
-    years = pd.read_csv(riders_file, low_memory=False, usecols=["Year"])["Year"]
-    years = pd.to_numeric(years, errors="coerce").dropna()
+    metadata = read_metadata(riders_file)
+    if metadata is not None and metadata["editions"]:
+        return RaceCoverage(
+            name=name,
+            first_year=metadata["first_year"],
+            latest_year=metadata["latest_year"],
+            editions=metadata["editions"],
+        )
+
+    years = load_file(riders_file, RIDERS, ["Year"])["Year"].dropna()
     if years.empty:
         raise ValueError(f"{riders_file} has no usable Year values.")
     return RaceCoverage(
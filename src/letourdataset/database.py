@@ -0,0 +1,167 @@
+"""Indexed SQLite copy of the data tables.
+
+All six CSVs go into one database, one table per data table with a `race`
+column telling the men's rows from the women's:
+
+    riders    race, <riders columns>
+    stages    race, <stages columns>, stage_key
+    rankings  race, <all-rankings columns>, stage_key
+
+Columns keep their CSV names ("Rider No.") and get their SQL type from
+`schema.COLUMN_TYPES`. `stage_key` is the stage's integer key (see
+`letourdataset.stages`), which sorts in race order where the text '13.1'
+does not. Indexes on year, stage, rider and team make the usual lookups
+and joins across both races cheap:
+
+    SELECT race, "Year", "Rider", "Team" FROM riders
+    WHERE "Rank" = 1 ORDER BY "Year", race
+
+The database is rebuilt from scratch into a staging file and swapped in,
+so readers never see a half-written one.
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from letourdataset.cache import load_file
+from letourdataset.schema import (
+    ALL_RANKINGS,
+    COLUMN_TYPES,
+    INT,
+    RACE_LAYOUT,
+    RIDERS,
+    STAGE,
+    STAGES,
+    table_path,
+)
+from letourdataset.stages import stage_keys
+
+logger = logging.getLogger(__name__)
+
+# Below the data root, next to men/ and women/
+DATABASE_FILE = "letour.sqlite"
+
+SQL_TABLES: dict[str, str] = {
+    RIDERS: "riders",
+    STAGES: "stages",
+    ALL_RANKINGS: "rankings",
+}
+STAGE_KEY_COLUMN = "stage_key"
+
+# name -> indexed columns, per table; only created for columns that exist
+INDEXES: dict[str, dict[str, tuple[str, ...]]] = {
+    RIDERS: {
+        "year": ("race", "Year"),
+        "rider": ("Rider",),
+        "team": ("Team",),
+    },
+    STAGES: {
+        "year": ("race", "Year"),
+        "stage": ("race", "Year", STAGE_KEY_COLUMN),
+    },
+    ALL_RANKINGS: {
+        "year": ("race", "Year"),
+        "stage": ("race", "Year", STAGE_KEY_COLUMN, "Ranking type"),
+        "rider": ("Rider",),
+        "team": ("Team",),
+    },
+}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sql_type(table: str, column: str, values: pd.Series) -> str:
+    kind = COLUMN_TYPES[table].get(column)
+    if column == STAGE_KEY_COLUMN or kind == INT:
+        return "INTEGER"
+    if kind is not None:
+        return "TEXT"
+    # Columns the registry doesn't know keep their inferred type
+    if pd.api.types.is_integer_dtype(values):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(values):
+        return "REAL"
+    return "TEXT"
+
+
+def _sql_values(values: pd.Series) -> list[object]:
+    """Python values of a column, None for missing ones."""
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def _race_frames(data_root: str | Path, table: str) -> dict[str, pd.DataFrame]:
+    frames: dict[str, pd.DataFrame] = {}
+    for race in RACE_LAYOUT:
+        path = table_path(data_root, race, table)
+        if not path.exists():
+            logger.warning("File not found: %s", path)
+            continue
+        df = load_file(path, table)
+        if STAGE in COLUMN_TYPES[table].values() and "Stages" in df:
+            df[STAGE_KEY_COLUMN] = stage_keys(df["Stages"])
+        frames[race] = df
+    return frames
+
+
+def _write_table(
+    connection: sqlite3.Connection, table: str, frames: dict[str, pd.DataFrame]
+) -> None:
+    name = SQL_TABLES[table]
+    columns: dict[str, str] = {}
+    for df in frames.values():
+        for column in df.columns:
+            columns.setdefault(column, _sql_type(table, column, df[column]))
+
+    definitions = ["race TEXT NOT NULL"] + [
+        f"{_quote(column)} {sql_type}" for column, sql_type in columns.items()
+    ]
+    connection.execute(f"CREATE TABLE {name} ({', '.join(definitions)})")
+    placeholders = ", ".join("?" * (len(columns) + 1))
+    insert = f"INSERT INTO {name} VALUES ({placeholders})"
+    for race, df in frames.items():
+        values = [
+            _sql_values(df[column]) if column in df else [None] * len(df)
+            for column in columns
+        ]
+        connection.executemany(insert, zip([race] * len(df), *values))
+
+    # Indexing after the bulk insert is cheaper than maintaining the indexes
+    for index, indexed in INDEXES[table].items():
+        if all(column == "race" or column in columns for column in indexed):
+            connection.execute(
+                f"CREATE INDEX {name}_{index} ON {name} "
+                f"({', '.join(_quote(column) for column in indexed)})"
+            )
+    logger.info("✅ Wrote table %s (%s)", name, ", ".join(frames))
+
+
+def export_database(data_root: str | Path, database: str | Path | None = None) -> Path:
+    """Write the SQLite copy of every CSV below `data_root`.
+
+    Returns the database's path, `<data_root>/letour.sqlite` by default.
+    """
+    database = Path(database) if database else Path(data_root) / DATABASE_FILE
+    staging = database.with_name(database.name + ".tmp")
+    staging.unlink(missing_ok=True)
+
+    connection = sqlite3.connect(staging)
+    try:
+        # A crash leaves only the staging file behind, so no journal needed
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        with connection:
+            # One transaction for all tables
+            connection.execute("BEGIN")
+            for table in SQL_TABLES:
+                frames = _race_frames(data_root, table)
+                if frames:
+                    _write_table(connection, table, frames)
+    finally:
+        connection.close()
+    staging.replace(database)
+    return database
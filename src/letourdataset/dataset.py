@@ -0,0 +1,181 @@
+"""Indexed, read-only view of one race's tables for fast lookups.
+
+Filtering a table with a boolean mask (`df[df["Year"] == year]`) scans
+every row. A `Dataset` loads the tables once (through the column cache,
+see `letourdataset.cache`) and sorts each of them by the key it is looked
+up by, so a lookup is two binary searches on the sorted key array and the
+answer a contiguous slice of rows, returned without copying:
+
+    ds = Dataset.load(MEN)
+    ds.edition(2025)                           # final GC of one edition
+    ds.stage(2025, 13, "Individual (Stage)")   # one stage's ranking
+    ds.rider_career("TADEJ POGACAR")
+    ds.winners()
+
+Names (riders, teams) are looked up in a dict from name to the range of
+rows in a copy of the table sorted by name. Results are views of the
+indexed tables: don't modify them, `.copy()` first.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from letourdataset.cache import load
+from letourdataset.schema import ALL_RANKINGS, RIDERS, STAGES, table_path
+from letourdataset.stages import STAGE_KEY_SCALE, parse_stage_key, stage_keys
+
+# Rows with a missing key sort first under this key and are never matched
+MISSING_KEY = -1
+# Stage keys are below this, so (year, stage key) packs into one integer
+STAGE_KEY_LIMIT = 100 * STAGE_KEY_SCALE
+
+
+class SortedIndex:
+    """A table sorted by an integer key, for range lookups."""
+
+    def __init__(self, frame: pd.DataFrame, keys: np.ndarray) -> None:
+        if np.any(keys[1:] < keys[:-1]):
+            order = np.argsort(keys, kind="stable")
+            keys = keys[order]
+            frame = frame.take(order)
+        self.keys = keys
+        self.frame = frame.reset_index(drop=True)
+
+    def range(self, low: int, high: int | None = None) -> pd.DataFrame:
+        """The rows with `low <= key <= high` (`key == low` without `high`)."""
+        start = np.searchsorted(self.keys, low, side="left")
+        stop = np.searchsorted(self.keys, low if high is None else high, "right")
+        return self.frame.iloc[start:stop]
+
+
+class NameIndex:
+    """A table grouped by a text column, for exact-match lookups."""
+
+    def __init__(self, frame: pd.DataFrame, column: str) -> None:
+        frame = frame.dropna(subset=[column]).sort_values(column, kind="stable")
+        self.frame = frame.reset_index(drop=True)
+        names = self.frame[column].to_numpy(dtype=object)
+        starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]])
+        stops = np.r_[starts[1:], len(names)]
+        self.ranges: dict[str, tuple[int, int]] = {
+            names[start]: (int(start), int(stop)) for start, stop in zip(starts, stops)
+        }
+
+    def get(self, name: str) -> pd.DataFrame:
+        """The rows whose column equals `name`; empty when there are none."""
+        start, stop = self.ranges.get(name, (0, 0))
+        return self.frame.iloc[start:stop]
+
+
+def _int_keys(values: pd.Series) -> np.ndarray:
+    return values.astype("Int64").fillna(MISSING_KEY).to_numpy(dtype="int64")
+
+
+def _ranking_key(year: int, stage: int, ranking_type: int, types: int) -> int:
+    """(Year, stage key, ranking type code) packed into one sortable integer.
+
+    Also works element-wise on integer arrays.
+    """
+    return (year * STAGE_KEY_LIMIT + stage) * types + ranking_type
+
+
+class Dataset:
+    """One race's riders, stages and (optionally) all-rankings tables.
+
+    Build it with `Dataset.load`, or from frames typed as by
+    `schema.read_table_csv`.
+    """
+
+    def __init__(
+        self,
+        riders: pd.DataFrame,
+        stages: pd.DataFrame,
+        all_rankings: pd.DataFrame | None = None,
+    ) -> None:
+        self._riders = SortedIndex(riders, _int_keys(riders["Year"]))
+        self._stages = SortedIndex(stages, _int_keys(stages["Year"]))
+        by_year = self._riders.frame
+        self._by_rider = NameIndex(by_year, "Rider")
+        self._by_team = NameIndex(by_year, "Team")
+        self._winners = by_year[by_year["Rank"] == 1].reset_index(drop=True)
+
+        self._ranking_types: dict[str, int] = {}
+        self._rankings: SortedIndex | None = None
+        if all_rankings is not None:
+            types = all_rankings["Ranking type"]
+            self._ranking_types = {
+                name: code for code, name in enumerate(sorted(types.dropna().unique()))
+            }
+            self._rankings = SortedIndex(all_rankings, self._ranking_keys(all_rankings))
+
+    @classmethod
+    def load(cls, race: str, data_root: str | Path = "data") -> "Dataset":
+        """Load a race's tables; all rankings only if the file exists."""
+        all_rankings = None
+        if table_path(data_root, race, ALL_RANKINGS).exists():
+            all_rankings = load(race, ALL_RANKINGS, data_root=data_root)
+        return cls(
+            load(race, RIDERS, data_root=data_root),
+            load(race, STAGES, data_root=data_root),
+            all_rankings,
+        )
+
+    def _ranking_keys(self, all_rankings: pd.DataFrame) -> np.ndarray:
+        years = _int_keys(all_rankings["Year"])
+        stages = _int_keys(stage_keys(all_rankings["Stages"]))
+        types = (
+            all_rankings["Ranking type"]
+            .map(self._ranking_types)
+            .astype("Int64")
+            .fillna(MISSING_KEY)
+            .to_numpy(dtype="int64")
+        )
+        keys = _ranking_key(years, stages, types, len(self._ranking_types))
+        missing = (years == MISSING_KEY) | (stages == MISSING_KEY)
+        return np.where(missing | (types == MISSING_KEY), MISSING_KEY, keys)
+
+    def edition(self, year: int) -> pd.DataFrame:
+        """The riders table of one edition (its final GC)."""
+        return self._riders.range(year)
+
+    def editions(self, first: int, last: int) -> pd.DataFrame:
+        """The riders tables of the editions from `first` to `last`."""
+        return self._riders.range(first, last)
+
+    def stages(self, year: int) -> pd.DataFrame:
+        """The stages of one edition."""
+        return self._stages.range(year)
+
+    def stage(
+        self, year: int, stage: int | float | str, ranking_type: str
+    ) -> pd.DataFrame:
+        """One classification of one stage, e.g. `stage(1934, 13.1, ...)`.
+
+        Raises:
+            LookupError: If no all-rankings table was loaded.
+        """
+        if self._rankings is None:
+            raise LookupError(
+                "No all-rankings table loaded. Run 'make update' to generate it."
+            )
+        key = parse_stage_key(stage)
+        code = self._ranking_types.get(ranking_type)
+        if key is None or code is None:
+            return self._rankings.frame.iloc[0:0]
+        return self._rankings.range(
+            _ranking_key(year, key, code, len(self._ranking_types))
+        )
+
+    def rider_career(self, name: str) -> pd.DataFrame:
+        """Every final-GC row of one rider, by exact name, oldest first."""
+        return self._by_rider.get(name)
+
+    def team(self, name: str) -> pd.DataFrame:
+        """Every final-GC row of one team, by exact name."""
+        return self._by_team.get(name)
+
+    def winners(self) -> pd.DataFrame:
+        """The winner of every edition, oldest first."""
+        return self._winners
@@ -0,0 +1,254 @@
+"""One row of statistics per edition, from the riders and stages tables.
+
+The plots, the docs and the repair scripts each need the same few facts
+about an edition: who won and by how much, how fast, how many finished.
+`edition_statistics` derives all of them in one pass over a race's riders
+table (one row per finisher) and stages table (one row per stage):
+
+    Finishers             riders with a final rank
+    Winner, WinnerTeam    the rider ranked 1st, missing where the title was
+                          taken away (1999-2005)
+    WinnerSeconds         the winning time
+    WinnerPace            the first-ranked rider's average speed (km/h)
+    MarginSeconds         the runner-up's gap to the winner
+    LanterneRougeSeconds  the last finisher's gap to the winner
+    SpreadSeconds         the interquartile range of the finishers' gaps
+    StageCount            stages in the stages table, prologue included
+    Yellow Jersey, ...    the jersey wearers after the last stage
+
+The time statistics are missing for editions not decided on time (see
+`ResultType`) and where the source has no times.
+
+`load_editions` caches a race's statistics in `<race>/.cache/editions.arrow`,
+keyed by the hashes of the two files, so they are only recomputed when the
+data changed.
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from letourdataset.cache import (
+    CACHE_DIR,
+    load_file,
+    read_cache,
+    source_hash,
+    write_cache,
+)
+from letourdataset.schema import RACE_LAYOUT, RIDERS, STAGES, table_path, to_frame
+from letourdataset.stages import stage_keys
+
+logger = logging.getLogger(__name__)
+
+# Below the data root, next to men/ and women/
+EDITIONS_DIR = "editions"
+EDITIONS_FILE = "editions.arrow"
+# Bump when the statistics change, so cached tables are recomputed
+EDITIONS_VERSION = 3
+JERSEY_COLUMNS = ["Yellow Jersey", "Green jersey", "Polka-dot jersey", "White jersey"]
+EDITION_COLUMNS = [
+    "Year",
+    "ResultType",
+    "Distance (km)",
+    "StageCount",
+    "Finishers",
+    "Winner",
+    "WinnerTeam",
+    "WinnerSeconds",
+    "WinnerPace",
+    "MarginSeconds",
+    "LanterneRougeSeconds",
+    "SpreadSeconds",
+    *JERSEY_COLUMNS,
+]
+_INTEGERS = [
+    "Year",
+    "Distance (km)",
+    "StageCount",
+    "Finishers",
+    "WinnerSeconds",
+    "MarginSeconds",
+    "LanterneRougeSeconds",
+    "SpreadSeconds",
+]
+_RIDERS_COLUMNS = [
+    "Year",
+    "Rank",
+    "Rider",
+    "Team",
+    "Distance (km)",
+    "ResultType",
+    "TotalSeconds",
+    "GapSeconds",
+]
+_STRINGS = ["ResultType", "Winner", "WinnerTeam", *JERSEY_COLUMNS]
+
+
+def _rider_statistics(riders: pd.DataFrame) -> pd.DataFrame:
+    """The riders table's statistics, indexed by Year."""
+    df = pd.DataFrame(
+        {
+            column: riders[column] if column in riders else pd.NA
+            for column in _RIDERS_COLUMNS
+        },
+        index=riders.index,
+    )
+    df["Rank"] = pd.to_numeric(df["Rank"], errors="coerce")
+    df["TotalSeconds"] = pd.to_numeric(df["TotalSeconds"], errors="coerce")
+    df["GapSeconds"] = pd.to_numeric(df["GapSeconds"], errors="coerce")
+    df = df[df["Year"].notna()]
+    editions = df.groupby("Year", sort=True).agg(
+        {"Distance (km)": "first", "ResultType": "first"}
+    )
+
+    ranked = df[df["Rank"].notna()].sort_values(["Year", "Rank"], kind="stable")
+    years = ranked.groupby("Year", sort=True)
+    position = years.cumcount().to_numpy()
+    first = ranked[position == 0].set_index("Year")
+    # The winning time, also where the title was taken away and the
+    # best-placed rider left is ranked 2nd, with their gap to it
+    winning = first["TotalSeconds"] - first["GapSeconds"].fillna(0)
+    # GapSeconds is 0 where the printed gap didn't parse (60 hours and
+    # more, in the early editions); the difference of the times is not
+    gap = ranked["GapSeconds"].where(
+        ranked["GapSeconds"] > 0,
+        ranked["TotalSeconds"] - winning.reindex(ranked["Year"]).to_numpy(),
+    )
+    ranked = ranked.assign(gap=gap)
+    last = ranked[position == years["Rank"].transform("size").to_numpy() - 1]
+    gaps = ranked.groupby("Year", sort=True)["gap"]
+    winners = first[first["Rank"] == 1]
+    runners_up = ranked[ranked["Rank"] == 2].drop_duplicates("Year")
+
+    editions["Finishers"] = years["Rank"].size()
+    editions["Winner"] = winners["Rider"]
+    editions["WinnerTeam"] = winners["Team"]
+    editions["WinnerSeconds"] = winning
+    editions["MarginSeconds"] = runners_up.set_index("Year")["gap"]
+    editions["LanterneRougeSeconds"] = last.set_index("Year")["gap"]
+    editions["SpreadSeconds"] = (gaps.quantile(0.75) - gaps.quantile(0.25)).round()
+
+    # Points and no-results editions print zeros for their times
+    on_time = editions["ResultType"].fillna("time") == "time"
+    timed = on_time & (editions["WinnerSeconds"] > 0)
+    for column in ("WinnerSeconds", "LanterneRougeSeconds", "SpreadSeconds"):
+        editions[column] = editions[column].where(timed)
+    editions["MarginSeconds"] = editions["MarginSeconds"].where(
+        timed & (editions["MarginSeconds"] > 0)
+    )
+    # The pace is the first-ranked rider's own, as the plots always showed
+    # it; in 1999-2005 that is the best-placed rider left, not the winning
+    # time's
+    seconds = first["TotalSeconds"].astype("Float64")
+    seconds = seconds.where(seconds > 0).reindex(editions.index)
+    editions["WinnerPace"] = editions["Distance (km)"].astype("Float64") / (
+        seconds / 3600
+    )
+    editions["Finishers"] = editions["Finishers"].fillna(0)
+    return editions
+
+
+def _stage_statistics(stages: pd.DataFrame) -> pd.DataFrame:
+    """The stages table's statistics, indexed by Year."""
+    df = stages[stages["Year"].notna()].assign(stage_key=stage_keys(stages["Stages"]))
+    # The last stage sorts last; unparseable stage labels first
+    df = df.sort_values(["Year", "stage_key"], kind="stable", na_position="first")
+    years = df.groupby("Year", sort=True)
+    editions = pd.DataFrame({"StageCount": years["Stages"].nunique()})
+    final = df.drop_duplicates("Year", keep="last").set_index("Year")
+    for column in JERSEY_COLUMNS:
+        if column in final:
+            editions[column] = final[column]
+    return editions
+
+
+def edition_statistics(
+    riders: pd.DataFrame, stages: pd.DataFrame | None = None
+) -> pd.DataFrame:
+    """Statistics of every edition (`EDITION_COLUMNS`), sorted by year.
+
+    Without `stages`, the stage count and jersey wearers are missing.
+    Years in only one of the two tables are kept.
+    """
+    editions = _rider_statistics(riders)
+    if stages is not None:
+        editions = editions.join(_stage_statistics(stages), how="outer")
+    editions = editions.reset_index().reindex(columns=EDITION_COLUMNS)
+    editions = editions.astype({column: "Float64" for column in _INTEGERS})
+    editions = editions.astype({column: "Int64" for column in _INTEGERS})
+    editions["WinnerPace"] = editions["WinnerPace"].astype(float)
+    return _typed_strings(editions)
+
+
+def _typed_strings(editions: pd.DataFrame) -> pd.DataFrame:
+    # "string", not "str": under pandas 2, "str" turns <NA> into "nan"
+    return editions.astype({column: "string" for column in _STRINGS})
+
+
+def _digest(*paths: Path) -> str:
+    """One hash of the statistics' version and input files."""
+    parts = [str(EDITIONS_VERSION)]
+    parts += [source_hash(path) if path.exists() else "" for path in paths]
+    return hashlib.sha256(":".join(parts).encode()).hexdigest()
+
+
+def _to_arrow(editions: pd.DataFrame) -> pa.Table:
+    arrays = {}
+    for column in editions.columns:
+        values = editions[column]
+        if column in _INTEGERS:
+            arrays[column] = pa.array(values, type=pa.int64())
+        elif column == "WinnerPace":
+            arrays[column] = pa.array(values, type=pa.float64())
+        else:
+            arrays[column] = pa.array(values, type=pa.string())
+    return pa.table(arrays)
+
+
+def load_editions(race: str, data_root: str | Path = "data") -> pd.DataFrame:
+    """A race's edition statistics, recomputed only when its data changed.
+
+    Raises:
+        FileNotFoundError: If the race has no riders file.
+    """
+    riders_path = table_path(data_root, race, RIDERS)
+    if not riders_path.exists():
+        raise FileNotFoundError(
+            f"Missing {RIDERS} file: {riders_path}. Run 'make update' first."
+        )
+    stages_path = table_path(data_root, race, STAGES)
+    digest = _digest(riders_path, stages_path)
+    path = riders_path.parent / CACHE_DIR / EDITIONS_FILE
+
+    arrow = read_cache(path, digest)
+    if arrow is None:
+        stages = load_file(stages_path, STAGES) if stages_path.exists() else None
+        arrow = _to_arrow(edition_statistics(load_file(riders_path, RIDERS), stages))
+        try:
+            write_cache(path, arrow, digest)
+            logger.info("✅ Cached the edition statistics of %s", race)
+        except OSError as e:
+            logger.warning("Could not cache the edition statistics: %s", e)
+    return _typed_strings(to_frame(arrow))
+
+
+def write_editions(
+    data_root: str | Path = "data", directory: str | Path | None = None
+) -> Path:
+    """Write the edition statistics of every race with a riders file.
+
+    Returns the directory, `<data_root>/editions` by default.
+    """
+    directory = Path(directory) if directory else Path(data_root) / EDITIONS_DIR
+    for race in RACE_LAYOUT:
+        if not table_path(data_root, race, RIDERS).exists():
+            logger.warning("No riders file for %s", race)
+            continue
+        editions = load_editions(race, data_root)
+        directory.mkdir(parents=True, exist_ok=True)
+        editions.to_csv(directory / f"{race}.csv", index=False)
+        logger.info("✅ Wrote the statistics of %d editions of %s", len(editions), race)
+    return directory
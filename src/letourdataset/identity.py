@@ -0,0 +1,421 @@
+"""Stable rider IDs across editions and tables.
+
+The source has no rider ID, and a rider's name varies between tables and
+years: 'LUIS PEREZ RODRIGUEZ' in the all rankings is 'LUIS PEREZ' in the
+final GC, 'Henri Cornet (Geboren Jardy)' on the stage pages is 'HENRI
+CORNET'. `resolve` groups the names of a race into riders:
+
+1. Every name (see `letourdataset.names`) is reduced to its folded form,
+   with the years it appears in. Identical folded names are one rider.
+2. Folded names are blocked twice: by surname and first initial (each
+   word after the first, paired with the first letter of the first name)
+   and by team-year (the team a name rode for in an edition, from the
+   `Team` column or a stage winner's team suffix). Only names sharing a
+   block are compared, so the work grows with the block sizes, not with
+   the square of the number of names.
+3. Within a surname block, two names are the same rider when the words of
+   one are a subset of the other's, the first names agree (or one is an
+   initial of the other) and the years they appear in are close. Within a
+   team-year block, two names with the same words in another order
+   ('MERCKX EDDY') are the same rider.
+4. A short name that fits several different longer ones goes to the one
+   it shares a team-year with; if none or several do, it is ambiguous and
+   left alone.
+
+Each rider gets an ID made of its folded name and first year, e.g.
+`maurice-garin-1903`. That alone wouldn't be stable: a new edition can
+change which spelling is canonical, or merge a name into another rider.
+`write_identities` saves the rider dimension and the name -> ID aliases to
+`data/identities/`, and the next resolution reuses those aliases: a rider
+keeps the ID most of its names had before, and an ID once given out is
+never given to another rider. `data/identities/aliases.csv` is tracked in
+git, so the IDs are the same on every clone, not just on the machine that
+last resolved them.
+"""
+
+import logging
+from collections import defaultdict
+from itertools import combinations
+from pathlib import Path
+
+import pandas as pd
+
+from letourdataset.cache import load_arrow
+from letourdataset.names import NAME_COLUMNS, clean_name, fold, team_suffix
+from letourdataset.schema import RACE_LAYOUT, RIDERS, TABLES, table_path, to_frame
+
+logger = logging.getLogger(__name__)
+
+# Below the data root, next to men/ and women/
+IDENTITY_DIR = "identities"
+RIDER_COLUMNS = [
+    "rider_id",
+    "race",
+    "name",
+    "first_year",
+    "last_year",
+    "editions",
+    "variants",
+]
+ALIAS_COLUMNS = ["race", "name", "rider_id"]
+# Years two spellings may lie apart and still be one rider; the Tour
+# paused for seven years over the Second World War.
+MAX_GAP_YEARS = 8
+
+
+class _UnionFind:
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        self.parent[self.find(i)] = self.find(j)
+
+
+def _mentions(tables: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Distinct (name, Year, team) of a race, with the folded name and team."""
+    parts = []
+    teams: set[str] = set()
+    for table, df in tables.items():
+        if "Team" in df:
+            teams.update(fold(str(team)) for team in df["Team"].dropna().unique())
+        for column in NAME_COLUMNS[table]:
+            if column not in df:
+                continue
+            team = ["Team"] if "Team" in df and column != "Winner of stage" else []
+            pairs = df[[column, "Year", *team]].dropna(subset=[column, "Year"])
+            pairs = pairs.drop_duplicates()
+            pairs = pairs.rename(columns={column: "raw", "Team": "team"})
+            if not team:
+                suffixes = {
+                    value: team_suffix(value) for value in pairs["raw"].unique()
+                }
+                pairs["team"] = pairs["raw"].map(suffixes)
+            pairs["in_riders"] = table == RIDERS
+            # Team time trials are won by a team, not a rider
+            pairs["stage_winner"] = column == "Winner of stage"
+            parts.append(pairs)
+    if not parts:
+        return pd.DataFrame(columns=["name", "folded", "Year", "team", "in_riders"])
+
+    mentions = pd.concat(parts, ignore_index=True)
+    raw = mentions["raw"].unique()
+    cleaned = {value: clean_name(value) for value in raw}
+    mentions["name"] = mentions["raw"].map(cleaned)
+    mentions = mentions.dropna(subset=["name"])
+    folded = {name: fold(name) for name in mentions["name"].unique()}
+    mentions["folded"] = mentions["name"].map(folded)
+    team_wins = mentions["stage_winner"] & mentions["folded"].isin(teams)
+    mentions = mentions[(mentions["folded"] != "") & ~team_wins]
+    folded_teams = {
+        team: fold(str(team)) for team in mentions["team"].dropna().unique()
+    }
+    mentions["team"] = mentions["team"].map(folded_teams).replace("", None)
+    return mentions[["name", "folded", "Year", "team", "in_riders"]]
+
+
+def _team_years(mentions: pd.DataFrame) -> dict[str, set[tuple[str, int]]]:
+    """The (team, year) pairs of each folded name."""
+    team_years: dict[str, set[tuple[str, int]]] = defaultdict(set)
+    known = mentions.dropna(subset=["team"])
+    for folded, team, year in zip(known["folded"], known["team"], known["Year"]):
+        team_years[folded].add((team, int(year)))
+    return team_years
+
+
+def _compatible(a: list[str], b: list[str]) -> bool:
+    """Whether two folded names (as words) can be the same rider."""
+    first_a, first_b = a[0], b[0]
+    if not (
+        first_a == first_b
+        or (len(first_a) == 1 and first_b.startswith(first_a))
+        or (len(first_b) == 1 and first_a.startswith(first_b))
+    ):
+        return False
+    rest_a, rest_b = set(a[1:]), set(b[1:])
+    return bool(rest_a and rest_b) and (rest_a <= rest_b or rest_b <= rest_a)
+
+
+def _close(span_a: tuple[int, int], span_b: tuple[int, int]) -> bool:
+    gap = max(span_a[0], span_b[0]) - min(span_a[1], span_b[1])
+    return gap <= MAX_GAP_YEARS
+
+
+def _cluster(
+    variants: pd.DataFrame, team_years: dict[str, set[tuple[str, int]]]
+) -> list[int]:
+    """Cluster label of each folded name (row of `variants`)."""
+    words = [name.split() for name in variants.index]
+    spans = list(zip(variants["first_year"], variants["last_year"]))
+    seasons = [team_years.get(name, set()) for name in variants.index]
+
+    blocks: dict[tuple[str, str], list[int]] = defaultdict(list)
+    for i, name in enumerate(words):
+        for surname in set(name[1:]):
+            blocks[(surname, name[0][0])].append(i)
+
+    # Candidate pairs, each compared once however many blocks share it;
+    # `longer` maps a vague name to the more detailed names it fits
+    longer: dict[int, set[int]] = defaultdict(set)
+    uf = _UnionFind(len(words))
+    compared: set[tuple[int, int]] = set()
+    for members in blocks.values():
+        for i, j in combinations(members, 2):
+            if (i, j) in compared:
+                continue
+            compared.add((i, j))
+            if not (_compatible(words[i], words[j]) and _close(spans[i], spans[j])):
+                continue
+            # The vaguer name has fewer words, or an initial for a first name
+            detail_i = (len(words[i]), len(words[i][0]))
+            detail_j = (len(words[j]), len(words[j][0]))
+            if detail_i == detail_j:
+                uf.union(i, j)
+            elif detail_i < detail_j:
+                longer[i].add(j)
+            else:
+                longer[j].add(i)
+
+    # Teammates of one edition whose names have the same words are one
+    # rider, whatever the order of the words
+    teams: dict[tuple[str, int], list[int]] = defaultdict(list)
+    for i, keys in enumerate(seasons):
+        for key in keys:
+            teams[key].append(i)
+    for members in teams.values():
+        for i, j in combinations(members, 2):
+            if sorted(words[i]) == sorted(words[j]):
+                uf.union(i, j)
+
+    for short, candidates in longer.items():
+        roots = {uf.find(j) for j in candidates}
+        if len(roots) > 1:
+            # A team-year shared with just one of them settles it
+            shared = {uf.find(j) for j in candidates if seasons[short] & seasons[j]}
+            if len(shared) == 1:
+                roots = shared
+        if len(roots) == 1:
+            uf.union(short, roots.pop())
+        else:
+            logger.debug("Ambiguous rider name: %s", variants.index[short])
+    return [uf.find(i) for i in range(len(words))]
+
+
+def resolve_race(tables: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Resolve the names of one race's tables into riders.
+
+    Returns one row per distinct printed name, with its cluster's
+    `canonical` name, `first_year`, `last_year` and riders-table `editions`.
+    """
+    mentions = _mentions(tables)
+    if mentions.empty:
+        return pd.DataFrame(
+            columns=["name", "folded", "canonical", "first_year", "last_year"]
+        )
+    grouped = mentions.groupby("folded")
+    variants = pd.DataFrame(
+        {
+            "first_year": grouped["Year"].min().astype(int),
+            "last_year": grouped["Year"].max().astype(int),
+            "editions": mentions[mentions["in_riders"]]
+            .groupby("folded")["Year"]
+            .nunique(),
+        }
+    ).fillna({"editions": 0})
+    variants["cluster"] = _cluster(variants, _team_years(mentions))
+
+    # The canonical name: the one with the most editions in the final GC,
+    # then the longest (it has the most to go by)
+    variants["length"] = variants.index.str.len()
+    canonical = (
+        variants.sort_values(["editions", "length"], ascending=False, kind="stable")
+        .reset_index()
+        .drop_duplicates("cluster")
+        .set_index("cluster")["folded"]
+    )
+    clusters = variants.groupby("cluster").agg(
+        first_year=("first_year", "min"),
+        last_year=("last_year", "max"),
+    )
+    clusters["canonical"] = canonical
+    editions = (
+        mentions[mentions["in_riders"]]
+        .assign(cluster=lambda df: df["folded"].map(variants["cluster"]))
+        .groupby("cluster")["Year"]
+        .nunique()
+    )
+    clusters["editions"] = editions.reindex(clusters.index, fill_value=0)
+
+    names = mentions.drop_duplicates("name")[["name", "folded"]]
+    names = names.join(variants["cluster"], on="folded")
+    return names.join(clusters, on="cluster").drop(columns="cluster")
+
+
+def _display_names(names: pd.DataFrame) -> pd.Series:
+    # Print a rider as its canonical name is printed, preferring the form
+    # with lower case letters (the jersey pages keep the accents)
+    forms = names[names["folded"] == names["canonical"]]
+    mixed = forms[~forms["name"].str.isupper()]
+    display = pd.concat([mixed, forms]).drop_duplicates("canonical")
+    return display.set_index("canonical")["name"]
+
+
+def _assign_ids(
+    dimension: pd.DataFrame, alias: pd.DataFrame, previous: pd.DataFrame | None
+) -> dict[int, str]:
+    """The rider ID of each row of `dimension`, reusing `previous` IDs."""
+    ids: dict[int, str] = {}
+    taken: set[str] = set()
+    if previous is not None and not previous.empty:
+        taken.update(previous["rider_id"].dropna())
+        # Each rider claims the previous IDs of its names, by how many
+        # names had them; an ID goes to the rider with the strongest claim
+        before = previous.drop_duplicates(["race", "name"])
+        claims = alias.join(
+            before.set_index(["race", "name"])["rider_id"], on=["race", "name"]
+        ).dropna(subset=["rider_id"])
+        claims = (
+            claims.groupby(["race", "canonical", "rider_id"])
+            .size()
+            .rename("names")
+            .reset_index()
+            .sort_values(["names", "rider_id"], ascending=[False, True])
+        )
+        rows = dict(
+            zip(zip(dimension["race"], dimension["canonical"]), dimension.index)
+        )
+        claimed: set[str] = set()
+        for race, canonical, rider_id in claims[
+            ["race", "canonical", "rider_id"]
+        ].itertuples(index=False):
+            row = rows[(race, canonical)]
+            if row not in ids and rider_id not in claimed:
+                ids[row] = rider_id
+                claimed.add(rider_id)
+
+    base = dimension["canonical"].str.replace(" ", "-") + "-"
+    base += dimension["first_year"].astype(str)
+    for row, key in base.items():
+        if row in ids:
+            continue
+        rider_id, repeat = key, 1
+        while rider_id in taken:
+            repeat += 1
+            rider_id = f"{key}-{repeat}"
+        taken.add(rider_id)
+        ids[row] = rider_id
+    return ids
+
+
+def resolve(
+    races: dict[str, dict[str, pd.DataFrame]],
+    previous: pd.DataFrame | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Rider dimension (`RIDER_COLUMNS`) and aliases (`ALIAS_COLUMNS`).
+
+    `races` maps a race to its tables, e.g. `{MEN: {RIDERS: df, ...}}`.
+    `previous` are the aliases of an earlier resolution (see
+    `read_aliases`); a rider keeps the ID most of its names had there.
+    IDs are unique across races, and never reuse a previous ID; when two
+    new riders would get the same one, the later ones get a `-2`, `-3`,
+    ... suffix.
+    """
+    riders, aliases = [], []
+    for race, tables in races.items():
+        names = resolve_race(tables)
+        if names.empty:
+            continue
+        display = _display_names(names)
+        dimension = (
+            names.drop_duplicates("canonical")
+            .assign(
+                race=race,
+                name=lambda df: df["canonical"].map(display),
+                variants=lambda df: df["canonical"].map(
+                    names.groupby("canonical")["folded"].nunique()
+                ),
+            )
+            .drop(columns="folded")
+        )
+        riders.append(dimension)
+        aliases.append(names.assign(race=race)[["race", "name", "canonical"]])
+    if not riders:
+        return pd.DataFrame(columns=RIDER_COLUMNS), pd.DataFrame(columns=ALIAS_COLUMNS)
+
+    dimension = pd.concat(riders, ignore_index=True).sort_values(
+        ["first_year", "canonical", "race"], kind="stable"
+    )
+    alias = pd.concat(aliases, ignore_index=True)
+    dimension["rider_id"] = pd.Series(_assign_ids(dimension, alias, previous))
+
+    ids = dimension.set_index(["race", "canonical"])["rider_id"]
+    alias = alias.join(ids, on=["race", "canonical"])
+    return (
+        dimension[RIDER_COLUMNS].reset_index(drop=True),
+        alias.sort_values(["race", "name"], kind="stable")[ALIAS_COLUMNS].reset_index(
+            drop=True
+        ),
+    )
+
+
+def load_tables(data_root: str | Path = "data") -> dict[str, dict[str, pd.DataFrame]]:
+    """The name, team and year columns of every data file, by race."""
+    races: dict[str, dict[str, pd.DataFrame]] = {}
+    for race in RACE_LAYOUT:
+        for table in TABLES:
+            path = table_path(data_root, race, table)
+            if not path.exists():
+                continue
+            arrow = load_arrow(path, table)
+            wanted = ["Year", "Team", *NAME_COLUMNS[table]]
+            columns = [col for col in wanted if col in arrow.schema.names]
+            races.setdefault(race, {})[table] = to_frame(arrow.select(columns))
+    return races
+
+
+def read_aliases(
+    data_root: str | Path = "data", directory: str | Path | None = None
+) -> pd.DataFrame | None:
+    """The aliases `write_identities` last wrote, or None if there are none."""
+    directory = Path(directory) if directory else Path(data_root) / IDENTITY_DIR
+    path = directory / "aliases.csv"
+    if not path.exists():
+        return None
+    # Names are kept as printed, even one that reads as "NA"
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def write_identities(
+    data_root: str | Path = "data", directory: str | Path | None = None
+) -> Path:
+    """Resolve every data file and write `riders.csv` and `aliases.csv`.
+
+    The IDs of the aliases already in the directory are kept. Returns the
+    directory, `<data_root>/identities` by default.
+    """
+    directory = Path(directory) if directory else Path(data_root) / IDENTITY_DIR
+    riders, aliases = resolve(
+        load_tables(data_root), read_aliases(data_root, directory)
+    )
+    directory.mkdir(parents=True, exist_ok=True)
+    riders.to_csv(directory / "riders.csv", index=False)
+    aliases.to_csv(directory / "aliases.csv", index=False)
+    logger.info(
+        "✅ Resolved %d names into %d riders in %s",
+        len(aliases),
+        len(riders),
+        directory,
+    )
+    return directory
+
+
+def rider_ids(names: pd.Series, aliases: pd.DataFrame, race: str) -> pd.Series:
+    """The rider ID of each name of a race's table, as printed there."""
+    lookup = aliases[aliases["race"] == race].set_index("name")["rider_id"]
+    cleaned = {value: clean_name(value) for value in names.dropna().unique()}
+    return names.map(cleaned).map(lookup)
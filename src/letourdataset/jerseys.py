@@ -0,0 +1,189 @@
+"""Who held each jersey when: spells and career totals, from the stages table.
+
+The stages table names, for every stage, the wearer of each jersey after
+it (and, before the yellow jersey of 1919, the `Leader`). A spell is a run
+of consecutive stages of one edition with the same wearer; `jersey_spells`
+finds all of them, for every jersey and year at once, by run-length
+encoding the wearers with NumPy:
+
+1. the stages are sorted by (Year, stage) and each jersey column's names
+   are reduced to integer codes of their normalised form (see
+   `letourdataset.names`), so spellings of one rider are one code;
+2. the code columns are laid end to end, jersey after jersey, and a run
+   starts wherever the code, the year or the jersey changes;
+3. each run's length, first and last stage, and days follow from the
+   positions the runs start at (`np.add.reduceat` sums the days).
+
+Days count the days on which the rider held the jersey: the parts of a
+split stage (`2.1`, `2.2`) are one day. A stage without a wearer (the
+jersey didn't exist yet, or the source has a gap) ends the spell.
+
+`jersey_careers` sums the spells per rider and jersey. `write_jerseys`
+saves both per race to `data/jerseys/`.
+"""
+
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from letourdataset.cache import load
+from letourdataset.names import NAME_COLUMNS, clean_name, fold
+from letourdataset.schema import RACE_LAYOUT, STAGES, table_path
+from letourdataset.stages import STAGE_KEY_SCALE, format_stage_keys, stage_keys
+
+logger = logging.getLogger(__name__)
+
+# Below the data root, next to men/ and women/
+JERSEY_DIR = "jerseys"
+# The stages columns naming a wearer after each stage
+JERSEYS = tuple(
+    column for column in NAME_COLUMNS[STAGES] if column != "Winner of stage"
+)
+SPELL_COLUMNS = [
+    "Rider",
+    "Jersey",
+    "Year",
+    "FirstStage",
+    "LastStage",
+    "Stages",
+    "Days",
+]
+CAREER_COLUMNS = [
+    "Rider",
+    "Jersey",
+    "Days",
+    "Stages",
+    "Spells",
+    "Editions",
+    "LongestSpell",
+    "FirstYear",
+    "LastYear",
+]
+
+
+def _wearers(stages: pd.DataFrame, jerseys: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Codes of the wearers (stages x jerseys; -1: none) and their names.
+
+    A code stands for a normalised name; its name is the form it is
+    printed in, preferring one with lower case letters (the stage pages
+    keep the accents the final GC drops).
+    """
+    values = pd.concat([stages[column] for column in jerseys], ignore_index=True)
+    codes, uniques = pd.factorize(values)
+    printed = pd.Series([clean_name(value) for value in uniques], dtype=object)
+    folded = printed.map(lambda name: fold(name) if name else None)
+    folded = folded.where(folded != "")
+    keys, riders = pd.factorize(folded)
+
+    forms = pd.DataFrame({"rider": keys, "name": printed})
+    forms = forms[forms["rider"] >= 0]
+    forms = forms.sort_values(
+        "name", key=lambda names: names.str.isupper(), kind="stable"
+    )
+    names = forms.drop_duplicates("rider").set_index("rider")["name"]
+    wearers = np.where(codes >= 0, keys[codes], -1)
+    names = names.reindex(range(len(riders))).to_numpy()
+    return wearers.reshape(len(jerseys), len(stages)), names
+
+
+def jersey_spells(stages: pd.DataFrame) -> pd.DataFrame:
+    """Every spell of every jersey (`SPELL_COLUMNS`).
+
+    Rows are sorted by jersey (in `JERSEYS` order), year and first stage.
+    """
+    jerseys = [column for column in JERSEYS if column in stages]
+    df = stages.assign(stage_key=stage_keys(stages["Stages"]))
+    df = df[df["Year"].notna() & df["stage_key"].notna()]
+    df = df.sort_values(["Year", "stage_key"], kind="stable")
+    if df.empty or not jerseys:
+        return pd.DataFrame(columns=SPELL_COLUMNS)
+
+    wearers, names = _wearers(df, jerseys)
+    n_stages = len(df)
+    years = np.tile(df["Year"].to_numpy(dtype=np.int64), len(jerseys))
+    keys = np.tile(df["stage_key"].to_numpy(dtype=np.int64), len(jerseys))
+    jersey = np.repeat(np.arange(len(jerseys)), n_stages)
+    days = keys // STAGE_KEY_SCALE
+    code = wearers.ravel()
+
+    # Runs of one wearer, within one year and one jersey
+    changed = np.ones(len(code), dtype=bool)
+    changed[1:] = (
+        (code[1:] != code[:-1])
+        | (years[1:] != years[:-1])
+        | (jersey[1:] != jersey[:-1])
+    )
+    starts = np.flatnonzero(changed)
+    ends = np.append(starts[1:], len(code)) - 1
+    new_day = changed.copy()
+    new_day[1:] |= days[1:] != days[:-1]
+
+    held = code[starts] >= 0
+    starts, ends = starts[held], ends[held]
+    spells = pd.DataFrame(
+        {
+            "Rider": names[code[starts]],
+            "Jersey": np.asarray(jerseys, dtype=object)[jersey[starts]],
+            "Year": years[starts],
+            "FirstStage": format_stage_keys(pd.Series(keys[starts])),
+            "LastStage": format_stage_keys(pd.Series(keys[ends])),
+            "Stages": ends - starts + 1,
+            "Days": np.add.reduceat(new_day, np.flatnonzero(changed))[held],
+        }
+    )
+    spells = spells.astype({"Year": "Int64", "Stages": "Int64", "Days": "Int64"})
+    strings = {"Rider": "string", "FirstStage": "string", "LastStage": "string"}
+    return spells.astype(strings)
+
+
+def jersey_careers(spells: pd.DataFrame) -> pd.DataFrame:
+    """Each rider's totals per jersey (`CAREER_COLUMNS`), most days first."""
+    careers = (
+        spells.groupby(["Rider", "Jersey"], sort=False)
+        .agg(
+            Days=("Days", "sum"),
+            Stages=("Stages", "sum"),
+            Spells=("Days", "size"),
+            Editions=("Year", "nunique"),
+            LongestSpell=("Days", "max"),
+            FirstYear=("Year", "min"),
+            LastYear=("Year", "max"),
+        )
+        .reset_index()
+    )
+    careers = careers.sort_values(
+        ["Jersey", "Days", "FirstYear"],
+        ascending=[True, False, True],
+        key=lambda values: (
+            values.map(JERSEYS.index) if values.name == "Jersey" else values
+        ),
+        kind="stable",
+    )
+    integers = [
+        column for column in CAREER_COLUMNS if column not in ("Rider", "Jersey")
+    ]
+    careers = careers.astype({column: "Int64" for column in integers})
+    return careers[CAREER_COLUMNS].reset_index(drop=True)
+
+
+def write_jerseys(
+    data_root: str | Path = "data", directory: str | Path | None = None
+) -> Path:
+    """Write the spells and career totals of every race with a stages file.
+
+    Writes `<race>_spells.csv` and `<race>_careers.csv`. Returns the
+    directory, `<data_root>/jerseys` by default.
+    """
+    directory = Path(directory) if directory else Path(data_root) / JERSEY_DIR
+    for race in RACE_LAYOUT:
+        if not table_path(data_root, race, STAGES).exists():
+            logger.warning("No stages file for %s", race)
+            continue
+        spells = jersey_spells(load(race, STAGES, data_root=data_root))
+        directory.mkdir(parents=True, exist_ok=True)
+        spells.to_csv(directory / f"{race}_spells.csv", index=False)
+        jersey_careers(spells).to_csv(directory / f"{race}_careers.csv", index=False)
+        logger.info("✅ Wrote %d jersey spells for %s", len(spells), race)
+    return directory
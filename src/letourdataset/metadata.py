@@ -0,0 +1,309 @@
+"""Summary sidecars of the data files.
+
+Next to every data file sits `<name>.meta.json` (e.g.
+`TDF_Riders_History.meta.json`) with what most consumers want to know
+about it without parsing it:
+
+    {
+      "version": 2,
+      "table": "Riders",
+      "sha256": "...",          # of the CSV the summary describes
+      "rows": 10337,
+      "first_year": 1903,
+      "latest_year": 2026,
+      "editions": 112,
+      "per_edition": {
+        "1903": {"rows": 21, "stages": 6, "finishers": 21, "bytes": [169, 2261]},
+        ...
+      }
+    }
+
+`stages` is the edition's number of stages and `finishers` its number of
+ranked riders (riders table only). `bytes` is the range of the file the
+edition's rows occupy, so `read_years` can parse just those; it is left
+out when the rows of an edition are not contiguous lines. The sidecars are
+rewritten whenever the postprocessor, the scraper's CSV sink or the GC fix
+writes a data file.
+
+`read_metadata` and `latest_year` only need the standard library when the
+sidecar is current; numpy and pandas are imported on first use. A sidecar
+counts as current when its content hash matches the CSV's; a stale sidecar
+counts as missing, and callers fall back to the CSV.
+
+The sidecars are committed with the data, so they hold nothing about the
+file on one machine. To avoid hashing the CSV on every read, its size and
+mtime when last hashed are kept in the untracked `.cache` directory next
+to it (`.cache/TDF_Riders_History.stat.json`); while they are unchanged,
+the hash recorded with them stands.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import logging
+import mmap
+import os
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from letourdataset.schema import (
+    ALL_RANKINGS,
+    RIDERS,
+    STAGES,
+    read_table_csv,
+    table_of,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_SUFFIX = ".meta.json"
+# Bump when the sidecar's content changes, so older sidecars count as stale
+METADATA_VERSION = 3
+# Local, untracked files next to the data files (see `letourdataset.cache`)
+CACHE_DIR = ".cache"
+STAT_SUFFIX = ".stat.json"
+
+
+# Bytes read at a time when hashing
+_HASH_CHUNK = 1 << 20
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        # `hashlib.file_digest` would do, but needs Python 3.11
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sidecar_path(csv_path: str | Path) -> Path:
+    """`TDF_Riders_History.csv` -> `TDF_Riders_History.meta.json`."""
+    return Path(csv_path).with_suffix(SIDECAR_SUFFIX)
+
+
+def stat_path(csv_path: str | Path) -> Path:
+    """`men/TDF_Riders_History.csv` -> `men/.cache/TDF_Riders_History.stat.json`."""
+    csv_path = Path(csv_path)
+    return csv_path.parent / CACHE_DIR / (csv_path.stem + STAT_SUFFIX)
+
+
+def _known_hash(csv_path: Path, stat: os.stat_result) -> str | None:
+    """The hash last computed of the file, if its size and mtime are unchanged."""
+    try:
+        known = json.loads(stat_path(csv_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if [known.get("size"), known.get("mtime_ns")] != [stat.st_size, stat.st_mtime_ns]:
+        return None
+    return known.get("sha256")
+
+
+def _record_hash(csv_path: Path, stat: os.stat_result, sha256: str) -> None:
+    """Remember that the file, as `stat` found it, has content `sha256`."""
+    known = {"sha256": sha256, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    path = stat_path(csv_path)
+    try:
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(json.dumps(known) + "\n", encoding="utf-8")
+    except OSError:
+        # E.g. a read-only checkout; the file is hashed on every read then
+        logger.debug("Could not write %s", path)
+
+
+def _year_ranges(csv_path: Path, years: "pd.Series") -> dict[int, list[int]]:
+    """Byte range of each year's rows; empty if they aren't contiguous lines.
+
+    `years` holds the Year of every data row, in file order.
+    """
+    import numpy as np
+
+    with (
+        csv_path.open("rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data,
+    ):
+        ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord("\n")) + 1
+    # A quoted field spanning lines gives more lines than rows
+    if len(ends) != len(years) + 1 or years.isna().any():
+        return {}
+    values = years.to_numpy(dtype="int64")
+    starts = np.flatnonzero(np.diff(values, prepend=values[:1] - 1))
+    if len(starts) != len(np.unique(values)):
+        return {}
+    stops = np.append(starts[1:], len(values))
+    # Row i is the line from ends[i] to ends[i + 1]; line 0 is the header
+    return {
+        int(values[start]): [int(ends[start]), int(ends[stop])]
+        for start, stop in zip(starts, stops)
+    }
+
+
+def compute_metadata(
+    csv_path: str | Path, table: str, sha256: str | None = None
+) -> dict[str, Any]:
+    """Summarise a data file; reads only the columns the summary needs.
+
+    Raises:
+        ValueError: If the file has no 'Year' column.
+    """
+    import pandas as pd
+
+    csv_path = Path(csv_path)
+    with csv_path.open(encoding="utf-8", newline="") as f:
+        header = next(csv.reader(f), [])
+    wanted = {
+        RIDERS: ["Year", "Rank", "Number of stages"],
+        STAGES: ["Year"],
+        ALL_RANKINGS: ["Year", "Stages"],
+    }[table]
+    if "Year" not in header:
+        raise ValueError(f"{csv_path.name} has no 'Year' column.")
+    columns = [col for col in wanted if col in header]
+    df = read_table_csv(csv_path, table, columns)
+    ranges = _year_ranges(csv_path, df["Year"])
+    df = df.dropna(subset=["Year"])
+    editions = df.groupby("Year")
+
+    rows = editions.size()
+    stages = finishers = None
+    if table == STAGES:
+        stages = rows
+    elif "Number of stages" in df:
+        stages = editions["Number of stages"].max()
+    elif "Stages" in df:
+        stages = editions["Stages"].nunique()
+    if table == RIDERS and "Rank" in df:
+        finishers = editions["Rank"].count()
+
+    per_edition: dict[str, dict[str, int]] = {}
+    for year, count in rows.items():
+        summary = {"rows": int(count)}
+        if stages is not None and pd.notna(stages[year]):
+            summary["stages"] = int(stages[year])
+        if finishers is not None:
+            summary["finishers"] = int(finishers[year])
+        if ranges:
+            summary["bytes"] = ranges[int(year)]
+        per_edition[str(year)] = summary
+
+    return {
+        "version": METADATA_VERSION,
+        "table": table,
+        "sha256": sha256 or file_hash(csv_path),
+        "rows": len(df),
+        "first_year": int(rows.index.min()) if len(rows) else None,
+        "latest_year": int(rows.index.max()) if len(rows) else None,
+        "editions": len(rows),
+        "per_edition": per_edition,
+    }
+
+
+def read_metadata(
+    csv_path: str | Path, sha256: str | None = None
+) -> dict[str, Any] | None:
+    """The sidecar of a data file, or None if it is missing or stale.
+
+    Pass `sha256` when the file's hash is already known; otherwise the file
+    is only hashed when its size or mtime changed since it was last hashed
+    (see the module docstring).
+    """
+    csv_path = Path(csv_path)
+    try:
+        metadata = json.loads(sidecar_path(csv_path).read_text(encoding="utf-8"))
+        stat = csv_path.stat()
+    except (OSError, ValueError):
+        return None
+    if metadata.get("version") != METADATA_VERSION:
+        return None
+    if sha256 is None:
+        sha256 = _known_hash(csv_path, stat)
+        if sha256 is None:
+            sha256 = file_hash(csv_path)
+            _record_hash(csv_path, stat, sha256)
+    if metadata.get("sha256") != sha256:
+        return None
+    return metadata
+
+
+def write_metadata(
+    csv_path: str | Path, table: str | None = None, sha256: str | None = None
+) -> bool:
+    """Bring a data file's sidecar up to date.
+
+    The table is taken from the file name unless given. Returns True when
+    the sidecar was (re)written, False when it was current.
+    """
+    csv_path = Path(csv_path)
+    if sha256 is None:
+        stat = csv_path.stat()
+        sha256 = file_hash(csv_path)
+        _record_hash(csv_path, stat, sha256)
+    if read_metadata(csv_path, sha256) is not None:
+        return False
+    table = table or table_of(csv_path)
+    if table is None:
+        raise ValueError(f"{csv_path.name} is not a data table file.")
+    metadata = compute_metadata(csv_path, table, sha256)
+    sidecar = sidecar_path(csv_path)
+    staging = sidecar.with_name(sidecar.name + ".tmp")
+    staging.write_text(json.dumps(metadata, indent=2) + "\n", encoding="utf-8")
+    staging.replace(sidecar)
+    logger.info("✅ Wrote %s", sidecar.name)
+    return True
+
+
+def latest_year(csv_path: str | Path, table: str | None = None) -> int | None:
+    """Newest edition in a data file, from its sidecar when current."""
+    metadata = read_metadata(csv_path)
+    if metadata is not None:
+        return metadata["latest_year"]
+    table = table or table_of(csv_path)
+    if table is None:
+        raise ValueError(f"{Path(csv_path).name} is not a data table file.")
+    years = read_table_csv(csv_path, table, ["Year"])["Year"]
+    return None if years.dropna().empty else int(years.max())
+
+
+def read_years(
+    csv_path: str | Path,
+    years: Iterable[int],
+    columns: Sequence[str] | None = None,
+    table: str | None = None,
+) -> "pd.DataFrame":
+    """The rows of the given editions, typed as by `read_table_csv`.
+
+    With a current sidecar, the file is memory-mapped and only the header
+    and the editions' byte ranges are parsed. Otherwise the whole file is
+    read and filtered.
+    """
+    csv_path = Path(csv_path)
+    table = table or table_of(csv_path)
+    if table is None:
+        raise ValueError(f"{csv_path.name} is not a data table file.")
+    years = sorted({int(year) for year in years})
+
+    metadata = read_metadata(csv_path)
+    # Years the file doesn't have simply contribute no rows
+    editions = [
+        metadata["per_edition"][str(year)]
+        for year in years
+        if metadata is not None and str(year) in metadata["per_edition"]
+    ]
+    if metadata is None or any("bytes" not in edition for edition in editions):
+        df = read_table_csv(csv_path, table, columns)
+        return df[df["Year"].isin(years)].reset_index(drop=True)
+
+    ranges = [edition["bytes"] for edition in editions]
+    with (
+        csv_path.open("rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data,
+    ):
+        header_end = data.find(b"\n") + 1
+        chunks = [data[:header_end]] + [data[start:end] for start, end in ranges]
+    return read_table_csv(io.BytesIO(b"".join(chunks)), table, columns)
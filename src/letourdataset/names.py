@@ -0,0 +1,76 @@
+"""Rider names as they appear in the tables, and their normalised form.
+
+The source prints a rider's name differently depending on the page: upper
+case in the final GC ('FRANÇOIS FABER'), title case with the team appended
+on the stage winners page ('Gianni Bugno  (Chateau D'Ax)'), with or
+without accents depending on the year. `clean_name` drops the team and
+`fold` the case and accents, which maps all of these to one comparable
+form:
+
+    fold(clean_name("Gianni Bugno  (Chateau D'Ax)"))  # 'gianni bugno'
+    fold(clean_name("FRANÇOIS FABER"))                # 'francois faber'
+"""
+
+import re
+import unicodedata
+from collections.abc import Iterator
+
+import pandas as pd
+
+from letourdataset.schema import ALL_RANKINGS, RIDERS, STAGES
+
+# Columns holding a rider's name, per table
+NAME_COLUMNS: dict[str, tuple[str, ...]] = {
+    RIDERS: ("Rider",),
+    STAGES: (
+        "Winner of stage",
+        "Yellow Jersey",
+        "Green jersey",
+        "Polka-dot jersey",
+        "White jersey",
+        "Leader",
+    ),
+    ALL_RANKINGS: ("Rider",),
+}
+
+# 'Gianni Bugno  (Chateau D'Ax)' -> 'Gianni Bugno'
+_TEAM_SUFFIX = re.compile(r"\s*\(([^)]*)\)\s*$")
+_NOT_ALNUM = re.compile(r"[^0-9a-z]+")
+# What `astype(str)` made of missing jersey wearers in older scrapes
+_MISSING = {"", "nan", "none", "-"}
+
+
+def clean_name(value: object) -> str | None:
+    """A name as printed, without the team suffix; None when missing."""
+    if value is None or pd.isna(value):
+        return None
+    name = " ".join(_TEAM_SUFFIX.sub("", str(value)).split())
+    return None if name.lower() in _MISSING else name
+
+
+def team_suffix(value: object) -> str | None:
+    """The team suffix of a name as printed; None when there is none."""
+    if value is None or pd.isna(value):
+        return None
+    match = _TEAM_SUFFIX.search(str(value))
+    if match is None:
+        return None
+    return match.group(1).strip() or None
+
+
+def fold(text: str) -> str:
+    """Lower case without accents or punctuation: 'Ç. Müller' -> 'c muller'."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    ascii_only = decomposed.encode("ascii", "ignore").decode("ascii")
+    return " ".join(_NOT_ALNUM.sub(" ", ascii_only).split())
+
+
+def table_names(df: pd.DataFrame, table: str) -> Iterator[str]:
+    """The distinct cleaned names in each of a table's name columns."""
+    for column in NAME_COLUMNS[table]:
+        if column not in df:
+            continue
+        for value in df[column].dropna().unique():
+            name = clean_name(value)
+            if name is not None:
+                yield name
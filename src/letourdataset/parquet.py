@@ -0,0 +1,194 @@
+"""Year-partitioned Parquet copies of the data tables.
+
+The CSVs stay the published source of truth; this is a typed columnar copy
+for consumers that want column projection and year filters without parsing
+text. Each table is a hive-partitioned dataset below one root:
+
+    <root>/<table>/race=<race>/Year=<year>/part-0.parquet
+
+e.g. `data/parquet/Riders/race=men/Year=1903/part-0.parquet`, with the
+CSV's column order in `race=<race>/_columns.json`. Column types come from
+`schema.COLUMN_TYPES`, so a column never changes type between editions;
+stage numbers are stored as their CSV text ('13', '13.1').
+"""
+
+import json
+import logging
+import shutil
+from collections.abc import Iterable
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from letourdataset.postprocessor import read_data_csv
+from letourdataset.schema import (
+    COLUMN_TYPES,
+    INT,
+    RACE_LAYOUT,
+    STAGE,
+    TABLES,
+    arrow_type,
+    table_path,
+)
+from letourdataset.stages import format_stage_keys, stage_keys
+
+logger = logging.getLogger(__name__)
+
+# Below the data root, next to men/ and women/
+PARQUET_DIR = "parquet"
+# Within a race, editions are partitioned by the 'Year' column
+PARTITIONING = ds.partitioning(pa.schema([("Year", pa.int64())]), flavor="hive")
+
+
+def arrow_schema(table: str, columns: Iterable[str] | None = None) -> pa.Schema:
+    """Arrow schema of a table, optionally restricted to `columns`.
+
+    Columns the registry doesn't know are typed as strings.
+    """
+    types = COLUMN_TYPES[table]
+    names = list(types) if columns is None else list(columns)
+    return pa.schema([(name, arrow_type(types.get(name, "str"))) for name in names])
+
+
+def to_arrow(df: pd.DataFrame, table: str) -> pa.Table:
+    """Convert a frame (scraped or read back from CSV) to the table's schema.
+
+    Non-integer values of integer columns (e.g. a 'DSQ' rank) are stored as
+    missing, with a warning, so the column keeps its type in every edition.
+    """
+    types = COLUMN_TYPES[table]
+    unknown = [col for col in df.columns if col not in types]
+    if unknown:
+        logger.warning(
+            "Columns not in the %s schema, stored as text: %s", table, unknown
+        )
+
+    arrays: list[pa.Array] = []
+    for col in df.columns:
+        logical = types.get(col, "str")
+        values = df[col]
+        if logical == INT:
+            numeric = pd.to_numeric(values, errors="coerce")
+            lossy = (numeric.isna() & values.notna()) | (numeric % 1 != 0)
+            if lossy.any():
+                logger.warning(
+                    "Column '%s' of %s holds non-integer values, stored as missing: %s",
+                    col,
+                    table,
+                    values[lossy].unique().tolist()[:5],
+                )
+            values = numeric.where(~lossy).astype("Int64")
+        elif logical == STAGE:
+            values = format_stage_keys(stage_keys(values))
+        else:
+            values = values.astype("string")
+        arrays.append(pa.array(values, type=arrow_type(logical), from_pandas=True))
+    return pa.Table.from_arrays(arrays, schema=arrow_schema(table, df.columns))
+
+
+def dataset_path(root: str | Path, table: str) -> Path:
+    return Path(root) / table
+
+
+def race_path(root: str | Path, race: str, table: str) -> Path:
+    return dataset_path(root, table) / f"race={race}"
+
+
+def _columns_file(root: str | Path, race: str, table: str) -> Path:
+    # Leading underscore: dataset discovery skips the file
+    return race_path(root, race, table) / "_columns.json"
+
+
+def stored_columns(root: str | Path, race: str, table: str) -> list[str]:
+    """Column order of a race's table, as in its CSV file."""
+    return json.loads(_columns_file(root, race, table).read_text(encoding="utf-8"))
+
+
+def _record_columns(
+    root: str | Path, race: str, table: str, columns: list[str]
+) -> None:
+    # Editions written one at a time may bring new columns; they are added
+    # at the end, which is the order concatenating the editions gives.
+    path = _columns_file(root, race, table)
+    known = stored_columns(root, race, table) if path.exists() else []
+    known.extend(col for col in columns if col not in known)
+    path.write_text(json.dumps(known), encoding="utf-8")
+
+
+def write_table(df: pd.DataFrame, root: str | Path, race: str, table: str) -> None:
+    """Replace one race's copy of a table with `df`, one file per year."""
+    target = race_path(root, race, table)
+    if target.exists():
+        shutil.rmtree(target)
+    target.mkdir(parents=True)
+    _record_columns(root, race, table, list(df.columns))
+    for year, edition in df.groupby("Year", sort=True):
+        write_partition(edition, root, race, table, int(year))
+
+
+def write_partition(
+    df: pd.DataFrame, root: str | Path, race: str, table: str, year: int
+) -> Path:
+    """Write (or replace) the partition of one edition."""
+    path = race_path(root, race, table) / f"Year={year}" / "part-0.parquet"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _record_columns(root, race, table, list(df.columns))
+    # The year lives in the directory name, as hive partitioning expects
+    pq.write_table(to_arrow(df.drop(columns="Year"), table), path)
+    return path
+
+
+def read_table(
+    root: str | Path,
+    race: str,
+    table: str,
+    columns: list[str] | None = None,
+    years: Iterable[int] | None = None,
+) -> pd.DataFrame:
+    """Read one race's table, only the requested columns and years.
+
+    With `years`, only those editions' files are opened.
+    """
+    path = race_path(root, race, table)
+    if not _columns_file(root, race, table).exists():
+        raise FileNotFoundError(
+            f"No Parquet copy of {table} for {race} in {root}. "
+            "Run 'make parquet' first."
+        )
+    stored = stored_columns(root, race, table)
+    if columns is None:
+        columns = stored
+
+    source: Path | list[str] = path
+    if years is not None:
+        files = [path / f"Year={int(year)}" / "part-0.parquet" for year in years]
+        source = [str(file) for file in files if file.exists()]
+    dataset = ds.dataset(
+        source,
+        schema=arrow_schema(table, stored),
+        format="parquet",
+        partitioning=PARTITIONING,
+        partition_base_dir=str(path),
+    )
+    result = dataset.to_table(columns=columns)
+    return result.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+
+
+def export_all(data_root: str | Path, root: str | Path | None = None) -> Path:
+    """Write the Parquet copy of every CSV below `data_root`.
+
+    Returns the Parquet root, `<data_root>/parquet` by default.
+    """
+    root = Path(root) if root is not None else Path(data_root) / PARQUET_DIR
+    for race in RACE_LAYOUT:
+        for table in TABLES:
+            csv_path = table_path(data_root, race, table)
+            if not csv_path.exists():
+                logger.warning("File not found: %s", csv_path)
+                continue
+            write_table(read_data_csv(csv_path), root, race, table)
+            logger.info("✅ Wrote %s/%s for %s", root.name, table, race)
+    return root
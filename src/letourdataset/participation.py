@@ -0,0 +1,225 @@
+"""Which riders finished which editions, as a bitmap.
+
+Questions about careers ("riders who finished at least 10 Tours", "in
+both 1998 and 2006", "every edition of the 1990s") are set operations on
+riders and editions. `Participation` answers them from a rider x edition
+matrix of bits, packed eight editions to a byte with `np.packbits`:
+
+    participation = load_participation(MEN)
+    participation.all_of([1998, 2006])
+    participation.at_least(15)
+    participation.all_of(participation.between(1990, 1999))
+
+A query builds the packed mask of its editions once and ANDs it with
+every rider's row; counts are popcounts of the result, through a 256-entry
+lookup table. The men's history (3,600 riders, 113 editions) is 15 bytes
+per rider, 55 KB in all.
+
+Riders are keyed by their normalised name (see `letourdataset.names`), so
+a rider is one row however the riders table spelt them. The index is
+saved as `<race>/.cache/participation.npz` together with the hash of the
+riders file, and `load_participation` only rebuilds it when that changed.
+"""
+
+import json
+import logging
+import os
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from letourdataset.cache import CACHE_DIR, load, source_hash
+from letourdataset.names import clean_name, fold
+from letourdataset.schema import RIDERS, table_path
+
+logger = logging.getLogger(__name__)
+
+PARTICIPATION_FILE = "participation.npz"
+# Bump when the saved layout changes, so old files are rebuilt
+PARTICIPATION_VERSION = 1
+CAREER_COLUMNS = ["Rider", "Editions", "FirstYear", "LastYear", "LongestStreak"]
+# The arrays a `Participation` consists of, as saved
+_ARRAYS = ("keys", "names", "years", "bits")
+# Set bits of every byte value
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], np.uint8)
+
+
+class Participation:
+    """Rider x edition bitmap of one race. Build with `build`."""
+
+    def __init__(self, arrays: dict[str, np.ndarray]) -> None:
+        # keys: sorted normalised names; names: each key's display form
+        self.keys = arrays["keys"]
+        self.names = arrays["names"]
+        # years: sorted editions; bits: one packed row of editions per key
+        self.years = arrays["years"]
+        self.bits = arrays["bits"]
+
+    @classmethod
+    def build(cls, riders: pd.DataFrame) -> "Participation":
+        """Index the (Rider, Year) pairs of a riders table."""
+        pairs = riders[["Rider", "Year"]].dropna().drop_duplicates()
+        cleaned = {value: clean_name(value) for value in pairs["Rider"].unique()}
+        pairs = pairs.assign(name=pairs["Rider"].map(cleaned)).dropna()
+        folded = {name: fold(name) for name in pairs["name"].unique()}
+        pairs = pairs.assign(key=pairs["name"].map(folded))
+        pairs = pairs[pairs["key"] != ""]
+
+        # A rider is shown as spelt in their latest edition
+        latest = pairs.sort_values("Year", kind="stable").drop_duplicates(
+            "key", keep="last"
+        )
+        latest = latest.sort_values("key")
+        keys = latest["key"].to_numpy(dtype=str)
+        years = np.unique(pairs["Year"].to_numpy(dtype=np.int64))
+
+        rows = np.searchsorted(keys, pairs["key"].to_numpy(dtype=str))
+        columns = np.searchsorted(years, pairs["Year"].to_numpy(dtype=np.int64))
+        dense = np.zeros((len(keys), len(years)), dtype=bool)
+        dense[rows, columns] = True
+        return cls(
+            {
+                "keys": keys,
+                "names": latest["name"].to_numpy(dtype=str),
+                "years": years,
+                "bits": np.packbits(dense, axis=1),
+            }
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _mask(self, years: Iterable[int]) -> np.ndarray:
+        """The packed row of `years`.
+
+        Raises:
+            KeyError: If a year has no edition in the index.
+        """
+        years = np.asarray(list(years), dtype=np.int64)
+        columns = np.searchsorted(self.years, years)
+        # Years past the last edition (every year, in an empty index) have
+        # no column to compare with
+        missing = columns >= len(self.years)
+        missing[~missing] = self.years[columns[~missing]] != years[~missing]
+        if missing.any():
+            raise KeyError(f"No edition in {years[missing].tolist()}")
+        dense = np.zeros(len(self.years), dtype=bool)
+        dense[columns] = True
+        return np.packbits(dense)
+
+    def _counts(self, mask: np.ndarray | None = None) -> np.ndarray:
+        bits = self.bits if mask is None else self.bits & mask
+        return _POPCOUNT[bits].sum(axis=1, dtype=np.int64)
+
+    def _names(self, selected: np.ndarray) -> list[str]:
+        return self.names[selected].tolist()
+
+    def between(self, first: int, last: int) -> list[int]:
+        """The editions from `first` to `last`, both included."""
+        return [int(year) for year in self.years if first <= year <= last]
+
+    def editions(self, rider: str) -> list[int]:
+        """The editions a rider finished, by any spelling of their name."""
+        key = fold(clean_name(rider) or "")
+        row = int(np.searchsorted(self.keys, key))
+        if row == len(self.keys) or self.keys[row] != key:
+            return []
+        finished = np.unpackbits(self.bits[row], count=len(self.years)).astype(bool)
+        return self.years[finished].tolist()
+
+    def all_of(self, years: Iterable[int]) -> list[str]:
+        """Riders who finished every one of `years`."""
+        mask = self._mask(years)
+        return self._names(((self.bits & mask) == mask).all(axis=1))
+
+    def any_of(self, years: Iterable[int]) -> list[str]:
+        """Riders who finished at least one of `years`."""
+        return self._names((self.bits & self._mask(years)).any(axis=1))
+
+    def at_least(self, count: int, years: Iterable[int] | None = None) -> list[str]:
+        """Riders who finished `count` editions or more (of `years`, if given)."""
+        mask = None if years is None else self._mask(years)
+        return self._names(self._counts(mask) >= count)
+
+    def careers(self) -> pd.DataFrame:
+        """Each rider's editions, first and last year and longest streak.
+
+        A streak is a run of consecutive editions held, so a rider who
+        finished 1938, 1939 and 1947 has a streak of 3.
+        """
+        dense = np.unpackbits(self.bits, axis=1, count=len(self.years)).astype(bool)
+        first = dense.argmax(axis=1)
+        last = len(self.years) - 1 - dense[:, ::-1].argmax(axis=1)
+        # Length of the run of finished editions ending at each edition
+        runs = np.zeros(len(self), dtype=np.int64)
+        longest = np.zeros(len(self), dtype=np.int64)
+        for column in dense.T:
+            runs = np.where(column, runs + 1, 0)
+            np.maximum(longest, runs, out=longest)
+        careers = pd.DataFrame(
+            {
+                "Rider": self.names,
+                "Editions": self._counts(),
+                "FirstYear": self.years[first],
+                "LastYear": self.years[last],
+                "LongestStreak": longest,
+            }
+        )
+        careers = careers.sort_values(
+            ["Editions", "FirstYear"], ascending=[False, True], kind="stable"
+        )
+        careers = careers.astype({column: "Int64" for column in CAREER_COLUMNS[1:]})
+        return careers.astype({"Rider": "str"}).reset_index(drop=True)
+
+    def save(self, path: str | Path, sources: dict[str, str]) -> None:
+        """Write the index, with the hashes of the files it was built from."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        arrays = {name: getattr(self, name) for name in _ARRAYS}
+        np.savez(
+            staging,
+            version=np.array(PARTICIPATION_VERSION),
+            sources=np.array(json.dumps(sources, sort_keys=True)),
+            **arrays,
+        )
+        staging.replace(path)
+
+
+def _read(path: Path, sources: dict[str, str]) -> Participation | None:
+    try:
+        with np.load(path) as stored:
+            if int(stored["version"]) != PARTICIPATION_VERSION:
+                return None
+            if json.loads(str(stored["sources"])) != sources:
+                return None
+            return Participation({name: stored[name] for name in _ARRAYS})
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def load_participation(race: str, data_root: str | Path = "data") -> Participation:
+    """The participation bitmap of a race, rebuilt when stale.
+
+    Raises:
+        FileNotFoundError: If the race has no riders file.
+    """
+    riders_path = table_path(data_root, race, RIDERS)
+    if not riders_path.exists():
+        raise FileNotFoundError(
+            f"Missing {RIDERS} file: {riders_path}. Run 'make update' first."
+        )
+    path = riders_path.parent / CACHE_DIR / PARTICIPATION_FILE
+    sources = {riders_path.name: source_hash(riders_path)}
+    participation = _read(path, sources)
+    if participation is None:
+        riders = load(race, RIDERS, ["Rider", "Year"], data_root=data_root)
+        participation = Participation.build(riders)
+        try:
+            participation.save(path, sources)
+            logger.info("✅ Indexed %d riders of %s", len(participation), race)
+        except OSError as e:
+            logger.warning("Could not save the participation index: %s", e)
+    return participation
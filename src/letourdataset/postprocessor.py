@@ -5,16 +5,74 @@ Post-processor for Tour de France data files.
 Sorts the CSV data files numerically and normalises integer column
 representations (e.g. rider numbers written as '11', not '11.0') without
 changing any values or the column order.
+
+`canonicalise` applies these rules to a frame. The scraper's CSV output uses
+it too, so freshly downloaded files are already canonical and the
+postprocessor only has to confirm that (`check=True`).
+
+Files are processed in parallel, one per worker process. Files larger than
+`external_sort_bytes` (in practice the men's All_Rankings) are sorted out
+of core: see `sort_file_external`.
+
+Files that fit in memory are sorted by `permute_lines`: only the key and
+normalised columns are parsed, and the file's own lines are written back
+in sorted order, so columns no rule touches cannot change.
+
+To add an edition to a file that is already canonical, `append_merge`
+sorts only the new rows and appends them, instead of re-sorting the whole
+history.
+
+After a pass, the content hash of every canonical file is recorded in a
+manifest in the data root (`MANIFEST_NAME`), along with a version of the
+rules it was checked against. Files whose hash still matches are skipped
+on the next pass, so a run over unchanged data only hashes the files. The
+summary sidecar of every canonical file is brought up to date as well (see
+`letourdataset.metadata`).
 """
 
+import contextlib
+import csv
+import dataclasses
+import filecmp
+import hashlib
+import io
+import json
 import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from letourdataset.metadata import file_hash, write_metadata
+from letourdataset.schema import (
+    ALL_RANKINGS,
+    RACE_LAYOUT,
+    RIDERS,
+    STAGES,
+    table_file_name,
+)
+from letourdataset.stages import format_stage_keys, stage_keys
 
 logger = logging.getLogger(__name__)
 
+# Files above this size are sorted out of core
+EXTERNAL_SORT_BYTES = 256 * 1024**2
+# Rows per chunk read, and per block written, by the external sort
+CHUNK_ROWS = 200_000
+
+# Content hashes of the files known to be canonical, in the data root
+MANIFEST_NAME = ".postprocess-manifest.json"
+# Bump when `canonicalise` changes what a canonical file looks like, so the
+# manifest's entries no longer count
+RULES_VERSION = 1
+
 
 @dataclass(frozen=True)
 class FileSpec:
@@ -22,8 +80,8 @@ class FileSpec:
 
     sort_columns: tuple[str, ...]
     integer_columns: tuple[str, ...] = ()
-    # Stage numbers are integers except for split stages (e.g. 13.1, 13.2),
-    # so they get a mixed int/float representation instead of Int64.
+    # Stage numbers are integers except for split stages (e.g. 13.1, 13.2);
+    # they are sorted on their integer stage key and written as '13'/'13.1'.
     stage_number_columns: tuple[str, ...] = ()
 
 
@@ -43,98 +101,522 @@ ALL_RANKINGS_SPEC = FileSpec(
 )
 
 
-def _format_stage_number(value: float) -> int | float | None:
-    if pd.isna(value):
+SPECS: dict[str, FileSpec] = {
+    RIDERS: RIDERS_SPEC,
+    STAGES: STAGES_SPEC,
+    ALL_RANKINGS: ALL_RANKINGS_SPEC,
+}
+
+
+def spec_version(spec: FileSpec) -> str:
+    """Identifies the rules a file is made canonical by.
+
+    Changes with the spec's fields and with `RULES_VERSION`.
+    """
+    rules = f"{RULES_VERSION}:{spec!r}".encode()
+    return hashlib.sha256(rules).hexdigest()[:16]
+
+
+def read_data_csv(file_path: str | Path) -> pd.DataFrame:
+    """Read a data CSV with every cell as text; empty cells become missing.
+
+    Without type inference the columns a `FileSpec` does not touch come back
+    exactly as written, so rewriting a file cannot reformat them.
+    """
+    return pd.read_csv(file_path, dtype=str, keep_default_na=False, na_values=[""])
+
+
+def holds_integers(values: pd.Series) -> bool:
+    """Whether every value present is a whole number, as text or not."""
+    numeric = pd.to_numeric(values, errors="coerce")
+    coercion_lossless = numeric.notna().eq(values.notna()).all()
+    return bool(coercion_lossless and (numeric.dropna() % 1 == 0).all())
+
+
+def canonicalise(df: pd.DataFrame, spec: FileSpec, name: str = "frame") -> pd.DataFrame:
+    """Apply the integer, stage-number and sorting rules of `spec` to a frame.
+
+    Returns a new frame; `name` only appears in log messages.
+    """
+    df = df.copy()
+    for col in spec.integer_columns:
+        if col not in df.columns:
+            continue
+        if holds_integers(df[col]):
+            df[col] = pd.to_numeric(df[col]).astype("Int64")
+        else:
+            logger.warning(
+                "Column '%s' in %s contains non-integer values; left as is.",
+                col,
+                name,
+            )
+
+    stage_key_columns: dict[str, pd.Series] = {}
+    for col in spec.stage_number_columns:
+        if col not in df.columns:
+            continue
+        # Round-trip through the integer stage key so whole stages are
+        # written as '1' rather than '1.0' and split stages keep '13.1'.
+        keys = stage_keys(df[col])
+        stage_key_columns[col] = keys
+        df[col] = format_stage_keys(keys)
+
+    # Sort on numeric keys so e.g. rank 10 comes after rank 2 even if a
+    # column arrives as strings; the original values stay untouched.
+    sort_columns = [col for col in spec.sort_columns if col in df.columns]
+    if sort_columns:
+        key_names = [f"__sort_{col}" for col in sort_columns]
+        for col, key in zip(sort_columns, key_names):
+            if col in stage_key_columns:
+                df[key] = stage_key_columns[col]
+            else:
+                df[key] = pd.to_numeric(df[col], errors="coerce")
+        df = (
+            df.sort_values(key_names, ascending=True, kind="stable")
+            .drop(columns=key_names)
+            .reset_index(drop=True)
+        )
+    return df
+
+
+def _csv_cells(values: pd.Series) -> pd.Series:
+    # How `to_csv` writes a column's cells (no '.0' on nullable integers)
+    return values.astype("string").fillna("")
+
+
+def permute_lines(data: bytes, spec: FileSpec, name: str = "file") -> bytes | None:
+    """Canonicalise CSV content by reordering its lines.
+
+    Only the columns `spec` sorts or normalises are parsed. The sort order
+    is computed from them with NumPy, and the original lines are written
+    in that order; a line is re-serialised only when one of its normalised
+    cells changes (e.g. '11.0' -> '11'). For content written by `to_csv`
+    the result is byte for byte `canonicalise(...).to_csv(index=False)`.
+
+    Returns None when lines and rows don't map one to one (a quoted field
+    spanning lines, blank lines); use `canonicalise` then.
+    """
+    lines = data.split(b"\n")
+    if lines and lines[-1] == b"":
+        lines.pop()
+    lines = [line.removesuffix(b"\r") for line in lines]
+    if not lines or any(line.count(b'"') % 2 for line in lines):
+        return None
+
+    header = next(csv.reader([lines[0].decode("utf-8")]))
+    used = [
+        col
+        for col in header
+        if col in spec.sort_columns
+        or col in spec.integer_columns
+        or col in spec.stage_number_columns
+    ]
+    keys = pd.read_csv(
+        io.BytesIO(data),
+        usecols=used or header[:1],
+        dtype=str,
+        keep_default_na=False,
+        na_values=[""],
+    )
+    body = lines[1:]
+    if len(keys) != len(body):
         return None
-    if float(value).is_integer():
-        return int(value)
-    return value
+
+    normalised = canonicalise(keys, dataclasses.replace(spec, sort_columns=()), name)
+    order = np.lexsort(_sort_keys(normalised, spec)) if used else range(len(body))
+
+    changed = {
+        header.index(col): cells.to_numpy()
+        for col in used
+        if not (cells := _csv_cells(normalised[col])).equals(_csv_cells(keys[col]))
+    }
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    out = [lines[0], b"\n"]
+    for i in order:
+        if changed:
+            row = next(csv.reader([body[i].decode("utf-8")]))
+            cells = {index: values[i] for index, values in changed.items()}
+            if any(row[index] != cell for index, cell in cells.items()):
+                for index, cell in cells.items():
+                    row[index] = cell
+                output.seek(0)
+                output.truncate()
+                writer.writerow(row)
+                out.append(output.getvalue().encode("utf-8"))
+                continue
+        out += [body[i], b"\n"]
+    return b"".join(out)
+
+
+def _lossless_integer_columns(file_path: Path, spec: FileSpec) -> tuple[str, ...]:
+    """The spec's integer columns that hold only integers in the whole file.
+
+    `canonicalise` decides per frame; out of core it sees one chunk at a
+    time, so the decision is made up front for the file.
+    """
+    header = pd.read_csv(file_path, nrows=0).columns
+    columns = [col for col in spec.integer_columns if col in header]
+    if not columns:
+        return ()
+    df = pd.read_csv(
+        file_path,
+        usecols=columns,
+        dtype=str,
+        keep_default_na=False,
+        na_values=[""],
+    )
+    lossless: list[str] = []
+    for col in columns:
+        if holds_integers(df[col]):
+            lossless.append(col)
+        else:
+            logger.warning(
+                "Column '%s' in %s contains non-integer values; left as is.",
+                col,
+                file_path.name,
+            )
+    return tuple(lossless)
+
+
+def _sort_keys(df: pd.DataFrame, spec: FileSpec) -> list[np.ndarray]:
+    """Sort keys of a canonical frame for `np.lexsort`, most significant last.
+
+    Same order as `canonicalise`: numeric, missing values last.
+    """
+    keys: list[np.ndarray] = []
+    for col in spec.sort_columns:
+        if col not in df.columns:
+            continue
+        if col in spec.stage_number_columns:
+            values = stage_keys(df[col]).astype("float64")
+        else:
+            values = pd.to_numeric(df[col], errors="coerce")
+        missing = values.isna().to_numpy()
+        keys += [missing, values.fillna(0).to_numpy(dtype="float64")]
+    # lexsort sorts on the last key first
+    return keys[::-1]
+
+
+def sort_file_external(
+    file_path: Path, spec: FileSpec, output_path: Path, chunk_rows: int = CHUNK_ROWS
+) -> int:
+    """Canonicalise a CSV file too large to sort in memory.
+
+    The file is read in chunks of `chunk_rows`; each chunk is normalised and
+    spilled, with its sort keys, to an uncompressed Arrow file. Only the
+    keys of all rows are held in memory and sorted (stable, so ties keep
+    the file's order); the rows are then gathered from the memory-mapped
+    chunks in sorted order, one block at a time, and written out. The output
+    is byte for byte what `canonicalise` and `to_csv` give for the whole
+    file. Returns the number of rows.
+    """
+    spec = dataclasses.replace(
+        spec, integer_columns=_lossless_integer_columns(file_path, spec)
+    )
+    columns: list[str] = []
+    key_chunks: list[list[np.ndarray]] = []
+    with tempfile.TemporaryDirectory(prefix="letour-sort-") as tmp:
+        paths: list[Path] = []
+        reader = pd.read_csv(
+            file_path,
+            dtype=str,
+            keep_default_na=False,
+            na_values=[""],
+            chunksize=chunk_rows,
+        )
+        for i, chunk in enumerate(reader):
+            # Normalise only: the rows are ordered by the global sort below
+            chunk = canonicalise(chunk, dataclasses.replace(spec, sort_columns=()))
+            columns = list(chunk.columns)
+            key_chunks.append(_sort_keys(chunk, spec))
+            path = Path(tmp) / f"chunk-{i:05d}.arrow"
+            schema = pa.schema(
+                [
+                    (col, pa.int64() if col in spec.integer_columns else pa.string())
+                    for col in columns
+                ]
+            )
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            feather.write_feather(table, path, compression="uncompressed")
+            paths.append(path)
+
+        if not paths:
+            output_path.write_bytes(file_path.read_bytes())
+            return 0
+
+        rows = pa.concat_tables(
+            feather.read_table(path, memory_map=True) for path in paths
+        )
+        keys = [np.concatenate(parts) for parts in zip(*key_chunks)]
+        del key_chunks
+        order = np.lexsort(keys) if keys else np.arange(rows.num_rows)
+
+        with output_path.open("w", encoding="utf-8", newline="") as out:
+            out.write(pd.DataFrame(columns=columns).to_csv(index=False))
+            for start in range(0, len(order), chunk_rows):
+                block = rows.take(order[start : start + chunk_rows])
+                block.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get).to_csv(
+                    out, header=False, index=False
+                )
+        return rows.num_rows
+
+
+def _last_row(file_path: Path, columns: list[str]) -> list[str] | None:
+    """The last row of a CSV file, read from its end.
+
+    None if it can't be read that way: a file without data rows or a
+    final newline, a quoted field spanning lines, a row of another width.
+    """
+    with file_path.open("rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        # Enough for any row of the data files, several times over
+        f.seek(max(0, size - 64 * 1024))
+        tail = f.read().decode("utf-8", errors="replace")
+    lines = tail.splitlines()
+    if not tail.endswith("\n") or len(lines) < 2 or lines[-1].count('"') % 2:
+        return None
+    row = next(csv.reader([lines[-1]]))
+    if len(row) != len(columns) or row == columns:
+        return None
+    return row
+
+
+def append_merge(
+    file_path: Path, rows: pd.DataFrame, spec: FileSpec, name: str | None = None
+) -> bool:
+    """Add `rows` to a canonical file, keeping it canonical.
+
+    Only the new rows are normalised and sorted. When they all sort after
+    the file's last row (the usual case: a new edition), they are appended
+    without reading the rest of the file. Otherwise, or when they bring
+    columns the file doesn't have, the file is rewritten from scratch.
+
+    Returns True when the rows were appended in place.
+    """
+    name = name or file_path.name
+    if rows.empty:
+        return True
+    if not file_path.exists():
+        canonicalise(rows, spec, name).to_csv(file_path, index=False)
+        return False
+
+    header = list(pd.read_csv(file_path, nrows=0).columns)
+    new = canonicalise(rows, spec, name)
+    last = _last_row(file_path, header)
+    if last is not None and set(new.columns) <= set(header):
+        new = new.reindex(columns=header)
+        # A stable sort of [last row, first new row] keeps them in order
+        # exactly when the file's order plus the new rows is canonical.
+        first = new.iloc[0]
+        pair = pd.DataFrame(
+            {col: [cell or pd.NA, first[col]] for col, cell in zip(header, last)},
+            dtype=object,
+        )
+        if np.lexsort(_sort_keys(pair, spec)).tolist() == [0, 1]:
+            with file_path.open("a", encoding="utf-8", newline="") as out:
+                new.to_csv(out, header=False, index=False)
+            logger.info("✅ Appended %d rows to %s", len(new), name)
+            return True
+
+    logger.info("Rows for %s don't sort after the file's end; rewriting it", name)
+    merged = pd.concat([read_data_csv(file_path), rows], ignore_index=True)
+    output = canonicalise(merged, spec, name).to_csv(index=False).encode()
+    staging = file_path.with_name(file_path.name + ".tmp")
+    staging.write_bytes(output)
+    staging.replace(file_path)
+    return False
 
 
 class DataPostProcessor:
-    """Post-processor for Tour de France CSV data files."""
+    """Post-processor for Tour de France CSV data files.
 
-    def __init__(self, data_root: str | Path = "data") -> None:
+    `workers` caps the number of files processed at once (default: one per
+    CPU); files above `external_sort_bytes` are sorted out of core.
+    """
+
+    def __init__(
+        self,
+        data_root: str | Path = "data",
+        workers: int | None = None,
+        external_sort_bytes: int = EXTERNAL_SORT_BYTES,
+    ) -> None:
         self.data_root = Path(data_root)
         self.men_dir = self.data_root / "men"
         self.women_dir = self.data_root / "women"
+        self.workers = workers
+        self.external_sort_bytes = external_sort_bytes
+
+    def process_file(
+        self, file_path: Path, spec: FileSpec, check: bool = False
+    ) -> bool:
+        """Sort and normalise a single CSV file in place.
 
-    def process_file(self, file_path: Path, spec: FileSpec) -> None:
-        """Sort and normalise a single CSV file in place."""
+        Returns True when the file was not canonical, i.e. it was (or, with
+        `check`, would have been) rewritten.
+        """
         if not file_path.exists():
             logger.warning("File not found: %s", file_path)
-            return
+            return False
+        if file_path.stat().st_size > self.external_sort_bytes:
+            return self._process_large_file(file_path, spec, check)
 
-        df = pd.read_csv(file_path, low_memory=False)
+        original = file_path.read_bytes()
+        output = permute_lines(original, spec, file_path.name)
+        if output is None:
+            df = canonicalise(read_data_csv(file_path), spec, file_path.name)
+            output = df.to_csv(index=False).encode()
+        if output == original:
+            logger.info("✅ %s is already canonical", file_path.name)
+            return False
+        if check:
+            logger.warning("❌ %s is not canonical", file_path.name)
+            return True
 
-        for col in spec.integer_columns:
-            if col not in df.columns:
-                continue
-            numeric = pd.to_numeric(df[col], errors="coerce")
-            coercion_lossless = numeric.notna().eq(df[col].notna()).all()
-            if coercion_lossless and (numeric.dropna() % 1 == 0).all():
-                df[col] = numeric.astype("Int64")
-            else:
-                logger.warning(
-                    "Column '%s' in %s contains non-integer values; left as is.",
-                    col,
-                    file_path.name,
+        staging = file_path.with_name(file_path.name + ".tmp")
+        staging.write_bytes(output)
+        staging.replace(file_path)
+        logger.info("✅ Processed %s, sorted by %s", file_path.name, spec.sort_columns)
+        return True
+
+    def _process_large_file(self, file_path: Path, spec: FileSpec, check: bool) -> bool:
+        # The output is staged next to the file and compared on disk, so
+        # neither version has to fit in memory.
+        staging = file_path.with_name(file_path.name + ".tmp")
+        try:
+            rows = sort_file_external(file_path, spec, staging)
+            if filecmp.cmp(staging, file_path, shallow=False):
+                logger.info(
+                    "✅ %s is already canonical (%d rows)", file_path.name, rows
                 )
+                return False
+            if check:
+                logger.warning("❌ %s is not canonical", file_path.name)
+                return True
+            staging.replace(file_path)
+        finally:
+            staging.unlink(missing_ok=True)
+        logger.info(
+            "✅ Processed %s out of core: %d rows, sorted by %s",
+            file_path.name,
+            rows,
+            list(spec.sort_columns),
+        )
+        return True
 
-        for col in spec.stage_number_columns:
-            if col not in df.columns:
-                continue
-            # The explicit object dtype keeps the mixed int/float values;
-            # letting pandas infer would coerce the ints back to floats and
-            # write '1.0' again.
-            numeric = pd.to_numeric(df[col], errors="coerce")
-            df[col] = pd.Series(
-                [_format_stage_number(value) for value in numeric],
-                index=df.index,
-                dtype=object,
-            )
+    @property
+    def manifest_path(self) -> Path:
+        return self.data_root / MANIFEST_NAME
 
-        # Sort on numeric keys so e.g. rank 10 comes after rank 2 even if a
-        # column arrives as strings; the original values stay untouched.
-        sort_columns = [col for col in spec.sort_columns if col in df.columns]
-        if sort_columns:
-            key_names = [f"__sort_{col}" for col in sort_columns]
-            for col, key in zip(sort_columns, key_names):
-                df[key] = pd.to_numeric(df[col], errors="coerce")
-            df = (
-                df.sort_values(key_names, ascending=True, kind="stable")
-                .drop(columns=key_names)
-                .reset_index(drop=True)
-            )
+    def _load_manifest(self) -> dict[str, dict[str, str]]:
+        try:
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable manifest %s", self.manifest_path)
+            return {}
 
-        df.to_csv(file_path, index=False)
-        logger.info(
-            "✅ Processed %s: %d rows, sorted by %s",
-            file_path.name,
-            len(df),
-            sort_columns,
+    def _save_manifest(self, manifest: dict[str, dict[str, str]]) -> None:
+        staging = self.manifest_path.with_name(MANIFEST_NAME + ".tmp")
+        staging.write_text(
+            json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8"
         )
+        staging.replace(self.manifest_path)
 
-    def process_all_files(self) -> None:
-        """Process all data files in both men's and women's directories."""
+    def process_all_files(self, check: bool = False, force: bool = False) -> list[str]:
+        """Process all data files in both men's and women's directories.
+
+        Files are processed in parallel; files the manifest lists as
+        canonical with their current content are skipped unless `force`.
+        Returns the files that were not canonical. With `check`, nothing
+        is written, not even the manifest.
+        """
         logger.info("🔄 Starting post-processing of all data files...")
 
-        file_specs = {
-            "{}_Riders_History.csv": RIDERS_SPEC,
-            "{}_Stages_History.csv": STAGES_SPEC,
-            "{}_All_Rankings_History.csv": ALL_RANKINGS_SPEC,
-        }
+        manifest = {} if force else self._load_manifest()
+        jobs: list[tuple[Path, FileSpec]] = []
+        hashes: dict[Path, str] = {}
+        tables: dict[Path, str] = {}
+        for directory, prefix in RACE_LAYOUT.values():
+            for table, spec in SPECS.items():
+                file_path = self.data_root / directory / table_file_name(prefix, table)
+                if not file_path.exists():
+                    logger.warning("File not found: %s", file_path)
+                    continue
+                hashes[file_path] = file_hash(file_path)
+                tables[file_path] = table
+                entry = manifest.get(self._manifest_key(file_path))
+                if entry == {
+                    "sha256": hashes[file_path],
+                    "spec": spec_version(spec),
+                }:
+                    logger.info("✅ %s is unchanged, skipped", file_path.name)
+                    continue
+                jobs.append((file_path, spec))
+        workers = min(self.workers or os.cpu_count() or 1, len(jobs))
 
+        changed: list[str] = []
         failures: list[str] = []
-        for directory, prefix in ((self.men_dir, "TDF"), (self.women_dir, "TDFF")):
-            for pattern, spec in file_specs.items():
-                file_path = directory / pattern.format(prefix)
+        with contextlib.ExitStack() as stack:
+            if not jobs:
+                logger.info("✅ All data files are unchanged, nothing to do")
+                results = {}
+            elif workers <= 1:
+                results = {
+                    file_path: partial(self.process_file, file_path, spec, check)
+                    for file_path, spec in jobs
+                }
+            else:
+                pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+                # Largest files first, so the slowest one starts right away
+                results = {
+                    file_path: pool.submit(
+                        self.process_file, file_path, spec, check
+                    ).result
+                    for file_path, spec in sorted(
+                        jobs, key=lambda job: _file_size(job[0]), reverse=True
+                    )
+                }
+            for file_path, spec in jobs:
                 try:
-                    self.process_file(file_path, spec)
+                    was_changed = results[file_path]()
                 except Exception:
                     logger.exception("Error processing %s", file_path)
                     failures.append(str(file_path))
+                    continue
+                if was_changed:
+                    changed.append(str(file_path))
+                    if check:
+                        del hashes[file_path]
+                        continue
+                    hashes[file_path] = file_hash(file_path)
+                manifest[self._manifest_key(file_path)] = {
+                    "sha256": hashes[file_path],
+                    "spec": spec_version(spec),
+                }
+        if jobs and not check:
+            self._save_manifest(manifest)
+
+        # Every file still in `hashes` is canonical now
+        for file_path, sha256 in hashes.items():
+            if check or str(file_path) in failures:
+                continue
+            try:
+                write_metadata(file_path, tables[file_path], sha256)
+            except ValueError as error:
+                # e.g. a table without a Year column; consumers fall back
+                # to the CSV
+                logger.warning("No summary sidecar for %s: %s", file_path.name, error)
 
         if failures:
             raise RuntimeError(f"Post-processing failed for: {', '.join(failures)}")
         logger.info("✅ Post-processing completed for all data files!")
+        return changed
+
+    def _manifest_key(self, file_path: Path) -> str:
+        return file_path.relative_to(self.data_root).as_posix()
+
+
+def _file_size(path: Path) -> int:
+    return path.stat().st_size if path.exists() else 0
@@ -0,0 +1,236 @@
+"""Names and layout of the dataset's tables.
+
+Each race publishes three tables, one CSV file each:
+
+- riders: one row per rider and edition (the final GC)
+- stages: one row per stage
+- all rankings: one row per rider, stage and classification
+
+The file names follow `<prefix>_<table>_History.csv`, with the prefix
+`TDF` for the men's race and `TDFF` for the women's.
+
+`COLUMN_TYPES` declares the type of every known column, so columnar copies
+of the tables (see `letourdataset.parquet`) get an explicit schema instead
+of whatever type inference makes of a CSV. `read_table_csv` uses it to load
+a CSV file with those types and pyarrow's CSV parser, reading only the
+columns asked for.
+
+The module itself only needs the standard library; pandas and pyarrow are
+imported when a file is first read, so the many callers that only want
+names and paths (e.g. `scripts/update_docs.py`) start quickly.
+"""
+
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+logger = logging.getLogger(__name__)
+
+MEN = "men"
+WOMEN = "women"
+
+RIDERS = "Riders"
+STAGES = "Stages"
+ALL_RANKINGS = "All_Rankings"
+TABLES: tuple[str, ...] = (RIDERS, STAGES, ALL_RANKINGS)
+
+# Logical column types. INT columns are nullable integers; STAGE columns
+# hold stage numbers ('13', '13.1', see `letourdataset.stages`).
+INT = "int"
+STR = "str"
+STAGE = "stage"
+
+COLUMN_TYPES: dict[str, dict[str, str]] = {
+    RIDERS: {
+        "Rank": INT,
+        "Rider": STR,
+        "Rider No.": INT,
+        "Team": STR,
+        "Times": STR,
+        "Gap": STR,
+        "B": STR,
+        "P": STR,
+        "Year": INT,
+        "Distance (km)": INT,
+        "Number of stages": INT,
+        "ResultType": STR,
+        "TotalSeconds": INT,
+        "GapSeconds": INT,
+    },
+    STAGES: {
+        "Year": INT,
+        "TotalTDFDistance": INT,
+        "Stages": STAGE,
+        "Start": STR,
+        "End": STR,
+        "Winner of stage": STR,
+        "Yellow Jersey": STR,
+        "Green jersey": STR,
+        "Polka-dot jersey": STR,
+        "White jersey": STR,
+        "Leader": STR,
+    },
+    # Ranks are kept as text here: the source prints them verbatim and the
+    # postprocessor never coerces them in this table.
+    ALL_RANKINGS: {
+        "Rank": STR,
+        "Rider": STR,
+        "Team": STR,
+        "Times": STR,
+        "Gap": STR,
+        "B": STR,
+        "P": STR,
+        "Stages": STAGE,
+        "Ranking type": STR,
+        "Points": STR,
+        "Checkpoint": STR,
+        "Year": INT,
+        "Distance (km)": INT,
+        "Number of stages": INT,
+        "ResultType": STR,
+        "TotalSeconds": INT,
+        "GapSeconds": INT,
+    },
+}
+
+
+# race -> (directory below the data root, file name prefix)
+RACE_LAYOUT: dict[str, tuple[str, str]] = {
+    MEN: ("men", "TDF"),
+    WOMEN: ("women", "TDFF"),
+}
+
+
+def table_file_name(prefix: str, table: str) -> str:
+    """File name of one table, e.g. 'TDF_Riders_History.csv'."""
+    return f"{prefix}_{table}_History.csv"
+
+
+def table_path(data_root: str | Path, race: str, table: str) -> Path:
+    """Path of one race's table below the data root."""
+    directory, prefix = RACE_LAYOUT[race]
+    return Path(data_root) / directory / table_file_name(prefix, table)
+
+
+def table_of(path: str | Path) -> str | None:
+    """The table a data file holds, from its name; None for other files."""
+    name = Path(path).name
+    for table in TABLES:
+        if name.endswith(f"_{table}_History.csv"):
+            return table
+    return None
+
+
+def arrow_type(kind: str) -> "pa.DataType":
+    """Arrow type of a logical column type.
+
+    Stage numbers stay text ('13.1'); see `letourdataset.stages` for their
+    integer keys.
+    """
+    import pyarrow as pa
+
+    return pa.int64() if kind == INT else pa.string()
+
+
+def _convert_options(
+    table: str, columns: Sequence[str] | None, integers: bool = True
+) -> "pacsv.ConvertOptions":
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    return pacsv.ConvertOptions(
+        column_types={
+            col: arrow_type(kind) if integers else pa.string()
+            for col, kind in COLUMN_TYPES[table].items()
+        },
+        include_columns=list(columns) if columns is not None else None,
+        strings_can_be_null=True,
+    )
+
+
+def _coerce_integers(
+    values: "pa.ChunkedArray", column: str, name: str = "table"
+) -> "pa.ChunkedArray":
+    """Text of an integer column as int64; other values become missing.
+
+    Logs a warning with the values dropped; `name` only appears there.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    trimmed = pc.utf8_trim_whitespace(values)
+    valid = pc.match_substring_regex(trimmed, r"^[+-]?\d+$")
+    dropped = pc.unique(pc.filter(values, pc.invert(valid)))
+    if len(dropped):
+        logger.warning(
+            "Column '%s' in %s holds non-integer values, read as missing: %s",
+            column,
+            name,
+            dropped.to_pylist()[:5],
+        )
+    return pc.cast(pc.if_else(valid, trimmed, None), pa.int64())
+
+
+def read_table_arrow(
+    source: str | Path | IO[bytes],
+    table: str,
+    columns: Sequence[str] | None = None,
+) -> "pa.Table":
+    """Parse a table's CSV file into Arrow with its declared column types.
+
+    A declared integer column may still hold text, such as a 'DSQ' rank
+    (`letourdataset.postprocessor` leaves those in place); such values
+    are read as missing, with a warning, rather than failing the read.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    start = source.tell() if hasattr(source, "tell") else None
+    try:
+        return pacsv.read_csv(source, convert_options=_convert_options(table, columns))
+    except pa.ArrowInvalid:
+        # Not necessarily a stray value (the file may be broken); a second,
+        # untyped read tells
+        if start is not None:
+            source.seek(start)
+    text = pacsv.read_csv(
+        source, convert_options=_convert_options(table, columns, integers=False)
+    )
+    name = Path(source).name if isinstance(source, (str, Path)) else "CSV data"
+    for col, kind in COLUMN_TYPES[table].items():
+        if kind == INT and col in text.column_names:
+            index = text.column_names.index(col)
+            text = text.set_column(
+                index, col, _coerce_integers(text.column(col), col, name)
+            )
+    return text
+
+
+def to_frame(arrow: "pa.Table") -> "pd.DataFrame":
+    """Convert a table read by `read_table_arrow`; integers become `Int64`."""
+    import pandas as pd
+    import pyarrow as pa
+
+    return arrow.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+
+
+def read_table_csv(
+    source: str | Path | IO[bytes],
+    table: str,
+    columns: Sequence[str] | None = None,
+) -> "pd.DataFrame":
+    """Read a table's CSV file with its declared column types.
+
+    Integer columns come back as nullable `Int64`, everything else as
+    strings exactly as written, so no reader has to coerce them again;
+    columns the registry doesn't know are inferred. With `columns`, only
+    those are parsed. Non-integer values of integer columns are read as
+    missing (see `read_table_arrow`).
+    """
+    return to_frame(read_table_arrow(source, table, columns))
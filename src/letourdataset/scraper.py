@@ -1,15 +1,23 @@
 import asyncio
 import logging
 import re
+from collections.abc import AsyncIterator
 from io import StringIO
 from itertools import chain
-from typing import Any
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeGuard
 
-import aiohttp
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup, Tag
-from rich.progress import track
+
+from letourdataset.schema import ALL_RANKINGS, RIDERS, STAGES
+from letourdataset.spill import SpillBuffer
+from letourdataset.stages import format_stage_key, stage_keys, stage_number
+
+# The HTTP and HTML libraries are imported on first use: importing this
+# module (e.g. for `Edition`) shouldn't cost the half second they take.
+if TYPE_CHECKING:
+    import aiohttp
+    import requests
+    from bs4 import BeautifulSoup, Tag
 
 DEFAULT_HEADERS: dict[str, str] = {
     "Accept": "text/html",
@@ -19,6 +27,8 @@ DEFAULT_HEADERS: dict[str, str] = {
 }
 REQUEST_TIMEOUT_SECONDS = 30
 MAX_CONCURRENT_REQUESTS = 10
+# Temporary column for joining and sorting on the integer stage key
+STAGE_KEY_COLUMN = "__stage_key"
 
 # Editions for which the source site reports a total distance of 0 km.
 # The official route totals are used instead, keyed by (is_women, year).
@@ -27,11 +37,34 @@ DISTANCE_OVERRIDES: dict[tuple[bool, int], int] = {
 }
 
 
+def _http_get(url: str, headers: dict[str, str]) -> "requests.Response":
+    import requests
+
+    response = requests.get(
+        url, allow_redirects=True, headers=headers, timeout=REQUEST_TIMEOUT_SECONDS
+    )
+    response.raise_for_status()
+    return response
+
+
+def _soup(markup: str | bytes) -> "BeautifulSoup":
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(markup, "html.parser")
+
+
+def _is_tag(element: object) -> TypeGuard["Tag"]:
+    from bs4 import Tag
+
+    return isinstance(element, Tag)
+
+
 def parse_stage_number(stage_str: str, year: int) -> int | float | None:
     """Parse the stage number out of e.g. 'Stage 1 : Paris > Lyon'.
 
     Early editions ran some stages in two parts, which yields fractional
-    numbers such as 13.1 and 13.2; a prologue is stage 0.
+    numbers such as 13.1 and 13.2; a prologue is stage 0. See
+    `letourdataset.stages` for the integer key used to join and sort them.
     """
     token_parts = stage_str.split(":")[0].split(" ")
     try:
@@ -50,6 +83,18 @@ def parse_stage_number(stage_str: str, year: int) -> int | float | None:
             return None
 
 
+class Edition(NamedTuple):
+    """The cleaned tables of one edition, in the order `Scraper.run` returns."""
+
+    stages: pd.DataFrame
+    rankings: pd.DataFrame
+    all_rankings: pd.DataFrame
+
+    @property
+    def year(self) -> int:
+        return int(self.stages["Year"].iloc[0])
+
+
 class Scraper:
     def __init__(
         self,
@@ -88,14 +133,8 @@ class Scraper:
         }
 
     def _get_urls(self, history_page: str, headers: dict[str, str]) -> list[str]:
-        response = requests.get(
-            history_page,
-            allow_redirects=True,
-            headers=headers,
-            timeout=REQUEST_TIMEOUT_SECONDS,
-        )
-        response.raise_for_status()
-        string = str(BeautifulSoup(response.text, "html.parser"))
+        response = _http_get(history_page, headers)
+        string = str(_soup(response.text))
         pattern = r'data-tabs-ajax="([^"]+)"'
         matches = re.findall(pattern, string)
         # Validate that the URLs are ordered by most recent year first
@@ -128,11 +167,41 @@ class Scraper:
         )
         return matches
 
-    async def run(self) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-        stages_list: list[pd.DataFrame] = []
-        rankings_list: list[pd.DataFrame] = []
-        all_rankings_list: list[pd.DataFrame] = []
+    async def run(
+        self, memory_budget: int | None = None
+    ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Scrape every edition and return the concatenated tables.
+
+        Args:
+            memory_budget: Bytes of scraped frames to hold in memory before
+                spilling the completed editions to temporary files (see
+                `letourdataset.spill`). The tables then come back as
+                text, backed by the memory-mapped spill files. None keeps
+                everything in memory.
+        """
+        with SpillBuffer(memory_budget) as buffer:
+            async for df_stage, df_ranking, df_all_rankings in self.iter_editions():
+                buffer.add(STAGES, df_stage)
+                buffer.add(RIDERS, df_ranking)
+                buffer.add(ALL_RANKINGS, df_all_rankings)
+
+            df_stages = buffer.concat(STAGES)
+            df_rankings = buffer.concat(RIDERS)
+            df_all_rankings = buffer.concat(ALL_RANKINGS)
+
+        return df_stages, df_rankings, df_all_rankings
+
+    async def iter_editions(self) -> AsyncIterator[Edition]:
+        """Yield the cleaned tables of each edition as soon as it is scraped.
+
+        Editions come newest first, in the order of the history page. Unlike
+        `run`, nothing is kept after an edition has been yielded, so feeding
+        the stream into a sink (see `letourdataset.sinks`) holds only one
+        edition in memory at a time.
+        """
         logging.debug("Links:\n{}".format("\n".join(self._links)))
+        from rich.progress import track
+
         for link in track(self._links, "Downloading historical data..."):
             logging.info("Downloading data from {}".format(self._prefix + link))
             soup, year, distance = self._get_soup_year_distance(self._prefix + link)
@@ -148,16 +217,17 @@ class Scraper:
                     selections_urls["Ranking"], stages, year
                 )
             intermediate_rankings = await self._get_all_rankings(
-                selections_urls["Ranking"], list(stages["Stages"])
+                selections_urls["Ranking"],
+                [int(key) for key in stage_keys(stages["Stages"]).dropna()],
             )
             stages_winners = self._get_stages_winners(selections_urls["Stages winners"])
             jersey_wearers = self._get_jersey_wearers(selections_urls["Jersey wearers"])
 
-            # Update the dataframe stages by merging on 'Stages' using the stages_winners dataframe and the jersey_wearers dataframe
-            stages = pd.merge(stages, stages_winners, on="Stages", how="left")
+            # Update the dataframe stages by merging on the stage key using the stages_winners dataframe and the jersey_wearers dataframe
+            stages = self._merge_on_stage(stages, stages_winners)
             # Drop 'Parcours' column
             stages = stages.drop(columns="Parcours")
-            stages = pd.merge(stages, jersey_wearers, on="Stages", how="left")
+            stages = self._merge_on_stage(stages, jersey_wearers)
             # Make the first letter of each word in the fields of the columns that contains 'Winner' or 'Jersey' in their names uppercase and the rest lowercase using title() method
             cols = [
                 col
@@ -177,31 +247,13 @@ class Scraper:
                 distance,
             )
             logging.info("Data from {} cleaned up".format(self._prefix + link))
-            stages_list.append(df_stage)
-            rankings_list.append(df_ranking)
-            all_rankings_list.append(df_all_rankings)
-
-        logging.debug("Stage list:\n{}".format(stages_list))
-        logging.debug("Ranking list:\n{}".format(rankings_list))
-        df_stages = pd.concat(stages_list, ignore_index=True)
-        df_rankings = pd.concat(rankings_list, ignore_index=True)
-        df_all_rankings = pd.concat(all_rankings_list, ignore_index=True)
-
-        # try to cast the "Rank" column to int and sort by Year first then Rank
-        # for the df_all_rankings sort by Year, Stage, Rank
-        return df_stages, df_rankings, df_all_rankings
+            yield Edition(df_stage, df_ranking, df_all_rankings)
 
-    def _get_soup_year_distance(self, link: str) -> tuple[BeautifulSoup, int, int]:
-        result = requests.get(
-            link,
-            allow_redirects=True,
-            headers=self._headers,
-            timeout=REQUEST_TIMEOUT_SECONDS,
-        )
-        result.raise_for_status()
+    def _get_soup_year_distance(self, link: str) -> tuple["BeautifulSoup", int, int]:
+        result = _http_get(link, self._headers)
         logging.info("%s ==> HTTP STATUS = %s", link, result.status_code)
 
-        soup = BeautifulSoup(result.text, "html.parser")
+        soup = _soup(result.text)
         year_tag = soup.find("h3")
         if year_tag is None:
             raise ValueError(f"Could not find the year heading (h3) on {link}.")
@@ -222,9 +274,9 @@ class Scraper:
             distance = override
         return soup, year, distance
 
-    def _get_stages(self, soup: Tag, year: int, distance: int) -> pd.DataFrame:
+    def _get_stages(self, soup: "Tag", year: int, distance: int) -> pd.DataFrame:
         select_tag = soup.find("select")
-        if not isinstance(select_tag, Tag):
+        if not _is_tag(select_tag):
             raise ValueError("Can't find the stage `select` element.")
 
         df_stages = pd.DataFrame(
@@ -249,11 +301,8 @@ class Scraper:
         return df_stages
 
     def _get_stages_winners(self, winners_link: str) -> pd.DataFrame:
-        response = requests.get(
-            winners_link, headers=self._headers, timeout=REQUEST_TIMEOUT_SECONDS
-        )
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
+        response = _http_get(winners_link, self._headers)
+        soup = _soup(response.content)
         stages_winners = soup.find("table")
         if stages_winners is None:
             raise ValueError(f"No stage winners table found on {winners_link}.")
@@ -262,11 +311,8 @@ class Scraper:
         return df_stages_winners
 
     def _get_jersey_wearers(self, jersey_link: str) -> pd.DataFrame:
-        response = requests.get(
-            jersey_link, headers=self._headers, timeout=REQUEST_TIMEOUT_SECONDS
-        )
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
+        response = _http_get(jersey_link, self._headers)
+        soup = _soup(response.content)
         jersey_wearers = soup.find("table")
         if jersey_wearers is None:
             raise ValueError(f"No jersey wearers table found on {jersey_link}.")
@@ -277,7 +323,7 @@ class Scraper:
         df_jersey_wearers[cols] = df_jersey_wearers[cols].astype(str)
         return df_jersey_wearers
 
-    def _add_bib_number(self, soup: Tag, df_rankings: pd.DataFrame) -> pd.DataFrame:
+    def _add_bib_number(self, soup: "Tag", df_rankings: pd.DataFrame) -> pd.DataFrame:
         # Manually add the bib numbers because they are not in the rankings table
         bibs = [
             int(bib.replace("#", ""))
@@ -294,7 +340,7 @@ class Scraper:
             df_rankings.insert(2, "Rider No.", None)
         return df_rankings
 
-    def _get_rankings(self, soup: Tag) -> pd.DataFrame:
+    def _get_rankings(self, soup: "Tag") -> pd.DataFrame:
         """Get the rankings for a given year
 
         Args:
@@ -320,31 +366,20 @@ class Scraper:
         after the last stage is the official final result (time bonuses
         included), so it is used instead of leaving the year unranked.
         """
-        stage_numbers = [
-            stage
-            for stage in df_stages["Stages"]
-            if stage is not None and pd.notna(stage)
-        ]
-        if not stage_numbers:
+        keys = stage_keys(df_stages["Stages"]).dropna()
+        if keys.empty:
             logging.warning("No stages known for %d; cannot read a final GC.", year)
             return pd.DataFrame()
 
-        last_stage = max(stage_numbers)
-        stage_param = (
-            int(last_stage) if float(last_stage).is_integer() else float(last_stage)
-        )
-        url = f"{ranking_link}?stage={stage_param}&type=itg"
+        url = f"{ranking_link}?stage={format_stage_key(int(keys.max()))}&type=itg"
         logging.info("Year page for %d has no GC table; falling back to %s", year, url)
 
-        response = requests.get(
-            url, headers=self._headers, timeout=REQUEST_TIMEOUT_SECONDS
-        )
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+        response = _http_get(url, self._headers)
+        soup = _soup(response.text)
         ranking_table = soup.find(
             "table", {"class": "rankingTable rtable js-extend-target"}
         )
-        if not isinstance(ranking_table, Tag) or len(ranking_table.find_all("tr")) <= 1:
+        if not _is_tag(ranking_table) or len(ranking_table.find_all("tr")) <= 1:
             logging.warning("No final general classification available for %d.", year)
             return pd.DataFrame()
 
@@ -355,27 +390,45 @@ class Scraper:
 
     @staticmethod
     async def _fetch(
-        session: aiohttp.ClientSession, url: str, semaphore: asyncio.Semaphore
+        session: "aiohttp.ClientSession", url: str, semaphore: asyncio.Semaphore
     ) -> str:
         async with semaphore:
             async with session.get(url) as response:
                 response.raise_for_status()
                 return await response.text()
 
+    @staticmethod
+    def _merge_on_stage(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+        """Left-join `right` onto `left` by stage key.
+
+        Joining on the raw 'Stages' values would depend on how pandas parsed
+        each table (1 vs 1.0 vs '1'); the integer key is the same for all.
+        """
+        right = right.drop(columns="Stages").assign(
+            **{STAGE_KEY_COLUMN: stage_keys(right["Stages"])}
+        )
+        left = left.assign(**{STAGE_KEY_COLUMN: stage_keys(left["Stages"])})
+        return left.merge(right, on=STAGE_KEY_COLUMN, how="left").drop(
+            columns=STAGE_KEY_COLUMN
+        )
+
     async def _get_all_rankings(
-        self, ranking_link: str, stages_numbers: list[float]
+        self, ranking_link: str, stages_keys: list[int]
     ) -> pd.DataFrame:
         stages: list[list[dict[str, Any]]] = []
+        import aiohttp
+
         semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
         timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS * 4)
         async with aiohttp.ClientSession(
             timeout=timeout, headers=self._aio_headers
         ) as session:
             tasks = []
-            for stage_number in stages_numbers:
+            for key in stages_keys:
                 for ranking_type_name, ranking_type_idx in self._ranking_types.items():
                     ranking_url = (
-                        f"{ranking_link}?stage={stage_number}&type={ranking_type_idx}"
+                        f"{ranking_link}?stage={format_stage_key(key)}"
+                        f"&type={ranking_type_idx}"
                     )
                     tasks.append(self._fetch(session, ranking_url, semaphore))
 
@@ -383,18 +436,21 @@ class Scraper:
             responses = await asyncio.gather(*tasks)
 
             response_idx = 0
-            for stage_number in stages_numbers:
+            for key in stages_keys:
                 for ranking_type_name, ranking_type_idx in self._ranking_types.items():
                     rank_html = responses[response_idx]
                     response_idx += 1
                     rankings = self._parse_ranking_rows(
-                        rank_html, stage_number, ranking_type_name, ranking_type_idx
+                        rank_html,
+                        stage_number(key),
+                        ranking_type_name,
+                        ranking_type_idx,
                     )
                     if not rankings:
                         logging.info(
                             "No ranking for %s on stage %s (URL: %s).",
                             ranking_type_name,
-                            stage_number,
+                            format_stage_key(key),
                             ranking_link,
                         )
                         continue
@@ -410,11 +466,11 @@ class Scraper:
         ranking_type_idx: str,
     ) -> list[dict[str, Any]]:
         """Parse one ranking page into row dicts; empty list when no data."""
-        rank_soup = BeautifulSoup(rank_html, "html.parser")
+        rank_soup = _soup(rank_html)
         ranking_table = rank_soup.find(
             "table", {"class": "rankingTable rtable js-extend-target"}
         )
-        if not isinstance(ranking_table, Tag):
+        if not _is_tag(ranking_table):
             return []
         rows = ranking_table.find_all("tr")
         if len(rows) <= 2:
@@ -501,6 +557,8 @@ class Scraper:
         return rankings
 
     async def _fetch_yearly_tdf_urls(self, year_url: str) -> dict[str, str]:
+        import aiohttp
+
         timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS)
         async with aiohttp.ClientSession(
             timeout=timeout, headers=self._aio_headers
@@ -509,7 +567,7 @@ class Scraper:
                 response.raise_for_status()
                 html_content = await response.text()
 
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = _soup(html_content)
 
         buttons = soup.find_all(
             "button", class_="tabs__item btn js-tabs-nested"
@@ -590,16 +648,25 @@ class Scraper:
         df_rankings.sort_values(["Year", "Rank"], axis=0, ascending=True, inplace=True)
         df_rankings = df_rankings.reset_index(drop=True)
 
-        df_stages.sort_values(["Year", "Stages"], axis=0, ascending=True, inplace=True)
-        df_stages = df_stages.reset_index(drop=True)
+        # Stages are sorted on their integer key; the mixed int/float values
+        # would otherwise force an object-dtype comparison.
+        df_stages = (
+            df_stages.assign(**{STAGE_KEY_COLUMN: stage_keys(df_stages["Stages"])})
+            .sort_values(["Year", STAGE_KEY_COLUMN], kind="stable")
+            .drop(columns=STAGE_KEY_COLUMN)
+            .reset_index(drop=True)
+        )
 
-        df_all_rankings.sort_values(
-            ["Year", "Stages", "Ranking type", "Rank"],
-            axis=0,
-            ascending=True,
-            inplace=True,
+        df_all_rankings = (
+            df_all_rankings.assign(
+                **{STAGE_KEY_COLUMN: stage_keys(df_all_rankings["Stages"])}
+            )
+            .sort_values(
+                ["Year", STAGE_KEY_COLUMN, "Ranking type", "Rank"], kind="stable"
+            )
+            .drop(columns=STAGE_KEY_COLUMN)
+            .reset_index(drop=True)
         )
-        df_all_rankings = df_all_rankings.reset_index(drop=True)
 
         return df_rankings, df_all_rankings, df_stages
 
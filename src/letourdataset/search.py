@@ -0,0 +1,230 @@
+"""Fuzzy search over every rider name of both races.
+
+`RiderSearch` indexes the distinct rider names of all tables (riders,
+stage winners and jersey wearers, all rankings) by their normalised form
+(see `letourdataset.names`), so 'Pogačar', 'POGACAR' and 'Tadej Pogacar
+(UAE Team Emirates)' are one entry:
+
+    search = load_search("data")
+    search.search("pogacer")   # [('Tadej Pogacar', 0.571)]
+    search.prefix("merck")     # ['AXEL MERCKX', 'Eddy Merckx']
+
+Fuzzy matching counts the word trigrams a query shares with each name in
+an inverted index (trigram -> names), so a query only touches the names
+sharing a trigram with it. Prefix lookups binary-search the sorted words
+and full names. All of it lives in numpy arrays, saved as
+`<data_root>/.cache/rider_search.npz` together with the hashes of the CSVs
+it was built from; `load_search` only rebuilds it when one of them changed.
+"""
+
+import json
+import logging
+import os
+from collections import defaultdict
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+from letourdataset.cache import CACHE_DIR, load_arrow, source_hash
+from letourdataset.names import NAME_COLUMNS, fold, table_names
+from letourdataset.schema import RACE_LAYOUT, TABLES, table_path, to_frame
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FILE = "rider_search.npz"
+# Bump when the index's layout or trigrams change, so old files are rebuilt
+SEARCH_VERSION = 1
+# The arrays a `RiderSearch` consists of, as saved
+_ARRAYS = (
+    "names",
+    "display",
+    "grams",
+    "offsets",
+    "postings",
+    "gram_counts",
+    "keys",
+    "key_names",
+)
+# Sorts after every character `fold` leaves, for prefix range ends
+_PREFIX_END = "\x7f"
+
+
+def trigrams(text: str) -> set[str]:
+    """The trigrams of each word of a folded text, padded by a space.
+
+    'eddy merckx' -> {' ed', 'edd', 'ddy', 'dy ', ' me', ..., 'kx '}
+    """
+    grams: set[str] = set()
+    for word in text.split():
+        padded = f" {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _display_name(forms: list[str]) -> str:
+    # Prefer a form with lower case letters, e.g. with its accents intact
+    mixed = [form for form in forms if not form.isupper()]
+    return (mixed or forms)[0]
+
+
+class RiderSearch:
+    """Trigram and prefix index over a set of names. Build with `build`."""
+
+    def __init__(self, arrays: dict[str, np.ndarray]) -> None:
+        """Wrap the arrays of an index, as made by `build` or saved."""
+        # Names, sorted by their folded form, and how to print them
+        self.names: np.ndarray = arrays["names"]
+        self.display: np.ndarray = arrays["display"]
+        # Trigram postings in CSR form: the names containing grams[i] are
+        # postings[offsets[i]:offsets[i + 1]]
+        self.grams: np.ndarray = arrays["grams"]
+        self.offsets: np.ndarray = arrays["offsets"]
+        self.postings: np.ndarray = arrays["postings"]
+        self.gram_counts: np.ndarray = arrays["gram_counts"]
+        # Sorted words and full names, with the name each belongs to
+        self.keys: np.ndarray = arrays["keys"]
+        self.key_names: np.ndarray = arrays["key_names"]
+        self._gram_ids = {gram: i for i, gram in enumerate(self.grams.tolist())}
+
+    @classmethod
+    def build(cls, names: Iterable[str]) -> "RiderSearch":
+        """Index names as printed (see `names.clean_name`)."""
+        forms: dict[str, list[str]] = defaultdict(list)
+        for name in names:
+            folded = fold(name)
+            if folded and name not in forms[folded]:
+                forms[folded].append(name)
+        folded_names = sorted(forms)
+
+        grams_of = [sorted(trigrams(name)) for name in folded_names]
+        pairs = sorted((gram, i) for i, grams in enumerate(grams_of) for gram in grams)
+        grams, starts = np.unique([gram for gram, _ in pairs], return_index=True)
+        keys = sorted(
+            (key, i)
+            for i, name in enumerate(folded_names)
+            for key in {name, *name.split()}
+        )
+        return cls(
+            {
+                "names": np.array(folded_names, dtype=str),
+                "display": np.array(
+                    [_display_name(forms[name]) for name in folded_names], dtype=str
+                ),
+                "grams": grams.astype(str),
+                "offsets": np.append(starts, len(pairs)).astype(np.int64),
+                "postings": np.array([i for _, i in pairs], dtype=np.int32),
+                "gram_counts": np.array([len(g) for g in grams_of], dtype=np.int32),
+                "keys": np.array([key for key, _ in keys], dtype=str),
+                "key_names": np.array([i for _, i in keys], dtype=np.int32),
+            }
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(
+        self, query: str, limit: int = 10, min_score: float = 0.5
+    ) -> list[tuple[str, float]]:
+        """Names most similar to `query`, best first, with their score.
+
+        The score is the share of the query's trigrams found in the name:
+        1.0 when every word of the query is in it ('merckx' for 'Eddy
+        Merckx'). Names with the same score rank by their overall
+        similarity (Jaccard), so the closest-length name comes first.
+        """
+        query_grams = trigrams(fold(query))
+        found = [self._gram_ids[g] for g in query_grams if g in self._gram_ids]
+        if not found:
+            return []
+        hits = np.concatenate(
+            [self.postings[self.offsets[i] : self.offsets[i + 1]] for i in found]
+        )
+        counts = np.bincount(hits, minlength=len(self.names))
+        candidates = np.flatnonzero(counts >= min_score * len(query_grams))
+        shared = counts[candidates]
+        scores = shared / len(query_grams)
+        union = len(query_grams) + self.gram_counts[candidates] - shared
+        order = (self.names[candidates], -shared / union, -scores)
+        best = np.lexsort(order)[:limit]
+        return [
+            (str(self.display[candidates[i]]), round(float(scores[i]), 3)) for i in best
+        ]
+
+    def prefix(self, text: str, limit: int = 10) -> list[str]:
+        """Names with a word (or the whole name) starting with `text`."""
+        start = fold(text)
+        if not start:
+            return []
+        low = np.searchsorted(self.keys, start, side="left")
+        high = np.searchsorted(self.keys, start + _PREFIX_END, side="left")
+        # A name can match with several words; keep its first match
+        matches = dict.fromkeys(self.key_names[low:high].tolist())
+        return [str(self.display[i]) for i in list(matches)[:limit]]
+
+    def save(self, path: str | Path, sources: dict[str, str]) -> None:
+        """Write the index, with the hashes of the files it was built from."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        arrays = {name: getattr(self, name) for name in _ARRAYS}
+        np.savez(
+            staging,
+            version=np.array(SEARCH_VERSION),
+            sources=np.array(json.dumps(sources, sort_keys=True)),
+            **arrays,
+        )
+        staging.replace(path)
+
+
+def _sources(data_root: Path) -> dict[str, str]:
+    """Hash of every data file below `data_root`, by relative path."""
+    sources: dict[str, str] = {}
+    for race in RACE_LAYOUT:
+        for table in TABLES:
+            path = table_path(data_root, race, table)
+            if path.exists():
+                sources[path.relative_to(data_root).as_posix()] = source_hash(path)
+    return sources
+
+
+def _read(path: Path, sources: dict[str, str]) -> RiderSearch | None:
+    try:
+        with np.load(path) as stored:
+            if int(stored["version"]) != SEARCH_VERSION:
+                return None
+            if json.loads(str(stored["sources"])) != sources:
+                return None
+            return RiderSearch({name: stored[name] for name in _ARRAYS})
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def build_search(data_root: str | Path = "data") -> RiderSearch:
+    """Index the rider names of every data file below `data_root`."""
+    names: list[str] = []
+    for race in RACE_LAYOUT:
+        for table in TABLES:
+            path = table_path(data_root, race, table)
+            if not path.exists():
+                continue
+            arrow = load_arrow(path, table)
+            columns = [c for c in NAME_COLUMNS[table] if c in arrow.schema.names]
+            names.extend(table_names(to_frame(arrow.select(columns)), table))
+    return RiderSearch.build(names)
+
+
+def load_search(data_root: str | Path = "data") -> RiderSearch:
+    """The rider search index of a data directory, rebuilt when stale."""
+    data_root = Path(data_root)
+    path = data_root / CACHE_DIR / SEARCH_FILE
+    sources = _sources(data_root)
+    search = _read(path, sources)
+    if search is None:
+        search = build_search(data_root)
+        try:
+            search.save(path, sources)
+            logger.info("✅ Indexed %d rider names", len(search))
+        except OSError as e:
+            logger.warning("Could not save the rider search index: %s", e)
+    return search
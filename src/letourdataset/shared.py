@@ -0,0 +1,189 @@
+"""One race's tables in shared memory, for multi-process workers.
+
+Workers that each `load` the tables hold a copy each. A `SharedDataset`
+publishes them once into a `multiprocessing.shared_memory` block, and
+workers attach to that block without copying or parsing anything:
+
+    with SharedDataset.publish(MEN) as shared:
+        with Pool(8) as pool:
+            pool.map(analyse, [(shared.name, year) for year in years])
+
+    def analyse(args):
+        name, year = args
+        with SharedDataset.attach(name) as shared:
+            riders = shared.table(RIDERS)     # Arrow, backed by the block
+            ...
+
+The block holds one Arrow IPC stream per table. Integer columns are
+fixed-width as they are; string columns are dictionary-encoded, so a
+worker sees int32 codes and one copy of each distinct string, all of it
+in the shared block. `frame` converts a table to pandas (strings become
+categoricals), which copies only the integer columns.
+
+A `SharedDataset` also pickles as its name, so it can be passed to pool
+workers directly; the process that published the block unlinks it.
+"""
+
+import json
+import logging
+import struct
+from multiprocessing import shared_memory
+from pathlib import Path
+from types import TracebackType
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from letourdataset.cache import load_arrow
+from letourdataset.schema import TABLES, table_path, to_frame
+
+logger = logging.getLogger(__name__)
+
+# The block starts with the length of a JSON header: table -> [offset, size]
+_HEADER = struct.Struct("<Q")
+# Arrow buffers are 64-byte aligned within a stream; so are the streams
+_ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _encode(arrow: pa.Table) -> pa.Table:
+    """Dictionary-encode the string columns of a table."""
+    columns = [
+        pc.dictionary_encode(column) if pa.types.is_string(column.type) else column
+        for column in arrow.columns
+    ]
+    return pa.table(columns, names=arrow.column_names)
+
+
+def _serialise(arrow: pa.Table) -> pa.Buffer:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, arrow.schema) as writer:
+        writer.write_table(arrow)
+    return sink.getvalue()
+
+
+class SharedDataset:
+    """Tables published in a shared memory block. Use `publish` or `attach`."""
+
+    def __init__(self, block: shared_memory.SharedMemory, owner: bool) -> None:
+        self._block = block
+        self._owner = owner
+        (length,) = _HEADER.unpack_from(block.buf)
+        header = bytes(block.buf[_HEADER.size : _HEADER.size + length])
+        self._layout: dict[str, list[int]] = json.loads(header)
+        self._start = _align(_HEADER.size + length)
+        self._tables: dict[str, pa.Table] = {}
+
+    @classmethod
+    def publish_tables(
+        cls, tables: dict[str, pa.Table], name: str | None = None
+    ) -> "SharedDataset":
+        """Copy Arrow tables into a new block; `name` is chosen if omitted."""
+        streams = {table: _serialise(_encode(arrow)) for table, arrow in tables.items()}
+        # Stream offsets are relative to the end of the header
+        layout: dict[str, list[int]] = {}
+        size = 0
+        for table, stream in streams.items():
+            layout[table] = [size, stream.size]
+            size = _align(size + stream.size)
+        header = json.dumps(layout).encode()
+        start = _align(_HEADER.size + len(header))
+
+        block = shared_memory.SharedMemory(name=name, create=True, size=start + size)
+        _HEADER.pack_into(block.buf, 0, len(header))
+        block.buf[_HEADER.size : _HEADER.size + len(header)] = header
+        for table, stream in streams.items():
+            offset = start + layout[table][0]
+            block.buf[offset : offset + stream.size] = memoryview(stream).cast("B")
+        logger.info("✅ Published %d bytes as %s", block.size, block.name)
+        return cls(block, owner=True)
+
+    @classmethod
+    def publish(
+        cls, race: str, data_root: str | Path = "data", name: str | None = None
+    ) -> "SharedDataset":
+        """Publish every table of a race that has a data file."""
+        tables = {}
+        for table in TABLES:
+            path = table_path(data_root, race, table)
+            if path.exists():
+                tables[table] = load_arrow(path, table)
+        return cls.publish_tables(tables, name)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedDataset":
+        """Attach to a block published by another process.
+
+        Attach from processes the publisher started (a `multiprocessing`
+        pool): they share its resource tracker, which would otherwise
+        unlink the block when an unrelated attaching process exits.
+
+        Raises:
+            FileNotFoundError: If no block of that name exists.
+        """
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._block.name
+
+    @property
+    def size(self) -> int:
+        """Size of the block in bytes."""
+        return self._block.size
+
+    @property
+    def tables(self) -> list[str]:
+        return list(self._layout)
+
+    def table(self, table: str) -> pa.Table:
+        """A table as Arrow, its buffers pointing into the shared block.
+
+        Raises:
+            KeyError: If the table wasn't published.
+        """
+        if table not in self._tables:
+            offset, size = self._layout[table]
+            start = self._start + offset
+            buffer = pa.py_buffer(self._block.buf[start : start + size])
+            self._tables[table] = pa.ipc.open_stream(buffer).read_all()
+        return self._tables[table]
+
+    def frame(self, table: str) -> pd.DataFrame:
+        """A table as pandas; string columns become categoricals."""
+        return to_frame(self.table(table))
+
+    def close(self) -> None:
+        """Detach; the publishing process also unlinks the block.
+
+        Drop the tables and frames taken from it first: their buffers
+        point into the block. If some are still referenced, closing logs a
+        warning and the block stays mapped in this process for as long as
+        they live; unlinking only removes its name, so no other process
+        can attach to it.
+        """
+        self._tables.clear()
+        try:
+            self._block.close()
+        except BufferError:
+            logger.warning("Tables of %s are still in use", self.name)
+        if self._owner:
+            self._block.unlink()
+
+    def __enter__(self) -> "SharedDataset":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __reduce__(self) -> tuple[object, tuple[str]]:
+        return SharedDataset.attach, (self.name,)
@@ -0,0 +1,290 @@
+"""Write a stream of scraped editions incrementally.
+
+`Scraper.iter_editions` yields one edition at a time; a sink writes each
+edition out as it arrives instead of waiting for the whole history:
+
+    with CsvSink(folder, "TDF") as sink:
+        await drain(scraper.iter_editions(), sink)
+
+Memory is then bounded by one edition, and the files grow edition by
+edition, so downstream jobs can start on the first years while later ones
+are still downloading.
+"""
+
+import dataclasses
+import logging
+import shutil
+import sqlite3
+import tempfile
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from pathlib import Path
+from types import TracebackType
+
+import pandas as pd
+
+from letourdataset import parquet
+from letourdataset.metadata import write_metadata
+from letourdataset.postprocessor import SPECS, canonicalise, holds_integers
+from letourdataset.schema import ALL_RANKINGS, RIDERS, STAGES, table_file_name
+from letourdataset.scraper import Edition
+
+logger = logging.getLogger(__name__)
+
+
+def edition_tables(edition: Edition) -> dict[str, pd.DataFrame]:
+    """The frames of one edition keyed by table name."""
+    return {
+        RIDERS: edition.rankings,
+        STAGES: edition.stages,
+        ALL_RANKINGS: edition.all_rankings,
+    }
+
+
+class Sink(ABC):
+    """Consumes editions one at a time. Use as a context manager.
+
+    Subclasses implement `write_table`, and `close` if they hold anything.
+    """
+
+    def write(self, edition: Edition) -> None:
+        for table, frame in edition_tables(edition).items():
+            if frame.empty:
+                continue
+            self.write_table(table, frame)
+
+    @abstractmethod
+    def write_table(self, table: str, frame: pd.DataFrame) -> None:
+        """Write one edition's frame of `table`."""
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "Sink":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+async def drain(editions: AsyncIterator[Edition], *sinks: Sink) -> int:
+    """Feed every edition of the stream to every sink; returns the count."""
+    count = 0
+    async for edition in editions:
+        for sink in sinks:
+            sink.write(edition)
+        count += 1
+        logger.info("Wrote edition %d to %d sink(s)", edition.year, len(sinks))
+    return count
+
+
+class CsvSink(Sink):
+    """Append each edition to `<prefix>_<table>_History.csv` in `directory`.
+
+    Existing files are replaced on the first write. Editions don't all have
+    the same columns (e.g. no points ranking in some years), so when one
+    brings a column the file doesn't have yet, the file is rewritten once
+    with the wider header. The column order is then the same as if all
+    editions had been concatenated first.
+
+    With `canonical`, every edition is kept in a temporary part file, and
+    the files are assembled in year order on `close`, each part normalised
+    and sorted by the postprocessor's `FileSpec` rules (see
+    `postprocessor.canonicalise`). Whether an integer column is written as
+    integers is decided for the whole file, as the postprocessor does: one
+    edition with a non-integer cell leaves the column as printed in every
+    edition. The result is byte for byte what the postprocessor would make
+    of the plain output, so that pass has nothing left to do, and each
+    file's summary sidecar (see `letourdataset.metadata`) is written too.
+    """
+
+    def __init__(
+        self, directory: str | Path, prefix: str, canonical: bool = False
+    ) -> None:
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.canonical = canonical
+        self._columns: dict[str, list[str]] = {}
+        # table -> (year, part file, columns of the part) per edition
+        self._parts: dict[str, list[tuple[int, Path, list[str]]]] = {}
+        # table -> the spec's integer columns no part has a non-integer in
+        self._integers: dict[str, set[str]] = {}
+        self._parts_dir: tempfile.TemporaryDirectory[str] | None = None
+
+    def path(self, table: str) -> Path:
+        return self.directory / table_file_name(self.prefix, table)
+
+    def write_table(self, table: str, frame: pd.DataFrame) -> None:
+        if self.canonical:
+            self._write_part(table, frame)
+            return
+
+        path = self.path(table)
+        columns = self._columns.get(table)
+        if columns is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            frame.to_csv(path, index=False)
+            self._columns[table] = list(frame.columns)
+            return
+
+        new_columns = [col for col in frame.columns if col not in columns]
+        if new_columns:
+            columns = columns + new_columns
+            self._widen(path, columns)
+            self._columns[table] = columns
+        frame.reindex(columns=columns).to_csv(path, mode="a", header=False, index=False)
+
+    def close(self) -> None:
+        try:
+            if self._parts_dir is not None:
+                for table in self._parts:
+                    self._assemble(table)
+        finally:
+            if self._parts_dir is not None:
+                self._parts_dir.cleanup()
+            self._parts_dir = None
+            self._parts = {}
+        if self.canonical:
+            # Plain output gets its sidecars from the postprocessor
+            for table in self._columns:
+                write_metadata(self.path(table), table)
+
+    @staticmethod
+    def _widen(path: Path, columns: list[str]) -> None:
+        # Read everything as text so the rows already written come back
+        # byte for byte; only the new, empty columns are added.
+        existing = pd.read_csv(path, dtype=str, keep_default_na=False)
+        existing.reindex(columns=columns, fill_value="").to_csv(path, index=False)
+        logger.info(
+            "Added columns to %s: %s", path.name, columns[len(existing.columns) :]
+        )
+
+    def _write_part(self, table: str, frame: pd.DataFrame) -> None:
+        if self._parts_dir is None:
+            self._parts_dir = tempfile.TemporaryDirectory(prefix="letour-csv-")
+        year = int(frame["Year"].min())
+        part = Path(self._parts_dir.name) / f"{table}-{year}.csv"
+        # Written as the plain output prints it; read back as text, the
+        # part is what the postprocessor would see of this edition
+        frame.to_csv(part, header=False, index=False)
+        text = _read_part(part, list(frame.columns))
+        integers = self._integers.setdefault(table, set(SPECS[table].integer_columns))
+        integers -= {
+            col for col in integers if col in text and not holds_integers(text[col])
+        }
+
+        columns = self._columns.setdefault(table, [])
+        columns.extend(col for col in frame.columns if col not in columns)
+        self._parts.setdefault(table, []).append((year, part, list(frame.columns)))
+
+    def _assemble(self, table: str) -> None:
+        """Concatenate the canonical parts of a table in year order."""
+        columns = self._columns[table]
+        spec = SPECS[table]
+        integers = self._integers[table]
+        for col in spec.integer_columns:
+            if col in columns and col not in integers:
+                logger.warning(
+                    "Column '%s' in %s contains non-integer values; left as is.",
+                    col,
+                    self.path(table).name,
+                )
+        spec = dataclasses.replace(
+            spec,
+            integer_columns=tuple(c for c in spec.integer_columns if c in integers),
+        )
+        path = self.path(table)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(path.name + ".tmp")
+        with staging.open("w", encoding="utf-8", newline="") as out:
+            out.write(pd.DataFrame(columns=columns).to_csv(index=False))
+            for year, part, part_columns in sorted(self._parts[table]):
+                # Read back as text, so the columns no rule touches, and
+                # the ones missing from the part (left empty), are written
+                # as the plain output has them
+                rows = canonicalise(
+                    _read_part(part, part_columns), spec, f"{table} {year}"
+                )
+                rows.reindex(columns=columns).to_csv(out, header=False, index=False)
+        staging.replace(path)
+
+
+def _read_part(part: Path, columns: list[str]) -> pd.DataFrame:
+    """A headerless part file with every cell as text; empty cells missing."""
+    return pd.read_csv(
+        part,
+        header=None,
+        names=columns,
+        dtype=str,
+        keep_default_na=False,
+        na_values=[""],
+    )
+
+
+class ParquetSink(Sink):
+    """Write each edition into the year-partitioned Parquet copy of a race.
+
+    Uses the layout and explicit schema of `letourdataset.parquet`; every
+    edition is its own partition, so a later edition never rewrites an
+    earlier one. The race's existing partitions are removed on the first
+    write of each table.
+    """
+
+    def __init__(self, root: str | Path, race: str) -> None:
+        self.root = Path(root)
+        self.race = race
+        self._started: set[str] = set()
+
+    def write_table(self, table: str, frame: pd.DataFrame) -> None:
+        if table not in self._started:
+            target = parquet.race_path(self.root, self.race, table)
+            if target.exists():
+                shutil.rmtree(target)
+            self._started.add(table)
+        year = int(frame["Year"].iloc[0])
+        parquet.write_partition(frame, self.root, self.race, table, year)
+
+
+class SqliteSink(Sink):
+    """Append each edition to one table per data table in a SQLite file.
+
+    Tables are named like the CSV files without the suffix (e.g.
+    `TDF_Riders_History`). Columns an edition brings that the table does
+    not have yet are added with `ALTER TABLE`. Existing tables are dropped
+    on the first write of each table.
+    """
+
+    def __init__(self, database: str | Path, prefix: str) -> None:
+        self.database = Path(database)
+        self.prefix = prefix
+        self._connection = sqlite3.connect(self.database)
+        self._created: set[str] = set()
+
+    def table_name(self, table: str) -> str:
+        return Path(table_file_name(self.prefix, table)).stem
+
+    def write_table(self, table: str, frame: pd.DataFrame) -> None:
+        name = self.table_name(table)
+        with self._connection:
+            if name not in self._created:
+                self._connection.execute(f'DROP TABLE IF EXISTS "{name}"')
+                self._created.add(name)
+            else:
+                existing = {
+                    row[1]
+                    for row in self._connection.execute(f'PRAGMA table_info("{name}")')
+                }
+                for col in frame.columns:
+                    if col not in existing:
+                        self._connection.execute(
+                            f'ALTER TABLE "{name}" ADD COLUMN "{col}"'
+                        )
+            frame.to_sql(name, self._connection, if_exists="append", index=False)
+
+    def close(self) -> None:
+        self._connection.close()
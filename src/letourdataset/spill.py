@@ -0,0 +1,176 @@
+"""Accumulate scraped frames under a memory budget.
+
+A full-history scrape collects one frame per edition and table, and the
+final `pd.concat` briefly holds every frame twice. `SpillBuffer` keeps the
+frames in memory until they exceed a byte budget, then writes them to
+Arrow IPC files in a temporary directory and drops them.
+
+The spill files have a schema fixed up front: every column is text, each
+value written as `to_csv` renders it in its edition's frame. Scraped
+columns mix numbers and strings (a rank of 'DNF') and change type between
+editions, which Arrow can't hold in one column; as text, every edition
+fits the same schema. The one difference from printing `pd.concat` of the
+frames: an integer column isn't made float because another edition's is,
+so a rank stays '2' rather than '2.0' (the postprocessor reads both as 2).
+
+`concat` spills what is still held, then assembles the table from the
+memory-mapped spill files without copying them: its columns are Arrow
+backed strings (`pd.StringDtype("pyarrow")`) whose buffers are the
+file's pages, which the OS can drop and read back rather than counting
+them against the process's own memory. Without a budget nothing is
+spilled and `concat` is a plain `pd.concat`, with the scraped dtypes.
+"""
+
+import logging
+import tempfile
+from collections.abc import Iterator
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.ipc as ipc
+
+logger = logging.getLogger(__name__)
+
+# The type of every column of a spill file
+SPILL_TYPE = pa.large_string()
+# How spilled tables come back to pandas, without copying their buffers
+_TYPES = {SPILL_TYPE: pd.StringDtype("pyarrow")}.get
+
+
+def frame_bytes(frame: pd.DataFrame) -> int:
+    """In-memory size of a frame, strings included."""
+    return int(frame.memory_usage(deep=True, index=True).sum())
+
+
+def as_text(frame: pd.DataFrame) -> pa.Table:
+    """A frame as an Arrow table of text, each value as `to_csv` prints it.
+
+    Empty cells, missing values included, become nulls.
+    """
+    columns = [str(col) for col in frame.columns]
+    rendered = BytesIO(frame.to_csv(index=False).encode("utf-8"))
+    return pacsv.read_csv(
+        rendered,
+        read_options=pacsv.ReadOptions(column_names=columns, skip_rows=1),
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            column_types={col: SPILL_TYPE for col in columns},
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=True,
+        ),
+    )
+
+
+def _widen(table: pa.Table, columns: list[str]) -> pa.Table:
+    """`table` with `columns`, in that order; the ones it lacks are null."""
+    arrays = [
+        table.column(col)
+        if col in table.column_names
+        else pa.nulls(len(table), SPILL_TYPE)
+        for col in columns
+    ]
+    return pa.Table.from_arrays(arrays, names=columns)
+
+
+def _read(path: Path) -> pa.Table:
+    """A spill file, memory-mapped."""
+    return ipc.open_file(pa.memory_map(str(path))).read_all()
+
+
+class SpillBuffer:
+    """Per-table lists of frames that spill to disk past `memory_budget` bytes.
+
+    With no budget everything stays in memory, which is what `Scraper.run`
+    always did. Use as a context manager so the spill files are removed;
+    frames from `concat` stay valid after that on POSIX systems, where a
+    mapped file outlives its directory entry.
+    """
+
+    def __init__(
+        self, memory_budget: int | None = None, directory: str | Path | None = None
+    ) -> None:
+        self.memory_budget = memory_budget
+        self._tmp: tempfile.TemporaryDirectory[str] | None = None
+        self._directory = Path(directory) if directory is not None else None
+        self._frames: dict[str, list[pd.DataFrame]] = {}
+        self._spilled: dict[str, list[Path]] = {}
+        # Columns of each spilled table, in the order they first appeared
+        self._columns: dict[str, list[str]] = {}
+        self._bytes = 0
+        self._spills = 0
+
+    @property
+    def directory(self) -> Path:
+        if self._directory is None:
+            self._tmp = tempfile.TemporaryDirectory(
+                prefix="letour-spill-", ignore_cleanup_errors=True
+            )
+            self._directory = Path(self._tmp.name)
+        return self._directory
+
+    def add(self, table: str, frame: pd.DataFrame) -> None:
+        """Append one frame; spills everything held when over budget."""
+        self._frames.setdefault(table, []).append(frame)
+        self._bytes += frame_bytes(frame)
+        if self.memory_budget is not None and self._bytes > self.memory_budget:
+            self.spill()
+
+    def spill(self) -> None:
+        """Write every frame held in memory to disk, one file per table."""
+        for table, frames in self._frames.items():
+            texts = [as_text(frame) for frame in frames if len(frame.columns)]
+            if not texts:
+                continue
+            columns = self._columns.setdefault(table, [])
+            for text in texts:
+                columns.extend(c for c in text.column_names if c not in columns)
+            schema = pa.schema([(col, SPILL_TYPE) for col in columns])
+            path = self.directory / f"{table}-{self._spills:05d}.arrow"
+            with ipc.new_file(path, schema) as writer:
+                for text in texts:
+                    writer.write_table(_widen(text, columns))
+            self._spilled.setdefault(table, []).append(path)
+        logger.info("Spilled %d bytes of scraped data to disk", self._bytes)
+        self._frames = {}
+        self._bytes = 0
+        self._spills += 1
+
+    def frames(self, table: str) -> Iterator[pd.DataFrame]:
+        """The table's frames in insertion order, one at a time.
+
+        Frames that were spilled together come back as one frame, as text.
+        """
+        for path in self._spilled.get(table, []):
+            yield _read(path).to_pandas(types_mapper=_TYPES)
+        yield from self._frames.get(table, [])
+
+    def concat(self, table: str) -> pd.DataFrame:
+        """All frames of a table as one frame, like `pd.concat` of them.
+
+        With a budget, the frames still held are spilled first and the
+        result is text backed by the spill files (see the module
+        docstring), whether or not the budget was ever exceeded.
+        """
+        if self.memory_budget is None:
+            return pd.concat(self._frames.get(table, []), ignore_index=True)
+        if self._frames:
+            self.spill()
+        columns = self._columns.get(table, [])
+        tables = [_widen(_read(path), columns) for path in self._spilled.get(table, [])]
+        if not tables:
+            return pd.DataFrame(columns=columns)
+        return pa.concat_tables(tables).to_pandas(types_mapper=_TYPES)
+
+    def close(self) -> None:
+        if self._tmp is not None:
+            self._tmp.cleanup()
+            self._tmp = None
+
+    def __enter__(self) -> "SpillBuffer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
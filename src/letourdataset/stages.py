@@ -0,0 +1,82 @@
+"""Compact integer keys for stage numbers.
+
+Stages are numbered 1, 2, 3, ... with a prologue as stage 0, but early
+editions ran some stages in several parts that the source prints as 13.1,
+13.2, ... Keeping those as a mixed int/float column forces object dtype on
+the hottest key of every table, so internally a stage is identified by one
+sortable integer instead:
+
+    key = stage * STAGE_KEY_SCALE + part
+
+i.e. 13 -> 130, 13.1 -> 131, 13.2 -> 132 and the prologue 0 -> 0. Keys sort
+in race order and fit a plain integer column. The CSVs keep the familiar
+rendering ('13', '13.1'); `format_stage_key` turns a key back into it.
+"""
+
+import pandas as pd
+
+# No edition split a stage into more than three parts, so one decimal digit
+# is plenty for the part number.
+STAGE_KEY_SCALE = 10
+
+
+def stage_key(stage: int, part: int = 0) -> int:
+    """The key of part `part` of stage `stage` (0 for an undivided stage)."""
+    if not 0 <= part < STAGE_KEY_SCALE:
+        raise ValueError(f"Stage part must be in [0, {STAGE_KEY_SCALE}), got {part}.")
+    return stage * STAGE_KEY_SCALE + part
+
+
+def parse_stage_key(value: object) -> int | None:
+    """Key of a stage number as found in the data (1, 13.1, '13.2', 1.0).
+
+    Returns None for missing or non-numeric values.
+    """
+    if value is None:
+        return None
+    try:
+        number = float(str(value).strip())
+    except ValueError:
+        return None
+    if pd.isna(number):
+        return None
+    return round(number * STAGE_KEY_SCALE)
+
+
+def split_stage_key(key: int) -> tuple[int, int]:
+    """The (stage, part) pair a key encodes."""
+    return divmod(int(key), STAGE_KEY_SCALE)
+
+
+def stage_number(key: int) -> int | float:
+    """The stage number as the source prints it: 13 for 130, 13.1 for 131."""
+    stage, part = split_stage_key(key)
+    if part == 0:
+        return stage
+    return float(f"{stage}.{part}")
+
+
+def format_stage_key(key: int) -> str:
+    """CSV/URL rendering of a key: '13' for 130, '13.1' for 131."""
+    stage, part = split_stage_key(key)
+    return str(stage) if part == 0 else f"{stage}.{part}"
+
+
+def stage_keys(values: pd.Series) -> pd.Series:
+    """Vectorised `parse_stage_key`: an Int64 series, <NA> where unparseable."""
+    numeric = pd.to_numeric(values, errors="coerce")
+    return (numeric * STAGE_KEY_SCALE).round().astype("Int64")
+
+
+def format_stage_keys(keys: pd.Series) -> pd.Series:
+    """Vectorised `format_stage_key`; missing keys stay missing."""
+    keys = keys.astype("Int64")
+    present = keys.notna()
+    valid = keys[present].astype("int64")
+    stage, part = valid // STAGE_KEY_SCALE, valid % STAGE_KEY_SCALE
+    rendered = stage.astype(str).where(
+        part == 0, stage.astype(str) + "." + part.astype(str)
+    )
+    out = pd.Series(None, index=keys.index, dtype=object)
+    out[present] = rendered.to_numpy(dtype=object)
+    return out
@@ -0,0 +1,221 @@
+"""General classification after every stage, from the stage results.
+
+The source only publishes the final GC, not the standings after each
+stage. They follow from the all-rankings table: a rider's GC time after a
+stage is the sum of their `Individual (Stage)` times so far, minus their
+time bonuses (`B`) and plus their time penalties (`P`).
+`general_classification` computes that for every stage of every edition
+in one pass:
+
+1. keep each rider's stage results, with the stage's position in its
+   edition (0 for the first stage, prologue included);
+2. sort by (Year, Rider, stage) and take the cumulative sum of the net
+   stage times per (Year, Rider);
+3. a rider is in the standings after a stage only while they have a result
+   on every stage so far: missing from a stage's ranking, or ranked
+   'DNF'/'DNS'/..., means they abandoned;
+4. rank each stage's riders by their cumulative time.
+
+Editions not decided on time (see `ResultType`) have no standings.
+`write_standings` saves them per race to `data/standings/<race>.csv`.
+"""
+
+import logging
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from letourdataset.cache import load
+from letourdataset.schema import ALL_RANKINGS, RACE_LAYOUT, table_path
+from letourdataset.stages import format_stage_keys, stage_keys
+
+logger = logging.getLogger(__name__)
+
+# Below the data root, next to men/ and women/
+STANDINGS_DIR = "standings"
+
+# The all-rankings classification holding each stage's times
+STAGE_RANKING = "Individual (Stage)"
+STANDINGS_COLUMNS = [
+    "Year",
+    "Stages",
+    "Rank",
+    "Rider",
+    "Team",
+    "Times",
+    "Gap",
+    "TotalSeconds",
+    "GapSeconds",
+    "BonusSeconds",
+    "PenaltySeconds",
+]
+
+# "94h 33' 14''", "00' 20''" (a penalty), "16'" (a bonus: seconds)
+_DURATION = r"^\s*(?:(\d+)h)?\s*(?:(\d+)')?\s*(?:(\d+)'')?\s*$"
+
+
+def duration_seconds(values: pd.Series) -> pd.Series:
+    """Seconds of durations as the source prints them; <NA> if unparseable.
+
+    A bare "16'" is 16 seconds: bonuses are printed that way, while times
+    and penalties always print their seconds ("01' 00''").
+    """
+    # Few distinct values repeat a lot (bonuses, group times): parse each once
+    codes, uniques = pd.factorize(values)
+    parts = pd.Series(uniques, dtype="string").str.extract(_DURATION).astype("Int64")
+    hours, minutes, seconds = parts[0], parts[1], parts[2]
+    bare = hours.isna() & seconds.isna()
+    total = hours.fillna(0) * 3600 + minutes.fillna(0) * 60 + seconds.fillna(0)
+    total = total.where(~bare, minutes).where(parts.notna().any(axis=1))
+    parsed = pd.array(total, dtype="Int64").take(codes, allow_fill=True)
+    return pd.Series(parsed, index=values.index)
+
+
+def format_times(seconds: pd.Series) -> pd.Series:
+    """Render seconds as the source prints times: 340394 -> "94h 33' 14''"."""
+    values = seconds.astype("int64").to_numpy()
+    hours, minutes, rest = (
+        pc.utf8_lpad(pc.cast(pa.array(part), pa.string()), 2, "0")
+        for part in (values // 3600, values % 3600 // 60, values % 60)
+    )
+    text = pc.binary_join_element_wise(hours, "h ", minutes, "' ", rest, "''", "")
+    return text.to_pandas().set_axis(seconds.index)
+
+
+def format_gaps(seconds: pd.Series) -> pd.Series:
+    """Render gaps as the source prints them: "-" for none, else "+ ..."."""
+    return ("+ " + format_times(seconds)).where(seconds != 0, "-")
+
+
+def _per_value(
+    values: pd.Series, convert: Callable[[pd.Series], pd.Series]
+) -> np.ndarray:
+    """`convert` applied to each distinct value only, as floats (NaN: missing)."""
+    codes, uniques = pd.factorize(values)
+    converted = (
+        convert(pd.Series(uniques))
+        .astype("Float64")
+        .to_numpy(dtype=float, na_value=np.nan)
+    )
+    return np.where(codes >= 0, converted[codes], np.nan)
+
+
+def _stage_results(all_rankings: pd.DataFrame) -> pd.DataFrame:
+    """Each rider's result on each stage, with the stage's position.
+
+    Riders are integer codes and `row` the position of the result in
+    `all_rankings`, so the passes below sort and group integers only.
+    """
+    # Whole columns are converted (their distinct values, mostly) and only
+    # then filtered: filtering the string columns first costs more
+    is_stage = all_rankings["Ranking type"] == STAGE_RANKING
+    if "ResultType" in all_rankings:
+        is_stage &= all_rankings["ResultType"].fillna("time") == "time"
+    rows = np.flatnonzero(is_stage.to_numpy())
+    riders, _ = pd.factorize(all_rankings["Rider"])
+    ranks = _per_value(
+        all_rankings["Rank"], lambda labels: pd.to_numeric(labels, errors="coerce")
+    )
+    df = pd.DataFrame(
+        {
+            "row": rows,
+            "Year": _per_value(all_rankings["Year"], lambda years: years)[rows],
+            "stage_key": _per_value(all_rankings["Stages"], stage_keys)[rows],
+            "rider": riders[rows],
+            "stage_rank": ranks[rows],
+        }
+    )
+    # A parse failure leaves TotalSeconds at 0; read Times instead
+    seconds = all_rankings["TotalSeconds"].astype("Int64")
+    if "Times" in all_rankings:
+        seconds = seconds.where(seconds > 0, duration_seconds(all_rankings["Times"]))
+    df["seconds"] = seconds.to_numpy()[rows]
+    for column, target in (("B", "bonus"), ("P", "penalty")):
+        if column in all_rankings:
+            values = duration_seconds(all_rankings[column]).fillna(0)
+            df[target] = values.to_numpy()[rows]
+        else:
+            df[target] = 0
+    finished = (
+        df["stage_rank"].notna()
+        & (df["seconds"] > 0)
+        & (df["rider"] >= 0)
+        & df["Year"].notna()
+        & df["stage_key"].notna()
+    )
+
+    # A stage's position in its edition, over every stage with a ranking
+    stages = (
+        df.loc[df["Year"].notna() & df["stage_key"].notna(), ["Year", "stage_key"]]
+        .drop_duplicates()
+        .sort_values(["Year", "stage_key"])
+    )
+    stages["stage_index"] = stages.groupby("Year").cumcount()
+    df = df[finished].drop_duplicates(["Year", "stage_key", "rider"])
+    return df.merge(stages, on=["Year", "stage_key"], how="left")
+
+
+def general_classification(all_rankings: pd.DataFrame) -> pd.DataFrame:
+    """The GC after every stage of every edition (`STANDINGS_COLUMNS`).
+
+    Rows are sorted by year, stage and rank. Riders level on time are
+    ranked by their placing on the stage.
+    """
+    df = _stage_results(all_rankings)
+    df = df.sort_values(["Year", "rider", "stage_key"], kind="stable")
+    riders = df.groupby(["Year", "rider"], sort=False)
+    df["BonusSeconds"] = riders["bonus"].cumsum()
+    df["PenaltySeconds"] = riders["penalty"].cumsum()
+    df["TotalSeconds"] = riders["seconds"].cumsum()
+    df["TotalSeconds"] += df["PenaltySeconds"] - df["BonusSeconds"]
+    # Sorted by stage, a rider's n-th result is on the edition's n-th stage
+    # only if they finished every stage before it
+    df = df[riders.cumcount() == df["stage_index"]]
+
+    df = df.sort_values(
+        ["Year", "stage_key", "TotalSeconds", "stage_rank"], kind="stable"
+    )
+    stages = df.groupby(["Year", "stage_key"], sort=False)
+    df["Rank"] = stages.cumcount() + 1
+    df["GapSeconds"] = df["TotalSeconds"] - stages["TotalSeconds"].transform("first")
+    df["Stages"] = format_stage_keys(df["stage_key"])
+    df["Times"] = format_times(df["TotalSeconds"])
+    df["Gap"] = format_gaps(df["GapSeconds"])
+    source = all_rankings.iloc[df["row"].to_numpy()]
+    df["Rider"] = source["Rider"].to_numpy()
+    df["Team"] = source["Team"].to_numpy()
+
+    standings = df[STANDINGS_COLUMNS].reset_index(drop=True)
+    integers = ["Year", "Rank", "TotalSeconds", "GapSeconds"]
+    integers += ["BonusSeconds", "PenaltySeconds"]
+    return standings.astype({column: "Int64" for column in integers})
+
+
+def write_standings(
+    data_root: str | Path = "data", directory: str | Path | None = None
+) -> Path:
+    """Write the standings of every race with an all-rankings file.
+
+    Returns the directory, `<data_root>/standings` by default.
+    """
+    directory = Path(directory) if directory else Path(data_root) / STANDINGS_DIR
+    for race in RACE_LAYOUT:
+        if not table_path(data_root, race, ALL_RANKINGS).exists():
+            logger.warning("No all-rankings file for %s", race)
+            continue
+        standings = general_classification(
+            load(race, ALL_RANKINGS, data_root=data_root)
+        )
+        directory.mkdir(parents=True, exist_ok=True)
+        standings.to_csv(directory / f"{race}.csv", index=False)
+        logger.info(
+            "✅ Wrote %d standings of %d editions for %s",
+            len(standings),
+            standings["Year"].nunique(),
+            race,
+        )
+    return directory
@@ -0,0 +1,276 @@
+"""Normalised (star schema) copy of the riders and all-rankings tables.
+
+The riders and all-rankings tables repeat the same few strings on every
+row: a rider's name and team on each of their results, the ranking type
+and result type, an edition's distance and number of stages. This export
+stores each distinct value once, in a dimension, and each row as integer
+keys into the dimensions, in a fact table per race and table:
+
+    <root>/riders.parquet          rider_key, race, Rider, rider_id
+    <root>/teams.parquet           team_key, Team
+    <root>/editions.parquet        edition_key, race, Year, Distance (km), ...
+    <root>/ranking_types.parquet   ranking_type_key, Ranking type
+    <root>/checkpoints.parquet     checkpoint_key, Checkpoint
+    <root>/result_types.parquet    result_type_key, ResultType
+    <root>/<race>/<table>.parquet  edition_key, rider_key, ..., stage_key,
+                                   and the table's remaining columns
+
+A key is its row's position in the dimension, -1 when the value is
+missing. `rider_id` is the rider's stable ID (see
+`letourdataset.identity`). The fact table's other columns (times, gaps,
+bonuses) are left as they are; Parquet dictionary-encodes them.
+
+`read_fact` returns a fact table as stored, for consumers that join on the
+keys themselves; `read_star` joins it back to its dimensions and returns
+the same frame as `cache.load`, column for column.
+"""
+
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from letourdataset.cache import load_file
+from letourdataset.dataset import MISSING_KEY
+from letourdataset.identity import load_tables, read_aliases, resolve, rider_ids
+from letourdataset.parquet import to_arrow
+from letourdataset.schema import (
+    ALL_RANKINGS,
+    RACE_LAYOUT,
+    RIDERS,
+    table_path,
+    to_frame,
+)
+from letourdataset.stages import format_stage_keys, stage_keys
+
+logger = logging.getLogger(__name__)
+
+# Below the data root, next to men/ and women/
+STAR_DIR = "star"
+# The normalised tables; the stages table is small and stays as it is
+FACT_TABLES = (RIDERS, ALL_RANKINGS)
+# name -> (key column, columns), per dimension
+DIMENSIONS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "riders": ("rider_key", ("race", "Rider")),
+    "teams": ("team_key", ("Team",)),
+    "editions": (
+        "edition_key",
+        ("race", "Year", "Distance (km)", "Number of stages"),
+    ),
+    "ranking_types": ("ranking_type_key", ("Ranking type",)),
+    "checkpoints": ("checkpoint_key", ("Checkpoint",)),
+    "result_types": ("result_type_key", ("ResultType",)),
+}
+STAGE_KEY_COLUMN = "stage_key"
+# Fact schema metadata key holding the table's column order
+COLUMNS_KEY = b"letourdataset.columns"
+
+
+def fact_path(root: str | Path, race: str, table: str) -> Path:
+    return Path(root) / race / f"{table}.parquet"
+
+
+def dimension_path(root: str | Path, name: str) -> Path:
+    return Path(root) / f"{name}.parquet"
+
+
+def _dimension_values(
+    df: pd.DataFrame, race: str, columns: tuple[str, ...]
+) -> pd.DataFrame | None:
+    """A dimension's columns of a table, or None when it has none of them."""
+    present = [column for column in columns if column != "race" and column in df]
+    if not present:
+        return None
+    values = pd.DataFrame(
+        {
+            column: df[column] if column in df else pd.NA
+            for column in columns
+            if column != "race"
+        },
+        index=df.index,
+    )
+    if "race" in columns:
+        values.insert(0, "race", race)
+    return values
+
+
+def _encode(
+    frames: dict[tuple[str, str], pd.DataFrame], columns: tuple[str, ...]
+) -> tuple[pd.DataFrame, dict[tuple[str, str], np.ndarray]]:
+    """The dimension of `columns` over all frames, and each frame's keys.
+
+    `frames` maps (race, table) to a frame; frames without any of the
+    dimension's columns get no keys.
+    """
+    parts = {}
+    for (race, table), df in frames.items():
+        values = _dimension_values(df, race, columns)
+        if values is not None:
+            parts[(race, table)] = values
+    if not parts:
+        return pd.DataFrame(columns=list(columns)), {}
+
+    combined = pd.concat(parts.values(), ignore_index=True)
+    attributes = [column for column in columns if column != "race"]
+    present = combined[attributes].notna().any(axis=1).to_numpy()
+    grouped = combined[present].groupby(list(columns), dropna=False, sort=True)
+    codes = np.full(len(combined), MISSING_KEY, dtype=np.int32)
+    codes[present] = grouped.ngroup().to_numpy()
+    dimension = grouped.size().reset_index()[list(columns)]
+
+    keys = {}
+    start = 0
+    for part, values in parts.items():
+        keys[part] = codes[start : start + len(values)]
+        start += len(values)
+    return dimension, keys
+
+
+def _stage_column(values: pd.Series) -> np.ndarray | None:
+    """Stage keys of a stage column, or None if they'd lose a value."""
+    keys = stage_keys(values)
+    rendered = format_stage_keys(keys)
+    if not (rendered.isna() == values.isna()).all():
+        return None
+    if (rendered.dropna() != values.dropna().astype(str)).any():
+        return None
+    return keys.fillna(MISSING_KEY).to_numpy(dtype=np.int32)
+
+
+def _write_dimension(root: Path, name: str, dimension: pd.DataFrame) -> None:
+    key, _ = DIMENSIONS[name]
+    arrays = {key: pa.array(np.arange(len(dimension), dtype=np.int32))}
+    for column in dimension.columns:
+        values = dimension[column]
+        if column in ("Year", "Distance (km)", "Number of stages"):
+            arrays[column] = pa.array(values.astype("Int64"), type=pa.int64())
+        else:
+            arrays[column] = pa.array(values.astype("string"), type=pa.string())
+    pq.write_table(pa.table(arrays), dimension_path(root, name))
+
+
+def _write_fact(
+    root: Path,
+    race: str,
+    table: str,
+    df: pd.DataFrame,
+    keys: dict[str, np.ndarray],
+) -> None:
+    covered = {
+        column for name in keys for column in DIMENSIONS[name][1] if column != "race"
+    }
+    arrays = {DIMENSIONS[name][0]: pa.array(codes) for name, codes in keys.items()}
+    rest = [column for column in df.columns if column not in covered]
+    if "Stages" in rest:
+        stages = _stage_column(df["Stages"])
+        if stages is not None:
+            arrays[STAGE_KEY_COLUMN] = pa.array(stages)
+            rest.remove("Stages")
+    measures = to_arrow(df[rest], table)
+    for column in measures.column_names:
+        arrays[column] = measures.column(column)
+
+    fact = pa.table(arrays).replace_schema_metadata(
+        {COLUMNS_KEY: json.dumps(list(df.columns)).encode()}
+    )
+    path = fact_path(root, race, table)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(fact, path)
+
+
+def export_star(data_root: str | Path, root: str | Path | None = None) -> Path:
+    """Write the normalised copy of the riders and all-rankings tables.
+
+    Returns its directory, `<data_root>/star` by default.
+    """
+    root = Path(root) if root is not None else Path(data_root) / STAR_DIR
+    frames: dict[tuple[str, str], pd.DataFrame] = {}
+    for race in RACE_LAYOUT:
+        for table in FACT_TABLES:
+            path = table_path(data_root, race, table)
+            if path.exists():
+                frames[(race, table)] = load_file(path, table)
+    root.mkdir(parents=True, exist_ok=True)
+
+    _, aliases = resolve(load_tables(data_root), read_aliases(data_root))
+    fact_keys: dict[tuple[str, str], dict[str, np.ndarray]] = {
+        part: {} for part in frames
+    }
+    for name, (_, columns) in DIMENSIONS.items():
+        dimension, keys = _encode(frames, columns)
+        if name == "riders":
+            dimension["rider_id"] = pd.Series(pd.NA, index=dimension.index)
+            for race, group in dimension.groupby("race", sort=False):
+                dimension.loc[group.index, "rider_id"] = rider_ids(
+                    group["Rider"], aliases, race
+                )
+        _write_dimension(root, name, dimension)
+        for part, codes in keys.items():
+            fact_keys[part][name] = codes
+
+    for (race, table), df in frames.items():
+        _write_fact(root, race, table, df, fact_keys[(race, table)])
+        logger.info("✅ Wrote %s/%s/%s", root.name, race, table)
+    return root
+
+
+def read_dimension(root: str | Path, name: str) -> pd.DataFrame:
+    """One dimension table, indexed by its key."""
+    key, _ = DIMENSIONS[name]
+    return to_frame(pq.read_table(dimension_path(root, name))).set_index(key)
+
+
+def _take(column: pa.ChunkedArray, keys: pa.ChunkedArray) -> pa.ChunkedArray:
+    # A missing key (-1) becomes a missing value
+    indices = pc.if_else(pc.equal(keys, MISSING_KEY), None, keys)
+    return column.take(indices)
+
+
+def _fact_table(root: str | Path, race: str, table: str) -> pa.Table:
+    path = fact_path(root, race, table)
+    if not path.exists():
+        raise FileNotFoundError(
+            f"No normalised copy of {table} for {race} in {root}. "
+            "Run 'make star' first."
+        )
+    return pq.read_table(path)
+
+
+def read_fact(root: str | Path, race: str, table: str) -> pd.DataFrame:
+    """One race's fact table as stored: dimension keys and measures.
+
+    Raises:
+        FileNotFoundError: If there is no normalised copy of the table.
+    """
+    return to_frame(_fact_table(root, race, table))
+
+
+def read_star(root: str | Path, race: str, table: str) -> pd.DataFrame:
+    """One race's table, rebuilt from its fact table and the dimensions.
+
+    Raises:
+        FileNotFoundError: If there is no normalised copy of the table.
+    """
+    fact = _fact_table(root, race, table)
+    columns: dict[str, pa.ChunkedArray] = {}
+    for name, (key, attributes) in DIMENSIONS.items():
+        if key not in fact.column_names:
+            continue
+        dimension = pq.read_table(dimension_path(root, name))
+        for column in attributes:
+            if column != "race":
+                columns[column] = _take(dimension.column(column), fact.column(key))
+    if STAGE_KEY_COLUMN in fact.column_names:
+        keys = fact.column(STAGE_KEY_COLUMN).to_pandas()
+        stages = format_stage_keys(keys.where(keys != MISSING_KEY))
+        columns["Stages"] = pa.chunked_array([pa.array(stages, type=pa.string())])
+    for column in fact.column_names:
+        columns.setdefault(column, fact.column(column))
+
+    order = json.loads(fact.schema.metadata[COLUMNS_KEY])
+    return to_frame(pa.table({column: columns[column] for column in order}))
@@ -0,0 +1,258 @@
+"""Invariants of the data tables, checked over all editions at once.
+
+Each check is a handful of vectorised pandas operations over a whole
+table, so the complete men's history validates in a fraction of a second.
+Violations come back as one DataFrame (`VIOLATION_COLUMNS`), one row per
+offending row or edition:
+
+    report = validate("data", MEN)
+    report[report["severity"] == ERROR]
+
+Errors are structural problems a scrape or an edit can introduce (an
+edition missing from a table, a stage count that disagrees with the
+riders). Warnings flag values that look wrong but that the source site
+really publishes: skipped ranks and inconsistent gaps in early editions,
+shared stage wins listed twice. The men's history has about a hundred of
+those, so `make validate` fails on errors only; `make update` additionally
+holds the newest edition to the warnings.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from letourdataset.cache import load_file
+from letourdataset.schema import ALL_RANKINGS, RIDERS, STAGES, table_path
+from letourdataset.stages import stage_keys
+
+ERROR = "error"
+WARNING = "warning"
+
+# `row` is the row's position in its file (0 = first data row), missing
+# for violations that concern a whole edition.
+VIOLATION_COLUMNS = ["table", "check", "severity", "Year", "row", "detail"]
+
+
+def _violations(
+    table: str,
+    check: str,
+    severity: str,
+    years: pd.Series,
+    details: pd.Series | str,
+    rows: pd.Series | None = None,
+) -> pd.DataFrame:
+    frame = pd.DataFrame(
+        {
+            "table": table,
+            "check": check,
+            "severity": severity,
+            "Year": years.to_numpy(),
+            "row": rows.to_numpy() if rows is not None else pd.NA,
+            "detail": details.to_numpy() if isinstance(details, pd.Series) else details,
+        },
+        columns=VIOLATION_COLUMNS,
+    )
+    return frame.astype({"Year": "Int64", "row": "Int64"})
+
+
+def _concat(parts: list[pd.DataFrame]) -> pd.DataFrame:
+    parts = [part for part in parts if not part.empty]
+    if not parts:
+        return pd.DataFrame(columns=VIOLATION_COLUMNS).astype(
+            {"Year": "Int64", "row": "Int64"}
+        )
+    return pd.concat(parts, ignore_index=True)
+
+
+def check_riders(riders: pd.DataFrame) -> pd.DataFrame:
+    """Final-GC invariants of a riders table (typed as by `read_table_csv`).
+
+    - ranks of each edition run 1, 2, ..., n
+    - in time editions, `GapSeconds` is `TotalSeconds` minus the winning
+      time (the first rider's `TotalSeconds` less their `GapSeconds`) and
+      times never decrease down the ranking
+    - `Number of stages` is the same for every rider of an edition
+    """
+    parts: list[pd.DataFrame] = []
+    df = riders.reset_index(drop=True).rename_axis("row").reset_index()
+    ranked = df.dropna(subset=["Year", "Rank"]).sort_values(
+        ["Year", "Rank"], kind="stable"
+    )
+
+    expected = ranked.groupby("Year").cumcount() + 1
+    gaps = ranked[ranked["Rank"] != expected]
+    # Only the first break per edition: the ranks after it all shift
+    first = gaps.drop_duplicates("Year")
+    parts.append(
+        _violations(
+            RIDERS,
+            "contiguous_ranks",
+            WARNING,
+            first["Year"],
+            "rank "
+            + first["Rank"].astype(str)
+            + " where "
+            + expected[first.index].astype(str)
+            + " was expected",
+            first["row"],
+        )
+    )
+
+    timed = ranked[ranked["ResultType"] == "time"]
+    # Not the first rider's time: the editions stripped of their winner
+    # (1999-2005) have no rank 1, and their gaps are to the vacated time
+    first_rider = timed.drop_duplicates("Year").set_index("Year")
+    winning = first_rider["TotalSeconds"] - first_rider["GapSeconds"].fillna(0)
+    expected_gap = timed["TotalSeconds"] - timed["Year"].map(winning)
+    wrong_gap = timed[(timed["GapSeconds"] != expected_gap).fillna(False)]
+    parts.append(
+        _violations(
+            RIDERS,
+            "gap_seconds",
+            WARNING,
+            wrong_gap["Year"],
+            "GapSeconds "
+            + wrong_gap["GapSeconds"].astype(str)
+            + ", expected "
+            + expected_gap[wrong_gap.index].astype(str),
+            wrong_gap["row"],
+        )
+    )
+
+    previous = timed.groupby("Year")["TotalSeconds"].shift()
+    faster = timed[(timed["TotalSeconds"] < previous).fillna(False)]
+    parts.append(
+        _violations(
+            RIDERS,
+            "monotonic_times",
+            WARNING,
+            faster["Year"],
+            "TotalSeconds "
+            + faster["TotalSeconds"].astype(str)
+            + " below the previous rank's "
+            + previous[faster.index].astype(str),
+            faster["row"],
+        )
+    )
+
+    counts = df.groupby("Year")["Number of stages"].nunique()
+    inconsistent = counts[counts > 1]
+    parts.append(
+        _violations(
+            RIDERS,
+            "number_of_stages",
+            ERROR,
+            inconsistent.index.to_series(),
+            "riders disagree on the number of stages",
+        )
+    )
+    return _concat(parts)
+
+
+def check_stages(stages: pd.DataFrame, riders: pd.DataFrame) -> pd.DataFrame:
+    """Invariants of a stages table, against the race's riders table.
+
+    - no stage appears twice in an edition (the source does list shared
+      wins and transfers that way, hence only a warning)
+    - every edition has as many stages as its riders' `Number of stages`
+    - both tables cover the same editions
+    """
+    parts: list[pd.DataFrame] = []
+    df = stages.reset_index(drop=True).rename_axis("row").reset_index()
+    df["__stage_key"] = stage_keys(df["Stages"])
+
+    duplicated = df[df.duplicated(["Year", "__stage_key"], keep="first")]
+    parts.append(
+        _violations(
+            STAGES,
+            "duplicate_stage",
+            WARNING,
+            duplicated["Year"],
+            "stage " + duplicated["Stages"].astype(str) + " appears more than once",
+            duplicated["row"],
+        )
+    )
+
+    counts = df.groupby("Year").size().rename("stages")
+    declared = riders.groupby("Year")["Number of stages"].max().rename("declared")
+    joined = pd.concat([counts, declared], axis=1)
+    missing = joined[joined["stages"].isna() | joined["declared"].isna()]
+    parts.append(
+        _violations(
+            STAGES,
+            "missing_edition",
+            ERROR,
+            missing.index.to_series(),
+            missing["stages"]
+            .isna()
+            .map({True: "edition has no stages", False: "edition has no riders"}),
+        )
+    )
+    both = joined.dropna()
+    mismatch = both[both["stages"] != both["declared"]]
+    parts.append(
+        _violations(
+            STAGES,
+            "stage_count",
+            ERROR,
+            mismatch.index.to_series(),
+            mismatch["stages"].astype(int).astype(str)
+            + " stages, riders say "
+            + mismatch["declared"].astype(int).astype(str),
+        )
+    )
+    return _concat(parts)
+
+
+def check_all_rankings(all_rankings: pd.DataFrame) -> pd.DataFrame:
+    """Invariants of an all-rankings table.
+
+    - no numeric rank appears twice in a classification of a stage, i.e.
+      (Year, Stages, Ranking type, Rank) is a key; dead heats would break
+      this, so it is a warning
+    """
+    df = all_rankings.reset_index(drop=True).rename_axis("row").reset_index()
+    # Ranks are text here; non-numeric ones (e.g. 'DNF') may repeat
+    df["__rank"] = pd.to_numeric(df["Rank"], errors="coerce")
+    df["__stage_key"] = stage_keys(df["Stages"])
+    key = ["Year", "__stage_key", "Ranking type", "__rank"]
+    duplicated = df[df["__rank"].notna() & df.duplicated(key, keep="first")]
+    return _concat(
+        [
+            _violations(
+                ALL_RANKINGS,
+                "duplicate_rank",
+                WARNING,
+                duplicated["Year"],
+                "rank "
+                + duplicated["Rank"].astype(str)
+                + " twice in stage "
+                + duplicated["Stages"].astype(str)
+                + " "
+                + duplicated["Ranking type"].astype(str),
+                duplicated["row"],
+            )
+        ]
+    )
+
+
+def validate(data_root: str | Path, race: str) -> pd.DataFrame:
+    """Check every table of a race that exists below `data_root`."""
+    riders_path = table_path(data_root, race, RIDERS)
+    if not riders_path.exists():
+        raise FileNotFoundError(
+            f"Missing riders history file: {riders_path}. Run 'make update' first."
+        )
+    riders = load_file(riders_path, RIDERS)
+    parts = [check_riders(riders)]
+
+    stages_path = table_path(data_root, race, STAGES)
+    if stages_path.exists():
+        parts.append(check_stages(load_file(stages_path, STAGES), riders))
+
+    all_rankings_path = table_path(data_root, race, ALL_RANKINGS)
+    if all_rankings_path.exists():
+        columns = ["Rank", "Stages", "Ranking type", "Year"]
+        all_rankings = load_file(all_rankings_path, ALL_RANKINGS, columns)
+        parts.append(check_all_rankings(all_rankings))
+    return _concat(parts)
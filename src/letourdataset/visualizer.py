@@ -1,6 +1,7 @@
-import matplotlib.pyplot as plt
 import pandas as pd
 
+from letourdataset.editions import edition_statistics
+
 DISTANCE_COLOR = "tab:blue"
 PACE_COLOR = "tab:red"
 MARGIN_COLOR = "tab:red"
@@ -31,31 +32,26 @@ def _format_margin_short(gap_seconds: int) -> str:
     return f"{minutes}'{seconds:02d}''"
 
 
+def _editions(df: pd.DataFrame) -> pd.DataFrame:
+    """Edition statistics by year, computed first from a riders table."""
+    if "WinnerPace" not in df:
+        df = edition_statistics(df)
+    return df.set_index("Year").sort_index()
+
+
 class Visualizer:
     def plot(self, df: pd.DataFrame, saveas: str, title: str | None = None) -> None:
         """Plot the total distance and the winner's average pace per year.
 
         Args:
-            df: A riders-history dataframe (one row per rider and year).
+            df: A riders-history dataframe (one row per rider and year), or
+                its edition statistics (see `letourdataset.editions`).
             saveas: Path of the PNG file to write.
             title: Plot title; derived from the year range if omitted.
         """
-        data = df.copy()
-        data["Rank"] = pd.to_numeric(data["Rank"], errors="coerce")
-        # Pace is undefined for editions without recorded times
-        # (ResultType 'points' / 'no-results' have TotalSeconds == 0).
-        data["PersonalAvgPace"] = (
-            data["Distance (km)"] / (data["TotalSeconds"] / 3600)
-        ).mask(data["TotalSeconds"] <= 0)
-
-        distance = data.groupby("Year")["Distance (km)"].mean().sort_index()
-        winners = (
-            data.dropna(subset=["Rank"])
-            .sort_values("Rank", kind="stable")
-            .groupby("Year")
-            .head(1)
-        )
-        winner_pace = winners.set_index("Year")["PersonalAvgPace"].sort_index()
+        editions = _editions(df)
+        distance = editions["Distance (km)"].astype(float)
+        winner_pace = editions["WinnerPace"]
 
         year_min = int(distance.index.min())
         year_max = int(distance.index.max())
@@ -65,6 +61,9 @@ class Visualizer:
         pace_max = float(winner_pace.max()) * 1.4
         distance_max = float(distance.max()) * 1.1
 
+        # pyplot takes half a second to import; only plotting needs it
+        import matplotlib.pyplot as plt
+
         with plt.rc_context({"font.size": 22}):
             fig, ax = plt.subplots(1, 1, figsize=(15, 7))
             ax.scatter(distance.index, distance.to_numpy(), color=DISTANCE_COLOR)
@@ -95,9 +94,7 @@ class Visualizer:
                     )
 
             ax_twinx.set_xlim(year_min - 2, year_max + 2)
-            ax_twinx.set_ylabel(
-                "Winner avg. pace (kph)", fontsize=20, color=PACE_COLOR
-            )
+            ax_twinx.set_ylabel("Winner avg. pace (kph)", fontsize=20, color=PACE_COLOR)
             ax_twinx.set_ylim(0, pace_max)
             ax_twinx.tick_params(axis="y", colors=PACE_COLOR)
 
@@ -116,26 +113,21 @@ class Visualizer:
         """Plot the winner's margin over the runner-up per year (log scale).
 
         Args:
-            df: A riders-history dataframe (one row per rider and year).
+            df: A riders-history dataframe (one row per rider and year), or
+                its edition statistics (see `letourdataset.editions`).
             saveas: Path of the PNG file to write.
             title: Plot title; derived from the year range if omitted.
         """
-        data = df.copy()
-        data["Rank"] = pd.to_numeric(data["Rank"], errors="coerce")
-        runner_up = data[
-            (data["ResultType"] == "time")
-            & (data["Rank"] == 2)
-            & (data["GapSeconds"] > 0)
-        ]
-        margin_minutes = (
-            runner_up.groupby("Year")["GapSeconds"].min().sort_index() / 60.0
-        )
+        margin = _editions(df)["MarginSeconds"].dropna()
+        margin_minutes = margin.astype(float) / 60.0
 
         year_min = int(margin_minutes.index.min())
         year_max = int(margin_minutes.index.max())
         if title is None:
             title = f"Winning margin, {year_min} - {year_max}"
 
+        import matplotlib.pyplot as plt
+
         with plt.rc_context({"font.size": 22}):
             fig, ax = plt.subplots(1, 1, figsize=(15, 7))
             ax.scatter(
@@ -173,8 +165,9 @@ class Visualizer:
                         color="darkgray",
                         fontsize=14,
                     )
-                ax.set_ylim(float(margin_minutes.min()) * 0.4,
-                            float(margin_minutes.max()) * 3)
+                ax.set_ylim(
+                    float(margin_minutes.min()) * 0.4, float(margin_minutes.max()) * 3
+                )
 
             # Call out the closest race on record (only when there is room)
             if year_max - year_min >= 20:
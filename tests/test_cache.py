@@ -0,0 +1,57 @@
+"""Tests for the memory-mapped column cache."""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from letourdataset import load
+from letourdataset.cache import cache_path, load_arrow, load_file
+from letourdataset.metadata import write_metadata
+from letourdataset.schema import MEN, RIDERS, read_table_csv
+
+
+def write_riders(path: Path, riders: list[str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(
+        {
+            "Rank": range(1, len(riders) + 1),
+            "Rider": riders,
+            "Year": 2025,
+        }
+    ).to_csv(path, index=False)
+
+
+def test_first_load_builds_the_cache(tmp_path: Path) -> None:
+    riders = tmp_path / "men" / "TDF_Riders_History.csv"
+    write_riders(riders, ["A", "B"])
+
+    df = load(MEN, RIDERS, data_root=tmp_path)
+    assert cache_path(riders).exists()
+    pd.testing.assert_frame_equal(df, read_table_csv(riders, RIDERS))
+    # The second load is served from the cache, with the same types
+    pd.testing.assert_frame_equal(load(MEN, RIDERS, data_root=tmp_path), df)
+    assert load_file(riders, columns=["Rider"])["Rider"].tolist() == ["A", "B"]
+
+
+def test_changed_csv_rebuilds_the_cache(tmp_path: Path) -> None:
+    riders = tmp_path / "TDF_Riders_History.csv"
+    write_riders(riders, ["A", "B"])
+    write_metadata(riders)
+    assert load_arrow(riders).num_rows == 2
+
+    write_riders(riders, ["A", "B", "C"])
+    assert load_file(riders)["Rider"].tolist() == ["A", "B", "C"]
+
+
+def test_corrupt_cache_is_rebuilt(tmp_path: Path) -> None:
+    riders = tmp_path / "TDF_Riders_History.csv"
+    write_riders(riders, ["A"])
+    load_arrow(riders)
+    cache_path(riders).write_bytes(b"not arrow")
+    assert load_file(riders)["Rider"].tolist() == ["A"]
+
+
+def test_missing_table_raises(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError, match="make update"):
+        load(MEN, RIDERS, data_root=tmp_path)
@@ -1,13 +1,12 @@
 """Tests for the CSV data-protection script's comparison logic."""
 
 import importlib.util
+from io import BytesIO
 from pathlib import Path
 
 import pandas as pd
 
-SCRIPT = (
-    Path(__file__).parent.parent / ".github" / "scripts" / "check_csv_integrity.py"
-)
+SCRIPT = Path(__file__).parent.parent / ".github" / "scripts" / "check_csv_integrity.py"
 spec = importlib.util.spec_from_file_location("check_csv_integrity", SCRIPT)
 assert spec is not None and spec.loader is not None
 integrity = importlib.util.module_from_spec(spec)
@@ -59,3 +58,18 @@ class TestCanonicalRows:
             new, ["x"]
         )
         assert sum(missing.values()) == 1
+
+
+class TestReadCsvFile:
+    def test_text_in_integer_columns_is_compared(self) -> None:
+        old = b"Rank,Rider,Year\n1,A,2024\nDSQ,B,2024\n"
+        new = b"Rank,Rider,Year\n1.0,A,2024\nDNF,B,2024\n"
+        cols = ["Rank", "Rider", "Year"]
+        missing = integrity.canonical_rows(
+            integrity.read_csv_file(BytesIO(old)), cols
+        ) - integrity.canonical_rows(integrity.read_csv_file(BytesIO(new)), cols)
+        assert list(missing) == [("DSQ", "B", "2024")]
+
+    def test_missing_cells_are_empty(self) -> None:
+        df = integrity.read_csv_file(BytesIO(b"Rank,Team\n1,\n"))
+        assert integrity.canonical_rows(df, ["Rank", "Team"]) == {("1", ""): 1}
@@ -0,0 +1,80 @@
+"""Tests for the SQLite copy of the data and the query command."""
+
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from letourdataset.cli import main
+from letourdataset.database import export_database
+
+
+def write_race(root: Path, directory: str, prefix: str, year: int) -> None:
+    folder = root / directory
+    folder.mkdir(parents=True)
+    pd.DataFrame(
+        {
+            "Rank": [1, 2],
+            "Rider": ["A", "B"],
+            "Team": ["X", None],
+            "Year": year,
+        }
+    ).to_csv(folder / f"{prefix}_Riders_History.csv", index=False)
+    pd.DataFrame({"Year": year, "Stages": ["13.1", "2"], "Start": ["P", "L"]}).to_csv(
+        folder / f"{prefix}_Stages_History.csv", index=False
+    )
+
+
+@pytest.fixture
+def database(tmp_path: Path) -> Path:
+    write_race(tmp_path, "men", "TDF", 1934)
+    write_race(tmp_path, "women", "TDFF", 2024)
+    return export_database(tmp_path)
+
+
+def test_export_types_both_races_and_indexes(database: Path) -> None:
+    with sqlite3.connect(database) as connection:
+        rows = connection.execute(
+            'SELECT race, "Year", "Rank", "Team" FROM riders ORDER BY race, "Rank"'
+        ).fetchall()
+        stages = connection.execute(
+            'SELECT "Stages", stage_key FROM stages WHERE race = ? ORDER BY stage_key',
+            ("men",),
+        ).fetchall()
+        indexes = {
+            row[0]
+            for row in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+    assert rows == [
+        ("men", 1934, 1, "X"),
+        ("men", 1934, 2, None),
+        ("women", 2024, 1, "X"),
+        ("women", 2024, 2, None),
+    ]
+    # As text, '13.1' would sort before '2'
+    assert stages == [("2", 20), ("13.1", 131)]
+    assert {"riders_year", "riders_rider", "riders_team", "stages_stage"} <= indexes
+    # No all-rankings files, so no rankings table
+    assert "rankings_year" not in indexes
+
+
+def test_query_prints_csv(database: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    sql = "SELECT race, COUNT(*) AS riders FROM riders GROUP BY race ORDER BY race"
+    assert main(["query", sql, "--database", str(database)]) == 0
+    assert capsys.readouterr().out == "race,riders\nmen,2\nwomen,2\n"
+
+
+def test_query_is_read_only(database: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["query", "DELETE FROM riders", "--database", str(database)]) == 1
+    assert "readonly" in capsys.readouterr().err
+
+
+def test_query_without_database(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    missing = tmp_path / "letour.sqlite"
+    assert main(["query", "SELECT 1", "--database", str(missing)]) == 1
+    assert "make sqlite" in capsys.readouterr().err
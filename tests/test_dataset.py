@@ -0,0 +1,62 @@
+"""Tests for the indexed Dataset lookups."""
+
+import pandas as pd
+import pytest
+
+from letourdataset.dataset import Dataset
+
+
+def make_dataset(with_rankings: bool = True) -> Dataset:
+    # Deliberately not in year order, as a hand-edited table might be
+    riders = pd.DataFrame(
+        {
+            "Rank": pd.array([1, 2, 1, 2], dtype="Int64"),
+            "Rider": ["B", "A", "A", "C"],
+            "Team": ["X", "Y", "Y", pd.NA],
+            "Year": pd.array([2025, 2025, 2024, 2024], dtype="Int64"),
+        }
+    )
+    stages = pd.DataFrame(
+        {"Year": pd.array([2024, 2025, 2025], dtype="Int64"), "Stages": ["1", "1", "2"]}
+    )
+    all_rankings = pd.DataFrame(
+        {
+            "Rank": ["1", "2", "1", "1", "1"],
+            "Rider": ["A", "B", "B", "C", "A"],
+            "Stages": ["13.1", "13.1", "13.1", "13", "13.1"],
+            "Ranking type": ["Individual (Stage)"] * 4 + ["Points (Stage)"],
+            "Year": pd.array([1934, 1934, 1935, 1934, 1934], dtype="Int64"),
+        }
+    )
+    return Dataset(riders, stages, all_rankings if with_rankings else None)
+
+
+def test_edition_and_stages_by_year() -> None:
+    ds = make_dataset()
+    assert ds.edition(2025)["Rider"].tolist() == ["B", "A"]
+    assert ds.edition(2023).empty
+    assert ds.editions(2024, 2025)["Year"].tolist() == [2024, 2024, 2025, 2025]
+    assert ds.stages(2025)["Stages"].tolist() == ["1", "2"]
+
+
+def test_stage_lookup_by_stage_number_and_type() -> None:
+    ds = make_dataset()
+    stage = ds.stage(1934, 13.1, "Individual (Stage)")
+    assert stage["Rider"].tolist() == ["A", "B"]
+    assert ds.stage(1934, "13", "Individual (Stage)")["Rider"].tolist() == ["C"]
+    assert ds.stage(1934, 13.1, "Points (Stage)")["Rider"].tolist() == ["A"]
+    assert ds.stage(1934, 13.1, "Team (Stage)").empty
+
+
+def test_stage_needs_the_all_rankings_table() -> None:
+    with pytest.raises(LookupError, match="make update"):
+        make_dataset(with_rankings=False).stage(1934, 1, "Individual (Stage)")
+
+
+def test_rider_team_and_winners() -> None:
+    ds = make_dataset()
+    career = ds.rider_career("A")
+    assert career[["Year", "Rank"]].values.tolist() == [[2024, 1], [2025, 2]]
+    assert ds.rider_career("Nobody").empty
+    assert ds.team("Y")["Rider"].tolist() == ["A", "A"]
+    assert ds.winners()[["Year", "Rider"]].values.tolist() == [[2024, "A"], [2025, "B"]]
@@ -0,0 +1,88 @@
+"""Tests for the per-edition statistics and their cache."""
+
+from pathlib import Path
+
+import pandas as pd
+
+from letourdataset.editions import (
+    EDITION_COLUMNS,
+    EDITIONS_FILE,
+    edition_statistics,
+    load_editions,
+    write_editions,
+)
+
+
+def _riders() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Rank": pd.array([1, 2, 3, 2, 3, 1, 2, None], dtype="Int64"),
+            "Rider": ["A", "B", "C", "D", "E", "F", "G", "H"],
+            "Team": ["T1", "T2", "T1", "T3", "T3", "T4", "T4", "T4"],
+            "Year": [1903, 1903, 1903, 1999, 1999, 1907, 1907, 1907],
+            "Distance (km)": [2428, 2428, 2428, 3870, 3870, 4488, 4488, 4488],
+            "ResultType": ["time"] * 5 + ["points"] * 3,
+            "TotalSeconds": pd.array(
+                [340394, 351155, 560000, 329993, 330162, 0, 0, 0], dtype="Int64"
+            ),
+            # 1903's last gap didn't parse; 1999's winner was disqualified
+            "GapSeconds": pd.array([0, 10761, 0, 457, 626, 0, 0, 0], dtype="Int64"),
+        }
+    )
+
+
+def _stages() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Year": [1903, 1903, 1999, 1999, 1999],
+            "Stages": ["1", "2", "0", "1", "2"],
+            "Yellow Jersey": [None, None, "X", "Y", "Z"],
+            "Green jersey": [None, None, "G", "G", "H"],
+        }
+    )
+
+
+def test_statistics_summarise_each_edition() -> None:
+    editions = edition_statistics(_riders(), _stages()).set_index("Year")
+    assert editions.index.tolist() == [1903, 1907, 1999]
+
+    first = editions.loc[1903]
+    assert (first["Finishers"], first["Winner"], first["WinnerTeam"]) == (3, "A", "T1")
+    assert first["MarginSeconds"] == 10761
+    assert first["LanterneRougeSeconds"] == 560000 - 340394
+    assert round(first["WinnerPace"], 2) == 25.68
+    assert first["StageCount"] == 2
+
+    # No winner, but the winning time and the gaps to it remain
+    vacated = editions.loc[1999]
+    assert pd.isna(vacated["Winner"])
+    assert vacated["WinnerSeconds"] == 329993 - 457
+    # The pace stays the best-placed rider's own
+    assert vacated["WinnerPace"] == 3870 / (329993 / 3600)
+    assert (vacated["MarginSeconds"], vacated["LanterneRougeSeconds"]) == (457, 626)
+    assert (vacated["Yellow Jersey"], vacated["Green jersey"]) == ("Z", "H")
+    assert pd.isna(vacated["White jersey"])
+
+    points = editions.loc[1907]
+    assert points["Finishers"] == 2 and points["Winner"] == "F"
+    assert pd.isna(points["WinnerPace"]) and pd.isna(points["MarginSeconds"])
+    assert pd.isna(points["StageCount"])
+
+
+def test_statistics_are_cached_until_the_data_changes(tmp_path: Path) -> None:
+    men = tmp_path / "men"
+    men.mkdir()
+    _riders().to_csv(men / "TDF_Riders_History.csv", index=False)
+    _stages().to_csv(men / "TDF_Stages_History.csv", index=False)
+
+    editions = load_editions("men", tmp_path)
+    assert editions.columns.tolist() == EDITION_COLUMNS
+    assert (men / ".cache" / EDITIONS_FILE).exists()
+    pd.testing.assert_frame_equal(load_editions("men", tmp_path), editions)
+
+    _riders().iloc[:3].to_csv(men / "TDF_Riders_History.csv", index=False)
+    assert load_editions("men", tmp_path)["Year"].tolist() == [1903, 1999]
+
+    directory = write_editions(tmp_path)
+    assert pd.read_csv(directory / "men.csv")["Year"].tolist() == [1903, 1999]
+    assert not (directory / "women.csv").exists()
@@ -0,0 +1,135 @@
+"""Tests for rider identity resolution across tables and editions."""
+
+from pathlib import Path
+
+import pandas as pd
+
+from letourdataset.identity import resolve, rider_ids, write_identities
+from letourdataset.schema import ALL_RANKINGS, RIDERS, STAGES
+
+
+def _race() -> dict[str, pd.DataFrame]:
+    return {
+        RIDERS: pd.DataFrame(
+            {
+                "Rider": ["LUIS PEREZ", "LUIS PEREZ", "EDDY MERCKX", "AXEL MERCKX"],
+                "Team": ["ONCE", "ONCE", "FAEMA", "MOTOROLA"],
+                "Year": [1992, 1993, 1969, 1998],
+            }
+        ),
+        STAGES: pd.DataFrame(
+            {
+                "Winner of stage": ["Eddy Merckx  (Faema)", "Faema", "Luis Pérez"],
+                "Yellow Jersey": ["Eddy Merckx", "Eddy Merckx", None],
+                "Year": [1969, 1969, 1993],
+            }
+        ),
+        ALL_RANKINGS: pd.DataFrame(
+            {
+                "Rider": ["LUIS PEREZ RODRIGUEZ", "E MERCKX", "L PEREZ", "LEON PEREZ"],
+                "Team": ["ONCE", "FAEMA", "KELME", "BANESTO"],
+                "Year": [1992, 1969, 1993, 1993],
+            }
+        ),
+    }
+
+
+def test_spellings_of_a_rider_share_one_id() -> None:
+    riders, aliases = resolve({"men": _race()})
+    ids = aliases.set_index("name")["rider_id"]
+    assert ids["LUIS PEREZ RODRIGUEZ"] == ids["Luis Pérez"] == "luis-perez-1992"
+    assert ids["Eddy Merckx"] == ids["EDDY MERCKX"] == "eddy-merckx-1969"
+    # Axel Merckx rode 29 years later, so 'E MERCKX' can only be Eddy
+    assert ids["E MERCKX"] == "eddy-merckx-1969"
+    assert ids["AXEL MERCKX"] == "axel-merckx-1998"
+    # 'L PEREZ' could be Luis or Leon, so it stays a rider of its own
+    assert ids["L PEREZ"] == "l-perez-1993"
+    assert ids["LEON PEREZ"] == "leon-perez-1993"
+    # A team time trial's winner is a team
+    assert "Faema" not in ids
+
+    eddy = riders.set_index("rider_id").loc["eddy-merckx-1969"]
+    assert eddy["name"] == "Eddy Merckx"
+    assert (eddy["first_year"], eddy["last_year"], eddy["editions"]) == (1969, 1969, 1)
+    assert riders.set_index("rider_id").loc["luis-perez-1992", "variants"] == 2
+
+
+def test_team_years_block_names_too() -> None:
+    race = _race()
+    race[ALL_RANKINGS] = pd.DataFrame(
+        {
+            "Rider": ["L PEREZ", "PEREZ LEON", "MERCKX EDDY"],
+            "Team": ["ONCE", "BANESTO", "FAEMA"],
+            "Year": [1993, 1993, 1969],
+        }
+    )
+    race[RIDERS] = pd.concat(
+        [
+            race[RIDERS],
+            pd.DataFrame(
+                {"Rider": ["LEON PEREZ"], "Team": ["BANESTO"], "Year": [1993]}
+            ),
+        ]
+    )
+    ids = resolve({"men": race})[1].set_index("name")["rider_id"]
+    # 'L PEREZ' fits Luis and Leon, but rode for Luis's team that year
+    assert ids["L PEREZ"] == "luis-perez-1992"
+    # Teammates of one edition with the same words in another order
+    assert ids["PEREZ LEON"] == ids["LEON PEREZ"] == "leon-perez-1993"
+    # Two blocks away from 'EDDY MERCKX' by surname, one by team-year
+    assert ids["MERCKX EDDY"] == "eddy-merckx-1969"
+
+
+def test_ids_are_stable_and_unique_across_races() -> None:
+    women = {RIDERS: pd.DataFrame({"Rider": ["EDDY MERCKX"], "Year": [1969]})}
+    riders, _ = resolve({"men": _race(), "women": women})
+    assert riders["rider_id"].is_unique
+    assert "eddy-merckx-1969-2" in set(riders["rider_id"])
+
+
+def test_ids_are_kept_when_editions_are_added() -> None:
+    before, aliases = resolve({"men": _race()})
+    # Three more editions as 'LUIS PEREZ RODRIGUEZ' make that spelling canonical
+    later = _race()
+    later[RIDERS] = pd.concat(
+        [
+            later[RIDERS],
+            pd.DataFrame(
+                {"Rider": ["LUIS PEREZ RODRIGUEZ"] * 3, "Year": [1994, 1995, 1996]}
+            ),
+        ]
+    )
+    renamed, _ = resolve({"men": later})
+    assert "luis-perez-rodriguez-1992" in set(renamed["rider_id"])
+
+    after, _ = resolve({"men": later}, aliases)
+    assert set(after["rider_id"]) == set(before["rider_id"])
+    luis = after.set_index("rider_id").loc["luis-perez-1992"]
+    assert (luis["last_year"], luis["editions"]) == (1996, 5)
+
+    # A retired ID isn't given to a new rider
+    retired = aliases.assign(rider_id=aliases["rider_id"] + "-old")
+    retired.loc[retired["name"] == "AXEL MERCKX", "rider_id"] = "eddy-merckx-1969"
+    ids = resolve({"men": _race()}, retired)[1].set_index("name")["rider_id"]
+    assert ids["AXEL MERCKX"] == "eddy-merckx-1969"
+    assert ids["EDDY MERCKX"] == "eddy-merckx-1969-old"
+
+
+def test_identities_are_written_and_looked_up(tmp_path: Path) -> None:
+    men = tmp_path / "men"
+    men.mkdir()
+    _race()[RIDERS].to_csv(men / "TDF_Riders_History.csv", index=False)
+    directory = write_identities(tmp_path)
+    assert directory == tmp_path / "identities"
+
+    aliases = pd.read_csv(directory / "aliases.csv")
+    assert len(pd.read_csv(directory / "riders.csv")) == 3
+    names = pd.Series(["EDDY MERCKX  (Faema)", None, "NOBODY"])
+    assert rider_ids(names, aliases, "men").tolist()[0] == "eddy-merckx-1969"
+    assert rider_ids(names, aliases, "men").isna().tolist() == [False, True, True]
+
+    # Rewriting keeps the IDs already written
+    aliases["rider_id"] = aliases["rider_id"].str.upper()
+    aliases.to_csv(directory / "aliases.csv", index=False)
+    riders = pd.read_csv(write_identities(tmp_path) / "riders.csv")
+    assert "EDDY-MERCKX-1969" in set(riders["rider_id"])
@@ -0,0 +1,63 @@
+"""Tests for the jersey spells and career totals."""
+
+from pathlib import Path
+
+import pandas as pd
+
+from letourdataset.jerseys import jersey_careers, jersey_spells, write_jerseys
+
+
+def _stages() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Year": [1939, 1939, 1939, 1939, 1939, 1940, 1940],
+            # Out of order, as a split stage may be
+            "Stages": ["1", "2.2", "2.1", "3", "4", "1", "2"],
+            "Yellow Jersey": [
+                "René Vietto",
+                "Jean Fontenay  (France)",
+                "RENE VIETTO",
+                "Jean Fontenay",
+                "René Vietto",
+                "René Vietto",
+                None,
+            ],
+            "Green jersey": [None, None, None, "A", "A", "A", "A"],
+        }
+    )
+
+
+def test_spells_are_runs_of_one_wearer_within_an_edition() -> None:
+    spells = jersey_spells(_stages())
+    yellow = spells[spells["Jersey"] == "Yellow Jersey"]
+    assert yellow["Rider"].tolist() == [
+        "René Vietto",
+        "Jean Fontenay",
+        "René Vietto",
+        "René Vietto",
+    ]
+    assert yellow["FirstStage"].tolist() == ["1", "2.2", "4", "1"]
+    assert yellow["LastStage"].tolist() == ["2.1", "3", "4", "1"]
+    assert yellow["Stages"].tolist() == [2, 2, 1, 1]
+    assert yellow["Days"].tolist() == [2, 2, 1, 1]
+
+    # A new edition starts a new spell, even with the same wearer
+    green = spells[spells["Jersey"] == "Green jersey"]
+    assert green["Year"].tolist() == [1939, 1940]
+    assert green["Days"].tolist() == [2, 2]
+
+
+def test_careers_sum_the_spells(tmp_path: Path) -> None:
+    careers = jersey_careers(jersey_spells(_stages()))
+    vietto = careers.iloc[0]
+    assert (vietto["Rider"], vietto["Jersey"]) == ("René Vietto", "Yellow Jersey")
+    assert (vietto["Days"], vietto["Spells"], vietto["Editions"]) == (4, 3, 2)
+    assert vietto["LongestSpell"] == 2
+    assert careers["Jersey"].tolist()[-1] == "Green jersey"
+
+    men = tmp_path / "men"
+    men.mkdir()
+    _stages().to_csv(men / "TDF_Stages_History.csv", index=False)
+    directory = write_jerseys(tmp_path)
+    assert len(pd.read_csv(directory / "men_spells.csv")) == 6
+    assert len(pd.read_csv(directory / "men_careers.csv")) == 3
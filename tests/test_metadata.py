@@ -0,0 +1,120 @@
+"""Tests for the data files' summary sidecars."""
+
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from letourdataset import metadata as metadata_module
+from letourdataset.coverage import race_coverage
+from letourdataset.metadata import (
+    latest_year,
+    read_metadata,
+    read_years,
+    sidecar_path,
+    stat_path,
+    write_metadata,
+)
+
+
+def write_riders(path: Path) -> None:
+    pd.DataFrame(
+        {
+            "Rank": pd.array([1, 2, None, 1], dtype="Int64"),
+            "Rider": ["A", "B", "C", "D"],
+            "Year": [2023, 2023, 2023, 2025],
+            "Number of stages": [21, 21, 21, 9],
+        }
+    ).to_csv(path, index=False)
+
+
+def test_sidecar_summarises_the_file(tmp_path: Path) -> None:
+    riders = tmp_path / "TDF_Riders_History.csv"
+    write_riders(riders)
+    assert write_metadata(riders)
+    assert sidecar_path(riders).name == "TDF_Riders_History.meta.json"
+
+    metadata = read_metadata(riders)
+    assert metadata is not None
+    assert (metadata["first_year"], metadata["latest_year"]) == (2023, 2025)
+    assert metadata["editions"] == 2
+    assert metadata["per_edition"]["2023"] == {
+        "rows": 3,
+        "stages": 21,
+        "finishers": 2,
+        "bytes": [33, 68],
+    }
+    # Current sidecars are left alone
+    assert not write_metadata(riders)
+
+
+def test_sidecar_holds_nothing_machine_specific(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    riders = tmp_path / "TDF_Riders_History.csv"
+    write_riders(riders)
+    write_metadata(riders)
+    assert "size" not in sidecar_path(riders).read_text()
+    assert "mtime_ns" not in sidecar_path(riders).read_text()
+
+    # The stat of the hashed file is kept locally, so an unchanged file
+    # isn't hashed again
+    assert stat_path(riders) == tmp_path / ".cache" / "TDF_Riders_History.stat.json"
+    monkeypatch.setattr(metadata_module, "file_hash", None)
+    assert read_metadata(riders) is not None
+
+
+def test_stale_sidecar_is_ignored(tmp_path: Path) -> None:
+    riders = tmp_path / "TDF_Riders_History.csv"
+    write_riders(riders)
+    write_metadata(riders)
+    with riders.open("a") as f:
+        f.write("1,E,2026,21\n")
+
+    assert read_metadata(riders) is None
+    coverage = race_coverage(riders, "Tour")
+    assert coverage.latest_year == 2026
+
+
+def test_coverage_comes_from_the_sidecar(tmp_path: Path) -> None:
+    riders = tmp_path / "TDF_Riders_History.csv"
+    write_riders(riders)
+    write_metadata(riders)
+    sidecar = sidecar_path(riders)
+    metadata = json.loads(sidecar.read_text())
+    metadata["first_year"] = 1903
+    sidecar.write_text(json.dumps(metadata))
+
+    assert race_coverage(riders, "Tour").first_year == 1903
+
+
+def test_read_years_parses_only_the_indexed_range(tmp_path: Path) -> None:
+    riders = tmp_path / "TDF_Riders_History.csv"
+    write_riders(riders)
+    write_metadata(riders)
+    metadata = read_metadata(riders)
+    assert metadata is not None
+    start, end = metadata["per_edition"]["2025"]["bytes"]
+    assert riders.read_bytes()[start:end] == b"1,D,2025,9\n"
+
+    df = read_years(riders, [2025, 1999], columns=["Rider", "Year"])
+    assert df.to_dict("list") == {"Rider": ["D"], "Year": [2025]}
+    assert str(df["Year"].dtype) == "Int64"
+
+
+def test_read_years_without_a_sidecar_reads_everything(tmp_path: Path) -> None:
+    riders = tmp_path / "TDF_Riders_History.csv"
+    write_riders(riders)
+    assert read_years(riders, [2023])["Rider"].tolist() == ["A", "B", "C"]
+    assert latest_year(riders) == 2025
+
+
+def test_no_byte_ranges_for_multiline_rows(tmp_path: Path) -> None:
+    riders = tmp_path / "TDF_Riders_History.csv"
+    riders.write_text('Rider,Year\n"A\nA",2023\nB,2024\n')
+    write_metadata(riders)
+    metadata = read_metadata(riders)
+    assert metadata is not None
+    assert "bytes" not in metadata["per_edition"]["2023"]
+    assert read_years(riders, [2024])["Rider"].tolist() == ["B"]
@@ -0,0 +1,73 @@
+"""Tests for the year-partitioned Parquet copy of the tables."""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from letourdataset.parquet import export_all, read_table, write_table
+from letourdataset.postprocessor import read_data_csv
+
+
+@pytest.fixture
+def data_root(tmp_path: Path) -> Path:
+    root = tmp_path / "data"
+    (root / "men").mkdir(parents=True)
+    (root / "men" / "TDF_Riders_History.csv").write_text(
+        "Rank,Rider,Rider No.,Team,Year,TotalSeconds\n"
+        "1,MAURICE GARIN,1,TDF 1903 ***,1903,340394\n"
+        "2,LUCIEN POTHIER,,TDF 1903 ***,1903,351155\n"
+        "1,TADEJ POGACAR,1,UAE,2026,266186\n"
+    )
+    (root / "men" / "TDF_Stages_History.csv").write_text(
+        "Year,TotalTDFDistance,Stages,Start,End\n"
+        "1934,4363,13.1,A,B\n1934,4363,13.2,B,C\n2026,3333,0,Barcelona,Barcelona\n"
+    )
+    return root
+
+
+def test_round_trip_is_lossless(data_root: Path) -> None:
+    root = export_all(data_root)
+    for table, name in (
+        ("Riders", "TDF_Riders_History.csv"),
+        ("Stages", "TDF_Stages_History.csv"),
+    ):
+        df = read_table(root, "men", table)
+        expected = read_data_csv(data_root / "men" / name)
+        assert list(df.columns) == list(expected.columns)
+        assert df.to_csv(index=False) == expected.to_csv(index=False)
+
+
+def test_columns_are_typed(data_root: Path) -> None:
+    df = read_table(export_all(data_root), "men", "Riders")
+    assert str(df["Rider No."].dtype) == "Int64"
+    assert df["Rider No."].isna().sum() == 1
+    assert str(df["Year"].dtype) == "Int64"
+    stages = read_table(data_root / "parquet", "men", "Stages")
+    assert stages["Stages"].tolist() == ["13.1", "13.2", "0"]
+
+
+def test_projection_and_year_filter(data_root: Path) -> None:
+    root = export_all(data_root)
+    df = read_table(root, "men", "Riders", columns=["Rider", "Year"], years=[2026])
+    assert list(df.columns) == ["Rider", "Year"]
+    assert df["Rider"].tolist() == ["TADEJ POGACAR"]
+
+
+def test_rewrite_drops_old_editions(tmp_path: Path) -> None:
+    df = pd.DataFrame({"Year": [2025, 2026], "Stages": [1, 1]})
+    write_table(df, tmp_path, "women", "Stages")
+    write_table(df.iloc[1:], tmp_path, "women", "Stages")
+    assert read_table(tmp_path, "women", "Stages")["Year"].tolist() == [2026]
+
+
+def test_non_integer_in_integer_column_is_stored_as_missing(tmp_path: Path) -> None:
+    df = pd.DataFrame({"Rank": ["1", "DSQ"], "Year": [2026, 2026]})
+    write_table(df, tmp_path, "men", "Riders")
+    ranks = read_table(tmp_path, "men", "Riders")["Rank"]
+    assert ranks.isna().tolist() == [False, True]
+
+
+def test_missing_copy_is_an_error(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError, match="make parquet"):
+        read_table(tmp_path, "men", "Riders")
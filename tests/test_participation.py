@@ -0,0 +1,73 @@
+"""Tests for the rider x edition participation bitmap."""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from letourdataset.participation import (
+    PARTICIPATION_FILE,
+    Participation,
+    load_participation,
+)
+
+
+def _riders() -> pd.DataFrame:
+    # Nine editions, so the rows span two bytes
+    years = [1938, 1939, 1947, 1948, 1949, 1950, 1951, 1952, 1953]
+    rows = [("RENÉ VIETTO", year) for year in years[:3]]
+    rows += [("René Vietto", 1948), ("GINO BARTALI", 1938), ("GINO BARTALI", 1948)]
+    rows += [("FAUSTO COPPI", year) for year in (1949, 1951, 1952, 1953)]
+    rows += [("LOUISON BOBET", 1950), ("LOUISON BOBET", 1953)]
+    return pd.DataFrame(rows, columns=["Rider", "Year"])
+
+
+def test_set_queries_are_bitwise() -> None:
+    participation = Participation.build(_riders())
+    assert len(participation) == 4
+    assert participation.bits.shape == (4, 2)
+
+    assert participation.editions("rene vietto") == [1938, 1939, 1947, 1948]
+    assert participation.editions("Nobody") == []
+    assert participation.all_of([1938, 1948]) == ["GINO BARTALI", "René Vietto"]
+    assert participation.any_of([1950, 1951]) == ["FAUSTO COPPI", "LOUISON BOBET"]
+    assert participation.at_least(4) == ["FAUSTO COPPI", "René Vietto"]
+    assert participation.at_least(2, participation.between(1950, 1953)) == [
+        "FAUSTO COPPI",
+        "LOUISON BOBET",
+    ]
+    with pytest.raises(KeyError):
+        participation.all_of([1940])
+
+
+def test_an_empty_index_has_no_editions() -> None:
+    participation = Participation.build(pd.DataFrame(columns=["Rider", "Year"]))
+    assert len(participation) == 0
+    assert participation.editions("Nobody") == []
+    with pytest.raises(KeyError):
+        participation.any_of([1938])
+
+
+def test_careers_count_editions_and_streaks() -> None:
+    careers = Participation.build(_riders()).careers().set_index("Rider")
+    # 1939 and 1947 are consecutive editions
+    assert careers.loc["René Vietto"].tolist() == [4, 1938, 1948, 4]
+    assert careers.loc["FAUSTO COPPI"].tolist() == [4, 1949, 1953, 3]
+    assert careers.index[0] == "René Vietto"
+
+
+def test_the_bitmap_is_cached_until_the_riders_change(tmp_path: Path) -> None:
+    men = tmp_path / "men"
+    men.mkdir()
+    _riders().to_csv(men / "TDF_Riders_History.csv", index=False)
+    assert len(load_participation("men", tmp_path)) == 4
+    assert (men / ".cache" / PARTICIPATION_FILE).exists()
+    assert load_participation("men", tmp_path).at_least(4) == [
+        "FAUSTO COPPI",
+        "René Vietto",
+    ]
+
+    _riders().iloc[:3].to_csv(men / "TDF_Riders_History.csv", index=False)
+    assert load_participation("men", tmp_path).years.tolist() == [1938, 1939, 1947]
+    with pytest.raises(FileNotFoundError):
+        load_participation("women", tmp_path)
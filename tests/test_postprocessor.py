@@ -1,15 +1,23 @@
 """Tests for the CSV postprocessor."""
 
+import json
 from pathlib import Path
 
 import pandas as pd
 import pytest
 
+from letourdataset.metadata import sidecar_path
 from letourdataset.postprocessor import (
+    MANIFEST_NAME,
     RIDERS_SPEC,
     STAGES_SPEC,
     DataPostProcessor,
     FileSpec,
+    append_merge,
+    canonicalise,
+    permute_lines,
+    sort_file_external,
+    spec_version,
 )
 
 
@@ -73,9 +81,7 @@ def test_split_stage_numbers_are_preserved(tmp_path: Path) -> None:
 
 def test_non_integer_column_left_alone(tmp_path: Path) -> None:
     path = tmp_path / "riders.csv"
-    pd.DataFrame({"Rank": ["1", "DSQ"], "Year": [2024, 2024]}).to_csv(
-        path, index=False
-    )
+    pd.DataFrame({"Rank": ["1", "DSQ"], "Year": [2024, 2024]}).to_csv(path, index=False)
     DataPostProcessor().process_file(path, RIDERS_SPEC)
     df = pd.read_csv(path, dtype=str)
     assert set(df["Rank"]) == {"1", "DSQ"}
@@ -87,9 +93,7 @@ def test_missing_file_is_skipped(tmp_path: Path) -> None:
 
 def test_process_all_files_raises_on_broken_file(tmp_path: Path) -> None:
     (tmp_path / "men").mkdir()
-    (tmp_path / "men" / "TDF_Riders_History.csv").write_text(
-        'a,b\n1,"unclosed\n'
-    )
+    (tmp_path / "men" / "TDF_Riders_History.csv").write_text('a,b\n1,"unclosed\n')
     with pytest.raises(RuntimeError, match="TDF_Riders_History.csv"):
         DataPostProcessor(tmp_path).process_all_files()
 
@@ -98,3 +102,176 @@ def test_filespec_defaults() -> None:
     spec = FileSpec(sort_columns=("Year",))
     assert spec.integer_columns == ()
     assert spec.stage_number_columns == ()
+
+
+def test_check_mode_reports_without_writing(riders_csv: Path) -> None:
+    before = riders_csv.read_bytes()
+    assert DataPostProcessor().process_file(riders_csv, RIDERS_SPEC, check=True)
+    assert riders_csv.read_bytes() == before
+
+    assert DataPostProcessor().process_file(riders_csv, RIDERS_SPEC)
+    assert not DataPostProcessor().process_file(riders_csv, RIDERS_SPEC, check=True)
+
+
+def test_untouched_columns_are_kept_verbatim(tmp_path: Path) -> None:
+    path = tmp_path / "riders.csv"
+    path.write_text("Rank,Points,Year\n2,25,2024\n1,,2024\n")
+    DataPostProcessor().process_file(path, RIDERS_SPEC)
+    # Type inference would have turned the points into floats ('25.0')
+    assert path.read_text() == "Rank,Points,Year\n1,,2024\n2,25,2024\n"
+
+
+def test_canonicalise_matches_process_file(riders_csv: Path) -> None:
+    df = pd.read_csv(riders_csv)
+    expected = canonicalise(df, RIDERS_SPEC).to_csv(index=False)
+    DataPostProcessor().process_file(riders_csv, RIDERS_SPEC)
+    assert riders_csv.read_text() == expected
+
+
+def test_external_sort_matches_in_memory_sort(tmp_path: Path) -> None:
+    path = tmp_path / "stages.csv"
+    pd.DataFrame(
+        {
+            "Year": [1934, 1933, 1934, 1934, None, 1933, 1934],
+            "Stages": [13.2, 2.0, 13.1, 1.0, 3.0, "P", 13.1],
+            "Start": ["C", "B", "A", "D", "E", "F", "G"],
+        }
+    ).to_csv(path, index=False)
+    expected = canonicalise(pd.read_csv(path, dtype=str), STAGES_SPEC).to_csv(
+        index=False
+    )
+
+    output = tmp_path / "sorted.csv"
+    # Chunks smaller than the file, so rows are gathered across chunks
+    assert sort_file_external(path, STAGES_SPEC, output, chunk_rows=2) == 7
+    assert output.read_text() == expected
+
+
+def test_large_files_are_processed_out_of_core(riders_csv: Path) -> None:
+    expected = canonicalise(pd.read_csv(riders_csv), RIDERS_SPEC).to_csv(index=False)
+    processor = DataPostProcessor(external_sort_bytes=0)
+    assert processor.process_file(riders_csv, RIDERS_SPEC, check=True)
+    assert processor.process_file(riders_csv, RIDERS_SPEC)
+    assert riders_csv.read_text() == expected
+    assert not processor.process_file(riders_csv, RIDERS_SPEC)
+    assert sorted(p.name for p in riders_csv.parent.iterdir()) == ["riders.csv"]
+
+
+def test_process_all_files_in_parallel(tmp_path: Path, riders_csv: Path) -> None:
+    for directory, prefix in (("men", "TDF"), ("women", "TDFF")):
+        (tmp_path / directory).mkdir()
+        target = tmp_path / directory / f"{prefix}_Riders_History.csv"
+        target.write_bytes(riders_csv.read_bytes())
+    (tmp_path / "men" / "TDF_Stages_History.csv").write_text("Year,Stages\n2024,1\n")
+
+    changed = DataPostProcessor(tmp_path, workers=2).process_all_files()
+    assert changed == [
+        str(tmp_path / "men" / "TDF_Riders_History.csv"),
+        str(tmp_path / "women" / "TDFF_Riders_History.csv"),
+    ]
+    assert DataPostProcessor(tmp_path, workers=2).process_all_files(check=True) == []
+
+
+def test_manifest_skips_unchanged_files(tmp_path: Path, riders_csv: Path) -> None:
+    (tmp_path / "men").mkdir()
+    target = tmp_path / "men" / "TDF_Riders_History.csv"
+    target.write_bytes(riders_csv.read_bytes())
+
+    processor = DataPostProcessor(tmp_path, workers=1)
+    assert processor.process_all_files() == [str(target)]
+    assert processor.manifest_path.exists()
+    mtime = target.stat().st_mtime_ns
+
+    calls: list[Path] = []
+    processor.process_file = lambda path, *args: calls.append(path) or False
+    assert processor.process_all_files() == []
+    assert calls == []
+    assert target.stat().st_mtime_ns == mtime
+
+    # Editing the file, or forcing, makes it eligible again
+    assert processor.process_all_files(force=True) == []
+    assert calls == [target]
+    target.write_text(target.read_text() + "1,X,1,2020\n")
+    assert processor.process_all_files() == []
+    assert calls == [target, target]
+
+
+def test_check_mode_leaves_manifest_and_sidecars_alone(
+    tmp_path: Path, riders_csv: Path
+) -> None:
+    (tmp_path / "men").mkdir()
+    target = tmp_path / "men" / "TDF_Riders_History.csv"
+    target.write_bytes(riders_csv.read_bytes())
+
+    processor = DataPostProcessor(tmp_path, workers=1)
+    assert processor.process_all_files(check=True) == [str(target)]
+    assert not processor.manifest_path.exists()
+    assert not sidecar_path(target).exists()
+
+    processor.process_all_files()
+    manifest = processor.manifest_path.read_bytes()
+    canonical = target.read_bytes()
+    target.write_text(target.read_text() + "1,X,1,2020\n")
+    assert processor.process_all_files(check=True) == [str(target)]
+    assert processor.manifest_path.read_bytes() == manifest
+    target.write_bytes(canonical)
+    sidecar_path(target).unlink()
+    assert processor.process_all_files(check=True) == []
+    assert not sidecar_path(target).exists()
+
+
+def test_manifest_entries_follow_the_spec(tmp_path: Path) -> None:
+    (tmp_path / "men").mkdir()
+    (tmp_path / "men" / "TDF_Stages_History.csv").write_text("Year,Stages\n2024,1\n")
+    DataPostProcessor(tmp_path, workers=1).process_all_files()
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert manifest["men/TDF_Stages_History.csv"]["spec"] == spec_version(STAGES_SPEC)
+    assert spec_version(STAGES_SPEC) != spec_version(RIDERS_SPEC)
+
+
+# pandas 2.2 deprecated concatenating frames with all-NA columns
+@pytest.mark.filterwarnings("error::FutureWarning")
+def test_append_merge_appends_a_new_edition(riders_csv: Path) -> None:
+    DataPostProcessor().process_file(riders_csv, RIDERS_SPEC)
+    before = riders_csv.read_text()
+    new = pd.DataFrame(
+        {"Rank": [2, 1], "Rider": ["N", "M"], "Rider No.": [8.0, 7.0], "Year": 2025}
+    )
+
+    assert append_merge(riders_csv, new, RIDERS_SPEC)
+    assert riders_csv.read_text() == before + "1,M,7,2025\n2,N,8,2025\n"
+
+
+def test_append_merge_rewrites_when_rows_belong_earlier(riders_csv: Path) -> None:
+    DataPostProcessor().process_file(riders_csv, RIDERS_SPEC)
+    new = pd.DataFrame({"Rank": [3], "Rider": ["Q"], "Points": ["5"], "Year": 2023})
+    expected = canonicalise(
+        pd.concat([pd.read_csv(riders_csv, dtype=str), new]), RIDERS_SPEC
+    ).to_csv(index=False)
+
+    assert not append_merge(riders_csv, new, RIDERS_SPEC)
+    assert riders_csv.read_text() == expected
+
+
+def test_permute_lines_matches_canonicalise(riders_csv: Path) -> None:
+    data = riders_csv.read_bytes()
+    expected = canonicalise(pd.read_csv(riders_csv), RIDERS_SPEC).to_csv(index=False)
+    assert permute_lines(data, RIDERS_SPEC) == expected.encode()
+
+
+def test_permute_lines_keeps_untouched_lines_verbatim() -> None:
+    data = b'Rank,Team,Year\r\n2,"B",2024\r\n1.0,"A",2024\r\n'
+    # Line endings are normalised and the line whose rank needed it is
+    # re-serialised; the other keeps even its superfluous quotes.
+    expected = b'Rank,Team,Year\n1,A,2024\n2,"B",2024\n'
+    assert permute_lines(data, RIDERS_SPEC) == expected
+
+
+def test_permute_lines_gives_up_on_multiline_fields(tmp_path: Path) -> None:
+    data = b'Rank,Team,Year\n2,"B\nB",2024\n1,A,2024\n'
+    assert permute_lines(data, RIDERS_SPEC) is None
+
+    path = tmp_path / "riders.csv"
+    path.write_bytes(data)
+    DataPostProcessor().process_file(path, RIDERS_SPEC)
+    assert path.read_bytes() == b'Rank,Team,Year\n1,A,2024\n2,"B\nB",2024\n'
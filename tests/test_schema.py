@@ -0,0 +1,50 @@
+"""Tests for the table registry and the typed CSV reader."""
+
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from letourdataset.schema import (
+    ALL_RANKINGS,
+    RIDERS,
+    STAGES,
+    read_table_csv,
+    table_of,
+)
+
+
+def test_table_of_file_names() -> None:
+    assert table_of("data/men/TDF_Riders_History.csv") == RIDERS
+    assert table_of(Path("TDFF_All_Rankings_History.csv")) == ALL_RANKINGS
+    assert table_of("data/plots/summary.csv") is None
+
+
+def test_read_table_csv_uses_declared_types() -> None:
+    data = b"Year,Stages,Start,Extra\n1934,13.1,Paris,1.5\n1934,14,,2\n"
+    df = read_table_csv(BytesIO(data), STAGES)
+    assert str(df["Year"].dtype) == "Int64"
+    # Stage numbers stay text, so '14' is not turned into a float
+    assert df["Stages"].tolist() == ["13.1", "14"]
+    assert df["Start"].isna().tolist() == [False, True]
+    # Columns the registry doesn't know are inferred
+    assert df["Extra"].tolist() == [1.5, 2.0]
+
+
+def test_read_table_csv_reads_only_requested_columns() -> None:
+    data = b"Rank,Rider,Rider No.,Year\n1,A,,2024\n2,B,7,2024\n"
+    df = read_table_csv(BytesIO(data), RIDERS, ["Rider No.", "Year"])
+    assert list(df.columns) == ["Rider No.", "Year"]
+    assert df["Rider No."].isna().tolist() == [True, False]
+    assert df["Rider No."].iloc[1] == 7
+
+
+def test_read_table_csv_reads_non_integers_as_missing(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    data = b"Rank,Rider,Year\n1,A,2024\nDSQ,B,2024\n"
+    df = read_table_csv(BytesIO(data), RIDERS)
+    assert df["Rank"].dtype == "Int64"
+    assert df["Rank"].isna().tolist() == [False, True]
+    assert df["Rider"].tolist() == ["A", "B"]
+    assert "DSQ" in caplog.text
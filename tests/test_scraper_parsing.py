@@ -1,5 +1,7 @@
 """Unit tests for the scraper's pure parsing logic (no network access)."""
 
+import asyncio
+from collections.abc import AsyncIterator
 from types import SimpleNamespace
 from typing import Callable
 
@@ -7,7 +9,7 @@ import pandas as pd
 import pytest
 from bs4 import BeautifulSoup
 
-from letourdataset.scraper import Scraper, parse_stage_number
+from letourdataset.scraper import Edition, Scraper, parse_stage_number
 
 
 def _as_all_rankings(rankings: "pd.DataFrame") -> "pd.DataFrame":
@@ -159,7 +161,7 @@ class TestFinalGeneralClassificationFallback:
                 raise_for_status=lambda: None,
             )
 
-        monkeypatch.setattr("letourdataset.scraper.requests.get", fake_get)
+        monkeypatch.setattr("requests.get", fake_get)
 
         stages = pd.DataFrame({"Stages": [0, 1, 2, 21]})
         df = scraper._get_general_classification("http://x/ranking", stages, 2026)
@@ -235,3 +237,49 @@ class TestNonTimeEditionsHaveZeroedSeconds:
         )
         assert out["ResultType"].iloc[0] == "time"
         assert out["TotalSeconds"].iloc[0] == 73 * 3600 + 56 * 60 + 26
+
+
+class TestStageKeyHandling:
+    def test_merge_matches_differently_parsed_stage_numbers(self) -> None:
+        stages = pd.DataFrame({"Stages": [1, 13.1, 13.2], "Start": ["a", "b", "c"]})
+        winners = pd.DataFrame(
+            {"Stages": ["13.2", "1", "13.1"], "Winner of stage": ["z", "x", "y"]}
+        )
+        merged = Scraper._merge_on_stage(stages, winners)
+        assert merged["Winner of stage"].tolist() == ["x", "y", "z"]
+        assert list(merged.columns) == ["Stages", "Start", "Winner of stage"]
+
+    def test_cleanup_sorts_split_stages_in_race_order(self) -> None:
+        stages = pd.DataFrame(
+            {"Year": [1934] * 3, "Stages": [14, 13.2, 13.1], "Start": ["c", "b", "a"]}
+        )
+        rankings = pd.DataFrame({"Rank": [1], "Rider": ["A"]})
+        _, _, out = make_scraper()._cleanup(
+            stages, rankings, _as_all_rankings(rankings), 1934, 4363
+        )
+        assert out["Start"].tolist() == ["a", "b", "c"]
+
+
+class TestRunMemoryBudget:
+    def test_spilling_gives_the_same_tables(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        editions = [
+            Edition(
+                pd.DataFrame({"Year": [year], "Stages": [1]}),
+                pd.DataFrame({"Rank": [1, 2], "Rider": ["A", "B"], "Year": year}),
+                pd.DataFrame({"Rank": ["1"], "Stages": [1], "Year": year}),
+            )
+            for year in (2026, 2025, 2024)
+        ]
+
+        async def fake_iter_editions() -> AsyncIterator[Edition]:
+            for edition in editions:
+                yield edition
+
+        scraper = make_scraper()
+        monkeypatch.setattr(scraper, "iter_editions", fake_iter_editions)
+        in_memory = asyncio.run(scraper.run())
+        spilled = asyncio.run(scraper.run(memory_budget=1))
+        for expected, actual in zip(in_memory, spilled):
+            assert actual.to_csv(index=False) == expected.to_csv(index=False)
@@ -0,0 +1,63 @@
+"""Tests for rider-name normalisation and the fuzzy search index."""
+
+from pathlib import Path
+
+import pandas as pd
+
+from letourdataset.names import clean_name, fold, team_suffix
+from letourdataset.search import RiderSearch, load_search
+
+
+def test_names_are_normalised_across_sources() -> None:
+    assert clean_name("Gianni Bugno  (Chateau D'Ax)") == "Gianni Bugno"
+    assert clean_name("nan") is None
+    assert team_suffix("Gianni Bugno  (Chateau D'Ax)") == "Chateau D'Ax"
+    assert team_suffix("GIANNI BUGNO") is None
+    assert clean_name(None) is None
+    assert fold(clean_name("FRANÇOIS FABER")) == "francois faber"
+    assert fold(clean_name("François  Faber (Alcyon)")) == "francois faber"
+
+
+def test_search_folds_accents_and_tolerates_typos() -> None:
+    search = RiderSearch.build(
+        [
+            "TADEJ POGACAR",
+            "Tadej Pogačar",
+            "EDDY MERCKX",
+            "AXEL MERCKX",
+            "Eddy Planckaert",
+        ]
+    )
+    # Both spellings of Pogačar are one name, shown in its mixed-case form
+    assert len(search) == 4
+    assert search.search("pogacer") == [("Tadej Pogačar", 0.571)]
+    # Every match of the query scores 1.0; the closer name comes first
+    assert [name for name, _ in search.search("eddy merckx")][:2] == [
+        "EDDY MERCKX",
+        "AXEL MERCKX",
+    ]
+    assert search.search("zzz") == []
+
+
+def test_prefix_matches_any_word_or_the_full_name() -> None:
+    search = RiderSearch.build(["EDDY MERCKX", "AXEL MERCKX", "Eddy Planckaert"])
+    assert search.prefix("merck") == ["AXEL MERCKX", "EDDY MERCKX"]
+    assert search.prefix("eddy p") == ["Eddy Planckaert"]
+    assert search.prefix("") == []
+
+
+def test_index_is_saved_and_rebuilt_when_the_data_changes(tmp_path: Path) -> None:
+    riders = tmp_path / "men" / "TDF_Riders_History.csv"
+    riders.parent.mkdir()
+    pd.DataFrame({"Rider": ["MAURICE GARIN"], "Year": [1903]}).to_csv(
+        riders, index=False
+    )
+    assert load_search(tmp_path).prefix("garin") == ["MAURICE GARIN"]
+    assert (tmp_path / ".cache" / "rider_search.npz").exists()
+
+    pd.DataFrame({"Rider": ["LUCIEN POTHIER"], "Year": [1903]}).to_csv(
+        riders, index=False
+    )
+    search = load_search(tmp_path)
+    assert search.prefix("garin") == []
+    assert search.prefix("poth") == ["LUCIEN POTHIER"]
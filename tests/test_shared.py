@@ -0,0 +1,71 @@
+"""Tests for publishing a race's tables in shared memory."""
+
+import pickle
+from multiprocessing import Pool
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from letourdataset.cache import load
+from letourdataset.shared import SharedDataset
+
+
+def _write_race(root: Path) -> None:
+    men = root / "men"
+    men.mkdir()
+    pd.DataFrame(
+        {
+            "Rank": pd.array([1, 2, None], dtype="Int64"),
+            "Rider": ["EDDY MERCKX", "ROGER PINGEON", "EDDY MERCKX"],
+            "Team": ["FAEMA", "PEUGEOT", None],
+            "Year": [1969, 1969, 1970],
+        }
+    ).to_csv(men / "TDF_Riders_History.csv", index=False)
+
+
+def _winner(shared: SharedDataset) -> str:
+    riders = shared.frame("Riders")
+    winner = str(riders.loc[riders["Rank"] == 1, "Rider"].iloc[0])
+    del riders
+    shared.close()
+    return winner
+
+
+def test_tables_are_published_dictionary_encoded(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    _write_race(tmp_path)
+    with SharedDataset.publish("men", tmp_path) as shared:
+        assert shared.tables == ["Riders"]
+        riders = shared.table("Riders")
+        assert pa.types.is_dictionary(riders.schema.field("Rider").type)
+        assert riders.schema.field("Rank").type == pa.int64()
+        assert riders.column("Rider").chunk(0).dictionary.to_pylist() == [
+            "EDDY MERCKX",
+            "ROGER PINGEON",
+        ]
+
+        frame = shared.frame("Riders")
+        expected = load("men", "Riders", data_root=tmp_path)
+        # Categoricals against strings: compare both as the string dtype,
+        # whose missing value is <NA> under pandas 2 and 3 alike
+        strings = {"Rider": "string", "Team": "string"}
+        pd.testing.assert_frame_equal(frame.astype(strings), expected.astype(strings))
+        del riders, frame
+    # Nothing pointed into the block any more when it was closed
+    assert "still in use" not in caplog.text
+
+
+def test_workers_attach_by_name(tmp_path: Path) -> None:
+    _write_race(tmp_path)
+    with SharedDataset.publish("men", tmp_path) as shared:
+        assert pickle.loads(pickle.dumps(shared)).tables == ["Riders"]
+        with Pool(2) as pool:
+            assert pool.map(_winner, [shared] * 2) == ["EDDY MERCKX"] * 2
+        name = shared.name
+
+    # Closing the publisher unlinks the block
+    with pytest.raises(FileNotFoundError):
+        SharedDataset.attach(name)
@@ -0,0 +1,138 @@
+"""Tests for streaming editions into CSV, Parquet and SQLite sinks."""
+
+import asyncio
+import sqlite3
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from letourdataset.parquet import read_table
+from letourdataset.postprocessor import DataPostProcessor
+from letourdataset.scraper import Edition
+from letourdataset.sinks import CsvSink, ParquetSink, Sink, SqliteSink, drain
+
+
+def make_edition(year: int, with_points: bool) -> Edition:
+    stages = pd.DataFrame({"Year": [year, year], "Stages": [1, 2]})
+    rankings = pd.DataFrame({"Rank": [1, 2], "Rider": ["A", "B"], "Year": year})
+    all_rankings = pd.DataFrame(
+        {"Rank": ["1", "1"], "Rider": ["A", "B"], "Stages": [1, 2], "Year": year}
+    )
+    if with_points:
+        all_rankings["Points"] = ["25", "20"]
+    return Edition(stages, rankings, all_rankings)
+
+
+EDITIONS = [make_edition(2026, False), make_edition(2025, True)]
+
+
+async def stream() -> AsyncIterator[Edition]:
+    for edition in EDITIONS:
+        yield edition
+
+
+def test_csv_sink_matches_concatenating_everything(tmp_path: Path) -> None:
+    with CsvSink(tmp_path, "TDF") as sink:
+        assert asyncio.run(drain(stream(), sink)) == 2
+
+    expected = pd.concat([e.all_rankings for e in EDITIONS], ignore_index=True)
+    expected_path = tmp_path / "expected.csv"
+    expected.to_csv(expected_path, index=False)
+    # The second edition brings a new column; the file is widened to the
+    # same header and rows a single concat would have produced.
+    written = tmp_path / "TDF_All_Rankings_History.csv"
+    assert written.read_text() == expected_path.read_text()
+    assert (tmp_path / "TDF_Riders_History.csv").exists()
+    assert (tmp_path / "TDF_Stages_History.csv").exists()
+
+
+def test_csv_sink_replaces_existing_files(tmp_path: Path) -> None:
+    (tmp_path / "TDF_Riders_History.csv").write_text("stale\n")
+    with CsvSink(tmp_path, "TDF") as sink:
+        asyncio.run(drain(stream(), sink))
+    df = pd.read_csv(tmp_path / "TDF_Riders_History.csv")
+    assert df["Year"].tolist() == [2026, 2026, 2025, 2025]
+
+
+def test_parquet_sink_writes_one_partition_per_edition(tmp_path: Path) -> None:
+    with ParquetSink(tmp_path, "men") as sink:
+        asyncio.run(drain(stream(), sink))
+    root = tmp_path / "All_Rankings" / "race=men"
+    assert sorted(p.name for p in root.glob("Year=*")) == ["Year=2025", "Year=2026"]
+    df = read_table(tmp_path, "men", "All_Rankings", years=[2025])
+    assert df["Points"].tolist() == ["25", "20"]
+    assert df["Year"].tolist() == [2025, 2025]
+
+
+def test_sqlite_sink_adds_new_columns(tmp_path: Path) -> None:
+    database = tmp_path / "tdf.sqlite"
+    with SqliteSink(database, "TDF") as sink:
+        asyncio.run(drain(stream(), sink))
+    with sqlite3.connect(database) as connection:
+        df = pd.read_sql('SELECT * FROM "TDF_All_Rankings_History"', connection)
+    assert len(df) == 4
+    assert df["Points"].isna().tolist() == [True, True, False, False]
+
+
+def _assert_canonical_matches_the_postprocessor(
+    tmp_path: Path, editions: list[Edition]
+) -> None:
+    """Writing canonically must leave the postprocessor nothing to do."""
+
+    async def newest_first() -> AsyncIterator[Edition]:
+        for edition in editions:
+            yield edition
+
+    plain, canonical = tmp_path / "plain", tmp_path / "canonical"
+    with CsvSink(plain, "TDF") as sink:
+        asyncio.run(drain(newest_first(), sink))
+    with CsvSink(canonical, "TDF", canonical=True) as sink:
+        asyncio.run(drain(newest_first(), sink))
+
+    (tmp_path / "men").symlink_to(plain)
+    DataPostProcessor(tmp_path).process_all_files()
+    for name in (
+        "TDF_Riders_History.csv",
+        "TDF_Stages_History.csv",
+        "TDF_All_Rankings_History.csv",
+    ):
+        assert (canonical / name).read_bytes() == (plain / name).read_bytes()
+
+    (tmp_path / "men").unlink()
+    (tmp_path / "men").symlink_to(canonical)
+    assert DataPostProcessor(tmp_path).process_all_files(check=True) == []
+
+
+def test_canonical_csv_sink_matches_the_postprocessor(tmp_path: Path) -> None:
+    editions = [
+        Edition(
+            pd.DataFrame({"Year": [1934] * 3, "Stages": [14, 13.2, 13.1]}),
+            pd.DataFrame({"Rank": [2, 1], "Rider No.": [None, 11.0], "Year": 1934}),
+            pd.DataFrame({"Rank": ["10", "2"], "Stages": [13.1, 13.1], "Year": 1934}),
+        ),
+        make_edition(2025, True),
+        make_edition(2026, False),
+    ][::-1]
+    _assert_canonical_matches_the_postprocessor(tmp_path, editions)
+
+
+def test_canonical_csv_sink_types_integer_columns_per_file(tmp_path: Path) -> None:
+    """One edition's non-integer rider number keeps every edition's as printed."""
+    mixed = make_edition(1934, False)
+    mixed.rankings["Rider No."] = ["11a", "12"]
+    whole = make_edition(2025, False)
+    whole.rankings["Rider No."] = [21.0, None]
+    _assert_canonical_matches_the_postprocessor(tmp_path, [whole, mixed])
+
+    riders = (tmp_path / "canonical" / "TDF_Riders_History.csv").read_text()
+    assert "21.0" in riders
+
+
+def test_a_sink_without_write_table_cannot_be_created() -> None:
+    class Incomplete(Sink):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
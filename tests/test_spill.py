@@ -0,0 +1,107 @@
+"""Tests for spilling scraped frames to disk under a memory budget."""
+
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from letourdataset.spill import SpillBuffer, frame_bytes
+
+FRAMES = [
+    pd.DataFrame({"Rank": [1, 2], "Rider": ["A", "B"], "Year": 2026}),
+    pd.DataFrame({"Rank": [1], "Rider": ["C"], "Year": 2025, "B": ["10'"]}),
+    pd.DataFrame({"Rank": [1.0, None], "Rider": ["D", "E"], "Year": 2024}),
+]
+
+
+def _concat(frames: list[pd.DataFrame], budget: int | None) -> pd.DataFrame:
+    with SpillBuffer(memory_budget=budget) as buffer:
+        for frame in frames:
+            buffer.add("Riders", frame)
+        return buffer.concat("Riders")
+
+
+def test_without_budget_nothing_is_spilled(tmp_path: Path) -> None:
+    with SpillBuffer(directory=tmp_path) as buffer:
+        for frame in FRAMES:
+            buffer.add("Riders", frame)
+        out = buffer.concat("Riders")
+    assert list(tmp_path.iterdir()) == []
+    pd.testing.assert_frame_equal(out, pd.concat(FRAMES, ignore_index=True))
+
+
+def test_spilled_result_prints_like_concat(tmp_path: Path) -> None:
+    with SpillBuffer(memory_budget=1, directory=tmp_path) as buffer:
+        for frame in FRAMES:
+            buffer.add("Riders", frame)
+        assert len(list(tmp_path.iterdir())) == len(FRAMES)
+        out = buffer.concat("Riders")
+
+    expected = pd.concat(FRAMES, ignore_index=True)
+    assert list(out.columns) == list(expected.columns)
+    assert (out.dtypes == pd.StringDtype("pyarrow")).all()
+    # Each edition prints as its own frame would: pd.concat makes the
+    # 2026 ranks floats, because 2024's are
+    assert out["Rank"].tolist() == ["1", "2", "1", "1.0", pd.NA]
+    assert out["B"].tolist() == [pd.NA, pd.NA, "10'", pd.NA, pd.NA]
+    assert out.drop(columns="Rank").to_csv(index=False) == expected.drop(
+        columns="Rank"
+    ).to_csv(index=False)
+
+
+def test_result_does_not_depend_on_whether_a_spill_happened() -> None:
+    spilled = _concat(FRAMES, budget=1)
+    held = _concat(FRAMES, budget=10**9)
+    pd.testing.assert_frame_equal(spilled, held)
+
+
+def test_spill_keeps_insertion_order_with_frames_still_in_memory() -> None:
+    budget = frame_bytes(FRAMES[0]) + frame_bytes(FRAMES[1]) - 1
+    with SpillBuffer(memory_budget=budget) as buffer:
+        for frame in FRAMES:
+            buffer.add("Riders", frame)
+        chunks = list(buffer.frames("Riders"))
+        out = buffer.concat("Riders")
+    assert len(chunks) == 2  # one spill of two editions, one still in memory
+    assert out["Rider"].tolist() == ["A", "B", "C", "D", "E"]
+
+
+def test_mixed_types_are_stored_as_printed() -> None:
+    frames = [
+        pd.DataFrame({"Rank": [1, 2]}),
+        pd.DataFrame({"Rank": pd.Series([1.0, "DNF", None], dtype=object)}),
+    ]
+    out = _concat(frames, budget=1)
+    assert out["Rank"].tolist() == ["1", "2", "1.0", "DNF", pd.NA]
+
+
+def _edition(year: int) -> pd.DataFrame:
+    riders = [f"RIDER {year} {i:05d} OF A LONG TEAM NAME" for i in range(2000)]
+    return pd.DataFrame({"Rider": riders, "Rank": range(1, 2001), "Year": year})
+
+
+def test_memory_stays_under_the_budget(tmp_path: Path) -> None:
+    years = range(1903, 1943)
+    total = frame_bytes(_edition(1903)) * len(years)
+    budget = total // 20
+
+    # Python and NumPy allocations are traced; Arrow's (pandas 3 strings,
+    # the spill files' tables) are sampled between editions
+    tracemalloc.start()
+    arrow_before = pa.total_allocated_bytes()
+    arrow_held = 0
+    with SpillBuffer(memory_budget=budget, directory=tmp_path) as buffer:
+        for year in years:
+            buffer.add("Riders", _edition(year))
+            arrow_held = max(arrow_held, pa.total_allocated_bytes() - arrow_before)
+        out = buffer.concat("Riders")
+        _, peak = tracemalloc.get_traced_memory()
+        # The result's buffers are the mapped spill files
+        assert pa.total_allocated_bytes() - arrow_before < budget
+    tracemalloc.stop()
+
+    assert len(out) == 2000 * len(years)
+    assert out["Rider"].iloc[-1] == "RIDER 1942 01999 OF A LONG TEAM NAME"
+    assert peak < total // 4
+    assert arrow_held < 2 * budget
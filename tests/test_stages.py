@@ -0,0 +1,57 @@
+"""Tests for the integer stage keys."""
+
+import pandas as pd
+import pytest
+
+from letourdataset.stages import (
+    format_stage_key,
+    format_stage_keys,
+    parse_stage_key,
+    split_stage_key,
+    stage_key,
+    stage_keys,
+    stage_number,
+)
+
+
+class TestScalarKeys:
+    @pytest.mark.parametrize(
+        ("value", "key"),
+        [(0, 0), (1, 10), (1.0, 10), (13.1, 131), ("13.2", 132), ("21", 210)],
+    )
+    def test_parse(self, value: object, key: int) -> None:
+        assert parse_stage_key(value) == key
+
+    @pytest.mark.parametrize("value", [None, float("nan"), "Prologue", ""])
+    def test_unparseable_is_none(self, value: object) -> None:
+        assert parse_stage_key(value) is None
+
+    def test_round_trip(self) -> None:
+        assert stage_key(13, 1) == 131
+        assert split_stage_key(131) == (13, 1)
+        assert format_stage_key(131) == "13.1"
+        assert format_stage_key(130) == "13"
+        assert stage_number(131) == 13.1
+        assert stage_number(0) == 0 and isinstance(stage_number(0), int)
+
+    def test_part_out_of_range(self) -> None:
+        with pytest.raises(ValueError, match="part"):
+            stage_key(1, 10)
+
+    def test_keys_sort_in_race_order(self) -> None:
+        numbers = [2, 13.2, 0, 13, 13.1, 14]
+        ordered = sorted(numbers, key=lambda n: parse_stage_key(n) or 0)
+        assert ordered == [0, 2, 13, 13.1, 13.2, 14]
+
+
+class TestVectorisedKeys:
+    def test_mixed_series(self) -> None:
+        keys = stage_keys(pd.Series([1.0, 13.1, None, "2"], dtype=object))
+        assert str(keys.dtype) == "Int64"
+        assert keys.tolist() == [10, 131, pd.NA, 20]
+
+    def test_format_matches_csv_rendering(self) -> None:
+        keys = pd.Series([10, 131, None, 0], dtype="Int64")
+        out = format_stage_keys(keys)
+        assert out.isna().tolist() == [False, False, True, False]
+        assert out.dropna().tolist() == ["1", "13.1", "0"]
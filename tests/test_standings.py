@@ -0,0 +1,116 @@
+"""Tests for the stage-by-stage general classification."""
+
+from pathlib import Path
+
+import pandas as pd
+
+from letourdataset.standings import (
+    duration_seconds,
+    format_gaps,
+    general_classification,
+    write_standings,
+)
+
+
+def _stage(stage: str, results: list[tuple], year: int = 2026) -> pd.DataFrame:
+    """Stage results from (rank, rider, seconds, bonus, penalty) tuples."""
+    return pd.DataFrame(
+        {
+            "Rank": [rank for rank, *_ in results],
+            "Rider": [rider for _, rider, *_ in results],
+            "Team": "TEAM",
+            "Times": None,
+            "B": [bonus for *_, bonus, _ in results],
+            "P": [penalty for *_, penalty in results],
+            "Stages": stage,
+            "Ranking type": "Individual (Stage)",
+            "Year": year,
+            "ResultType": "time",
+            "TotalSeconds": pd.array(
+                [seconds for _, _, seconds, *_ in results], dtype="Int64"
+            ),
+        }
+    )
+
+
+def _rankings() -> pd.DataFrame:
+    return pd.concat(
+        [
+            _stage(
+                "1",
+                [
+                    ("1", "A", 1000, "10'", None),
+                    ("2", "B", 1000, "06'", None),
+                    ("3", "C", 1005, None, None),
+                ],
+            ),
+            _stage(
+                "2",
+                [
+                    ("1", "C", 990, None, None),
+                    ("2", "B", 1000, None, "00' 20''"),
+                    ("DNF", "A", 0, None, None),
+                ],
+            ),
+            _stage("3", [("1", "B", 500, None, None), ("2", "C", 500, None, None)]),
+            # Mountains points are not times
+            _stage("3", [("1", "C", 0, None, None)]).assign(
+                **{"Ranking type": "Mountains (General)"}
+            ),
+        ],
+        ignore_index=True,
+    )
+
+
+def test_durations_are_parsed_as_the_source_prints_them() -> None:
+    values = pd.Series(["94h 33' 14''", "00' 20''", "16'", None, "n/a"])
+    assert duration_seconds(values).tolist() == [340394, 20, 16, pd.NA, pd.NA]
+    gaps = format_gaps(pd.Series([0, 136]))
+    assert gaps.tolist() == ["-", "+ 00h 02' 16''"]
+
+
+def test_standings_sum_times_bonuses_and_penalties() -> None:
+    standings = general_classification(_rankings())
+
+    first = standings[standings["Stages"] == "1"]
+    assert first["Rider"].tolist() == ["A", "B", "C"]
+    assert first["TotalSeconds"].tolist() == [990, 994, 1005]
+    assert first["Gap"].tolist() == ["-", "+ 00h 00' 04''", "+ 00h 00' 15''"]
+
+    # A abandoned on stage 2 and is gone from then on; B's penalty counts
+    final = standings[standings["Stages"] == "3"]
+    assert final["Rider"].tolist() == ["C", "B"]
+    assert final["TotalSeconds"].tolist() == [2495, 2514]
+    assert final["Rank"].tolist() == [1, 2]
+    assert final["BonusSeconds"].tolist() == [0, 6]
+    assert final["PenaltySeconds"].tolist() == [0, 20]
+    assert final["Times"].tolist() == ["00h 41' 35''", "00h 41' 54''"]
+
+
+def test_riders_missing_a_stage_drop_out_and_ties_keep_stage_order() -> None:
+    rankings = pd.concat(
+        [
+            _stage("0", [("1", "A", 100, None, None), ("2", "B", 100, None, None)]),
+            # B isn't in the first part of stage 1 at all
+            _stage("1.1", [("1", "A", 50, None, None)]),
+            _stage("1.2", [("1", "B", 40, None, None), ("2", "A", 40, None, None)]),
+            _stage("1", [("1", "A", 10, None, None)], year=1907).assign(
+                ResultType="points"
+            ),
+        ],
+        ignore_index=True,
+    )
+    standings = general_classification(rankings)
+    assert standings["Stages"].tolist() == ["0", "0", "1.1", "1.2"]
+    assert standings["Rider"].tolist() == ["A", "B", "A", "A"]
+    assert 1907 not in set(standings["Year"])
+
+
+def test_standings_are_written_per_race(tmp_path: Path) -> None:
+    men = tmp_path / "men"
+    men.mkdir()
+    _rankings().to_csv(men / "TDF_All_Rankings_History.csv", index=False)
+    directory = write_standings(tmp_path)
+    written = pd.read_csv(directory / "men.csv")
+    assert len(written) == 3 + 2 + 2
+    assert not (directory / "women.csv").exists()
@@ -0,0 +1,82 @@
+"""Tests for the normalised (star schema) copy of the data tables."""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from letourdataset.cache import load
+from letourdataset.star import export_star, read_dimension, read_fact, read_star
+
+
+def _write_race(root: Path) -> None:
+    men = root / "men"
+    men.mkdir()
+    pd.DataFrame(
+        {
+            "Rank": [1, 2, 1],
+            "Rider": ["EDDY MERCKX", "ROGER PINGEON", "EDDY MERCKX"],
+            "Team": ["FAEMA", "PEUGEOT", "FAEMINO"],
+            "Times": ["116h 16' 02''", "116h 33' 56''", "119h 31' 49''"],
+            "Year": [1969, 1969, 1970],
+            "Distance (km)": [4117, 4117, 4254],
+            "Number of stages": [22, 22, 23],
+            "ResultType": ["time", "time", "time"],
+            "TotalSeconds": [418562, 419636, 430309],
+        }
+    ).to_csv(men / "TDF_Riders_History.csv", index=False)
+    pd.DataFrame(
+        {
+            "Rank": ["1", "2", "1", "DNF"],
+            "Rider": ["EDDY MERCKX", "ROGER PINGEON", "EDDY MERCKX", None],
+            "Team": ["FAEMA", "PEUGEOT", "FAEMA", None],
+            "Stages": ["1", "1", "13.1", "13.1"],
+            "Ranking type": ["Individual (Stage)"] * 2 + ["Points (General)"] * 2,
+            "Checkpoint": [None, None, "Sprint 1", None],
+            "Year": [1969, 1969, 1969, 1969],
+            "Distance (km)": [4117, 4117, 4117, 4117],
+            "Number of stages": [22, 22, 22, 22],
+        }
+    ).to_csv(men / "TDF_All_Rankings_History.csv", index=False)
+
+
+def test_star_copy_rebuilds_the_original_tables(tmp_path: Path) -> None:
+    _write_race(tmp_path)
+    root = export_star(tmp_path)
+    assert root == tmp_path / "star"
+
+    for table in ("Riders", "All_Rankings"):
+        pd.testing.assert_frame_equal(
+            read_star(root, "men", table), load("men", table, data_root=tmp_path)
+        )
+
+
+def test_fact_tables_hold_keys_into_shared_dimensions(tmp_path: Path) -> None:
+    _write_race(tmp_path)
+    root = export_star(tmp_path)
+
+    facts = read_fact(root, "men", "All_Rankings")
+    for column in ("rider_key", "team_key", "edition_key", "stage_key"):
+        assert facts[column].dtype == "int32"
+    assert "Rider" not in facts and "Year" not in facts
+    # Missing names and checkpoints are -1; split stages keep their part
+    assert facts["rider_key"].iloc[3] == -1
+    assert facts["checkpoint_key"].tolist() == [-1, -1, 0, -1]
+    assert facts["stage_key"].tolist() == [10, 10, 131, 131]
+
+    # Both tables share one row per distinct value
+    riders = read_dimension(root, "riders")
+    assert riders["Rider"].tolist() == ["EDDY MERCKX", "ROGER PINGEON"]
+    assert riders["rider_id"].tolist() == ["eddy-merckx-1969", "roger-pingeon-1969"]
+    assert read_dimension(root, "teams")["Team"].tolist() == [
+        "FAEMA",
+        "FAEMINO",
+        "PEUGEOT",
+    ]
+    editions = read_dimension(root, "editions")
+    assert editions["Year"].tolist() == [1969, 1970]
+
+
+def test_missing_star_copy_is_reported(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError, match="make star"):
+        read_star(tmp_path, "men", "Riders")
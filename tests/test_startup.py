@@ -0,0 +1,46 @@
+"""Startup of the scripts: the modules their imports load.
+
+How long the imports take is checked against a budget by
+`scripts/benchmarks/startup.py --check`, a CI step of its own, rather than
+here, so the timing runs once on a quiet runner and not inside pytest.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# What `scripts/update_docs.py` imports; `--check` runs on every CI build
+UPDATE_DOCS_IMPORTS = ("fire", "letourdataset.coverage", "letourdataset.docsync")
+HEAVY_MODULES = ("pandas", "pyarrow", "numpy", "matplotlib", "aiohttp", "bs4")
+
+
+def loaded_modules(*modules: str) -> set[str]:
+    """Every module loaded by importing `modules` in a fresh interpreter."""
+    code = "import sys\n" + "".join(f"import {module}\n" for module in modules)
+    code += "print('\\n'.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return set(result.stdout.split())
+
+
+def test_update_docs_imports_no_heavy_dependency() -> None:
+    loaded = loaded_modules(*UPDATE_DOCS_IMPORTS)
+    assert not [module for module in HEAVY_MODULES if module in loaded]
+
+
+@pytest.mark.parametrize(
+    ("module", "deferred"),
+    [
+        ("letourdataset.scraper", ("aiohttp", "requests", "bs4", "rich")),
+        ("letourdataset.visualizer", ("matplotlib",)),
+        ("letourdataset.metadata", ("pandas", "pyarrow", "numpy")),
+        ("letourdataset.schema", ("pandas", "pyarrow", "numpy")),
+    ],
+)
+def test_heavy_dependencies_are_imported_on_first_use(
+    module: str, deferred: tuple[str, ...]
+) -> None:
+    loaded = loaded_modules(module)
+    assert not [name for name in deferred if name in loaded]
@@ -0,0 +1,115 @@
+"""Tests for the vectorised data invariants."""
+
+from pathlib import Path
+
+import pandas as pd
+
+from letourdataset.validation import (
+    ERROR,
+    VIOLATION_COLUMNS,
+    WARNING,
+    check_all_rankings,
+    check_riders,
+    check_stages,
+    validate,
+)
+
+
+def make_riders() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Rank": [1, 2, 3, 1, 2],
+            "Year": [2024, 2024, 2024, 2025, 2025],
+            "Number of stages": [2, 2, 2, 3, 3],
+            "ResultType": "time",
+            "TotalSeconds": [100, 110, 130, 200, 250],
+            "GapSeconds": [0, 10, 30, 0, 50],
+        }
+    )
+
+
+def make_stages() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Year": [2024, 2024, 2025, 2025, 2025],
+            "Stages": ["1", "2", "1", "2.1", "2.2"],
+        }
+    )
+
+
+def test_consistent_tables_have_no_violations() -> None:
+    report = check_riders(make_riders())
+    assert list(report.columns) == VIOLATION_COLUMNS
+    assert report.empty
+    assert check_stages(make_stages(), make_riders()).empty
+
+
+def test_rider_invariants() -> None:
+    riders = make_riders()
+    riders.loc[2, "Rank"] = 4  # 2024: ranks 1, 2, 4
+    riders.loc[4, "GapSeconds"] = 40  # 2025: 250 - 200 is 50
+    riders.loc[1, "TotalSeconds"] = 140  # 2024: slower than rank 3
+    riders.loc[0, "Number of stages"] = 3
+
+    report = check_riders(riders)
+    found = set(zip(report["check"], report["Year"], report["row"].astype(object)))
+    assert ("contiguous_ranks", 2024, 2) in found
+    assert ("gap_seconds", 2025, 4) in found
+    assert ("monotonic_times", 2024, 2) in found
+    assert ("number_of_stages", 2024, pd.NA) in found
+    severity = dict(zip(report["check"], report["severity"]))
+    assert severity["number_of_stages"] == ERROR
+    assert severity["gap_seconds"] == WARNING
+
+
+def test_gaps_of_a_vacated_win_are_to_the_winning_time() -> None:
+    # A stripped winner leaves rank 1 empty; the gaps still count from it
+    riders = make_riders().drop(index=3)
+    report = check_riders(riders)
+    assert report["check"].tolist() == ["contiguous_ranks"]
+
+
+def test_points_editions_are_not_timed() -> None:
+    riders = make_riders()
+    riders["ResultType"] = "points"
+    riders["GapSeconds"] = pd.NA
+    assert check_riders(riders).empty
+
+
+def test_stage_counts_and_editions() -> None:
+    stages = pd.concat(
+        [make_stages(), pd.DataFrame({"Year": [2025, 2026], "Stages": ["1", "1"]})],
+        ignore_index=True,
+    )
+    report = check_stages(stages, make_riders())
+    assert report.set_index("check")["Year"].to_dict() == {
+        "duplicate_stage": 2025,
+        "missing_edition": 2026,
+        "stage_count": 2025,
+    }
+    assert report.set_index("check").loc["stage_count", "detail"] == (
+        "4 stages, riders say 3"
+    )
+
+
+def test_duplicate_rank_keys() -> None:
+    all_rankings = pd.DataFrame(
+        {
+            "Rank": ["1", "2", "2", "DNF", "DNF", "1"],
+            "Stages": ["1", "1", "1", "1", "1", "1"],
+            "Ranking type": ["Individual (Stage)"] * 5 + ["Points"],
+            "Year": 2025,
+        }
+    )
+    report = check_all_rankings(all_rankings)
+    assert report["row"].tolist() == [2]
+
+
+def test_validate_reads_the_race_files(tmp_path: Path) -> None:
+    (tmp_path / "men").mkdir()
+    make_riders().to_csv(tmp_path / "men" / "TDF_Riders_History.csv", index=False)
+    stages = make_stages().iloc[:-1]
+    stages.to_csv(tmp_path / "men" / "TDF_Stages_History.csv", index=False)
+
+    report = validate(tmp_path, "men")
+    assert report[["check", "severity"]].values.tolist() == [["stage_count", ERROR]]
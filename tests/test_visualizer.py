@@ -7,6 +7,7 @@ import pandas as pd
 
 matplotlib.use("Agg")
 
+from letourdataset.editions import edition_statistics  # noqa: E402
 from letourdataset.visualizer import Visualizer  # noqa: E402
 
 
@@ -47,3 +48,10 @@ def test_plot_winning_margin_does_not_mutate_input(tmp_path: Path) -> None:
     before = df.copy()
     Visualizer().plot_winning_margin(df, saveas=str(tmp_path / "margin.png"))
     pd.testing.assert_frame_equal(df, before)
+
+
+def test_plots_accept_edition_statistics(tmp_path: Path) -> None:
+    editions = edition_statistics(sample_df())
+    Visualizer().plot(editions, saveas=str(tmp_path / "plot.png"))
+    Visualizer().plot_winning_margin(editions, saveas=str(tmp_path / "margin.png"))
+    assert (tmp_path / "plot.png").exists() and (tmp_path / "margin.png").exists()